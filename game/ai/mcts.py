@@ -0,0 +1,258 @@
+"""Monte Carlo Tree Search opponent over the headless GameEngine.
+
+Each iteration restores the root state from a pickled snapshot, walks the
+tree with UCT, expands one action, finishes the game approximately with a
+rollout and backs the result up the path. Rollouts play the rest of the
+current turn at random and then a few turns of GreedyPolicy before scoring
+grace points, which keeps them short enough for an interactive budget.
+
+Actions are stored as GameEngine.action_key() tuples so they stay valid
+across snapshots and processes; they were legal when generated, so the
+tree applies them as commands without re-validating. With workers > 1 the search also runs
+independent trees in a process pool and sums their root statistics (root
+parallelism). The local tree is kept between moves and re-rooted at the
+node whose zobrist hash matches the new position. The tree passes through
+empty phases, so a live engine that stops in them is matched by the
+position that passing leads to.
+"""
+import logging
+import math
+import pickle
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ..core.engine import END_PHASE, Action, GameEngine
+from ..simulation.policies import GreedyPolicy
+
+logger = logging.getLogger('TestamentDuel')
+
+EXPLORATION = 1.4
+ROLLOUT_TURNS = 4
+MAX_TURN_STEPS = 40  # Random actions before a rollout forces the turn to end
+MAX_REUSE_NODES = 20000  # Nodes searched when looking for the new root
+
+class Node:
+    """Search tree node; `value` is summed from the view of `player`, who moved here"""
+
+    __slots__ = ('key', 'parent', 'player', 'state_hash', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, key=None, parent=None, player=None, state_hash=None):
+        self.key = key
+        self.parent = parent
+        self.player = player
+        self.state_hash = state_hash
+        self.children: List["Node"] = []
+        self.untried: Optional[List[tuple]] = None
+        self.visits = 0
+        self.value = 0.0
+
+    def uct(self, log_parent_visits: float, exploration: float) -> float:
+        return self.value / self.visits + exploration * math.sqrt(log_parent_visits / self.visits)
+
+def search_actions(state: GameEngine) -> List[tuple]:
+    """Action keys worth searching; ending the turn is reachable through end_phase"""
+    return [state.action_key(action) for action in state.legal_actions() if action.kind != "end_turn"]
+
+def search_hash(state: GameEngine) -> int:
+    """Hash of `state` as the tree stores it, after passing through empty phases"""
+    if state.skip_empty_phases or state.game_over or not state.phase_manager.is_idle():
+        return state.state_hash()
+    state = pickle.loads(pickle.dumps(state))
+    state._skip_empty_phases()
+    return state.state_hash()
+
+def evaluate(state: GameEngine) -> float:
+    """Score a position for player 0 in [0, 1]"""
+    if state.game_over:
+        if state.winner is None:
+            return 0.5
+        return 1.0 if state.winner is state.players[0] else 0.0
+
+    grace = [max(0, player.grace_points) for player in state.players]
+    total = grace[0] + grace[1]
+    return grace[0] / total if total else 0.5
+
+def rollout(state: GameEngine, rng: random.Random, turns: int = ROLLOUT_TURNS) -> float:
+    """Play on from `state` and score the result for player 0"""
+    player_index = state.active_player_index
+    for _ in range(MAX_TURN_STEPS):
+        if state.game_over or state.active_player_index != player_index:
+            break
+        actions = [action for action in state.legal_actions() if action.kind != "end_turn"]
+        state.perform(rng.choice(actions), validate=False)
+    else:
+        state.end_turn()
+
+    policy = GreedyPolicy()
+    last_turn = state.turn_count + turns
+    while not state.game_over and state.turn_count < last_turn:
+        policy.play_turn(state)
+    return evaluate(state)
+
+def run_iterations(root: Node, snapshot: bytes, deadline: float, rng: random.Random,
+                   exploration: float = EXPLORATION, rollout_turns: int = ROLLOUT_TURNS) -> int:
+    """Grow the tree under `root` until the perf_counter deadline; returns iterations run"""
+    iterations = 0
+    while True:
+        state = pickle.loads(snapshot)
+        # Forced passes through empty phases would only add single-child nodes
+        state.skip_empty_phases = True
+        node = root
+        if node.untried is None:
+            node.untried = search_actions(state)
+
+        # Selection
+        while not node.untried and node.children and not state.game_over:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.uct(log_visits, exploration))
+            state.commands.dispatch(state.command_from_key(node.key), validate=False)
+
+        # Expansion
+        if node.untried and not state.game_over:
+            key = node.untried.pop(rng.randrange(len(node.untried)))
+            player = state.active_player_index
+            state.commands.dispatch(state.command_from_key(key), validate=False)
+            child = Node(key, node, player, state.state_hash())
+            child.untried = [] if state.game_over else search_actions(state)
+            node.children.append(child)
+            node = child
+
+        # Simulation and backpropagation
+        reward = rollout(state, rng, rollout_turns)
+        while node is not None:
+            node.visits += 1
+            node.value += reward if node.player == 0 else 1.0 - reward
+            node = node.parent
+
+        iterations += 1
+        if time.perf_counter() >= deadline:
+            return iterations
+
+def _search_worker(snapshot: bytes, budget_s: float, seed: int, exploration: float,
+                   rollout_turns: int) -> Dict[tuple, Tuple[int, float]]:
+    """Independent search in a pool process; returns root child statistics"""
+    root = Node()
+    run_iterations(root, snapshot, time.perf_counter() + budget_s, random.Random(seed),
+                   exploration, rollout_turns)
+    return {child.key: (child.visits, child.value) for child in root.children}
+
+class MCTS:
+    """Time-budgeted MCTS with tree reuse and optional root parallelism"""
+
+    def __init__(self, budget_ms: int = 500, workers: int = 1, exploration: float = EXPLORATION,
+                 rollout_turns: int = ROLLOUT_TURNS, seed=None):
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.rng = random.Random(seed)
+        self.root: Optional[Node] = None
+        self._pool = None
+
+    def choose(self, engine: GameEngine) -> Action:
+        """Search the engine's position and return the action to play"""
+        return engine.action_from_key(self.search(pickle.dumps(engine)))
+
+    def search(self, snapshot: bytes) -> tuple:
+        """Search a pickled engine; returns the chosen action key.
+
+        Only the snapshot is touched, so this is safe to run on a background
+        thread while the live engine keeps rendering.
+        """
+        state = pickle.loads(snapshot)
+        actions = search_actions(state)
+        if len(actions) == 1:
+            # Forced move, e.g. the draw phase; the kept tree stays for later positions
+            return actions[0]
+
+        root = self._reuse(state)
+        budget_s = self.budget_ms / 1000
+        deadline = time.perf_counter() + budget_s
+
+        futures = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            futures = [
+                self._pool.submit(_search_worker, snapshot, budget_s, self.rng.getrandbits(64),
+                                  self.exploration, self.rollout_turns)
+                for _ in range(self.workers - 1)
+            ]
+
+        iterations = run_iterations(root, snapshot, deadline, self.rng, self.exploration, self.rollout_turns)
+
+        stats = {child.key: [child.visits, child.value] for child in root.children}
+        for future in futures:
+            for key, (visits, value) in future.result().items():
+                entry = stats.setdefault(key, [0, 0.0])
+                entry[0] += visits
+                entry[1] += value
+
+        best = max(stats, key=lambda key: (stats[key][0], stats[key][1]))
+        logger.debug(f"MCTS: {iterations} local iterations, {sum(v for v, _ in stats.values())} root visits")
+
+        # Keep the chosen subtree for the next move
+        self.root = next((child for child in root.children if child.key == best), None)
+        return best
+
+    def _reuse(self, state: GameEngine) -> Node:
+        """Find the kept subtree node for this position, or start a new tree"""
+        target = search_hash(state)
+        if self.root is not None:
+            queue = deque([self.root])
+            for _ in range(MAX_REUSE_NODES):
+                if not queue:
+                    break
+                node = queue.popleft()
+                if node.state_hash == target:
+                    node.parent = None
+                    return node
+                queue.extend(node.children)
+
+        return Node(state_hash=target)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+class AIController:
+    """Plays one seat with MCTS on a background thread so the frame loop never blocks"""
+
+    def __init__(self, player_index: int = 1, mcts: Optional[MCTS] = None):
+        self.player_index = player_index
+        self.mcts = mcts or MCTS()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcts")
+        self._future = None
+        self._version = None
+
+    def is_turn(self, engine: GameEngine) -> bool:
+        return not engine.game_over and engine.active_player_index == self.player_index
+
+    def poll(self, engine: GameEngine) -> Optional[Action]:
+        """Call once per frame; returns an action to perform once the search is done"""
+        if not self.is_turn(engine):
+            self._future = None
+            return None
+
+        if self._future is None:
+            self._version = engine.state_version
+            self._future = self._executor.submit(self.mcts.search, pickle.dumps(engine))
+            return None
+
+        if not self._future.done():
+            return None
+
+        future, self._future = self._future, None
+        if engine.state_version != self._version:
+            return None  # The position moved on; search again next frame
+
+        action = engine.action_from_key(future.result())
+        return action if action in engine.legal_actions() else END_PHASE
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.mcts.close()
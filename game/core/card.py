@@ -1,76 +1,100 @@
-import pygame
-from .constants import (
-    CARD_WIDTH, 
-    CARD_HEIGHT, 
-    BLACK, 
-    GOLD, 
-    WHITE,
-    DARK_BLUE
-)
+from operator import attrgetter
 from .types import Position, CardType, Faction
 from ..effect_system import Effect, Timing
 
+class CardDefinition:
+    """Immutable card data, interned so every copy of a card shares one object"""
+
+    FIELDS = (
+        'name', 'card_type', 'effect', 'attribute', 'image_path', 'level',
+        'faith_points', 'divinity_points', 'scripture_type', 'miracle_type',
+        'skp_cost', 'faction'
+    )
+    __slots__ = ('id',) + FIELDS
+    _interned = {}
+
+    def __new__(cls, name, card_type, effect, attribute=None, image_path=None,
+                level=None, faith_points=None, divinity_points=None,
+                scripture_type=None, miracle_type=None, skp_cost=0, faction="NEUTRAL"):
+        values = (name, card_type, effect, attribute, image_path, level,
+                  faith_points, divinity_points, scripture_type, miracle_type,
+                  skp_cost, faction)
+        try:
+            definition = cls._interned.get(values)
+        except TypeError:
+            # Unhashable effect objects cannot be interned
+            return cls._create(values, None)
+
+        if definition is None:
+            definition = cls._create(values, len(cls._interned))
+            cls._interned[values] = definition
+        return definition
+
+    @classmethod
+    def _create(cls, values, definition_id):
+        definition = object.__new__(cls)
+        object.__setattr__(definition, 'id', definition_id)
+        for field, value in zip(cls.FIELDS, values):
+            object.__setattr__(definition, field, value)
+        return definition
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CardDefinition is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("CardDefinition is immutable")
+
+    def __reduce__(self):
+        # Re-intern on unpickle so worker processes share definitions too
+        return (CardDefinition, tuple(getattr(self, field) for field in self.FIELDS))
+
+    def __repr__(self):
+        return f"CardDefinition({self.name!r}, {self.card_type})"
+
 class Card:
+    """A single copy of a card in a game: shared definition plus mutable flags"""
+
+    __slots__ = (
+        'definition', 'owner', 'position', 'is_destroyed', 'is_face_down',
+        'is_selected', 'rect'  # rect is assigned by the view (ui/renderers/card_renderer.py)
+    )
+
     def __init__(self, name, card_type, effect, attribute=None, image_path=None, 
                  level=None, faith_points=None, divinity_points=None,
                  scripture_type=None, miracle_type=None, skp_cost=0, faction="NEUTRAL"):
-        self.name = name
-        self.card_type = card_type
-        self.effect = effect
-        self.attribute = attribute
-        self.image_path = image_path
-        self.level = level
-        self.faith_points = faith_points
-        self.divinity_points = divinity_points
-        self.scripture_type = scripture_type
-        self.miracle_type = miracle_type
-        self.skp_cost = skp_cost
-        self.faction = faction
+        self._init_state(CardDefinition(
+            name, card_type, effect, attribute, image_path, level,
+            faith_points, divinity_points, scripture_type, miracle_type,
+            skp_cost, faction
+        ))
+        
+    @classmethod
+    def from_definition(cls, definition: CardDefinition) -> "Card":
+        """Create a new copy of an already interned card"""
+        card = cls.__new__(cls)
+        card._init_state(definition)
+        return card
+        
+    def _init_state(self, definition):
+        self.definition = definition
+        self.owner = None
         self.position = None
         self.is_destroyed = False
         self.is_face_down = False
         self.is_selected = False
         
-        # Initialize surface and rect
-        self.surface = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
-        self.rect = self.surface.get_rect()
+    def take_damage(self, amount):
+        """Destroy the card if the damage meets or exceeds its Divinity Points"""
+        if amount >= (self.divinity_points or 0):
+            self.is_destroyed = True
+        return self.is_destroyed
         
-        # Load card image if provided
-        if image_path:
-            self.image = pygame.image.load(image_path)
-            self.image = pygame.transform.scale(self.image, (CARD_WIDTH, CARD_HEIGHT))
-        else:
-            self.image = None
-        
-    def draw(self, surface):
-        """Draw the card on the given surface"""
-        # Create background
-        if self.is_face_down:
-            # Draw face-down card
-            pygame.draw.rect(surface, DARK_BLUE, self.rect)
-            pygame.draw.rect(surface, GOLD, self.rect, 2)
-        else:
-            # Draw card background
-            pygame.draw.rect(surface, WHITE, self.rect)
-            pygame.draw.rect(surface, BLACK, self.rect, 2)
-            
-            # Draw card image or details
-            if self.image:
-                surface.blit(self.image, self.rect)
-            else:
-                # Draw card details
-                font = pygame.font.Font(None, 20)
-                
-                # Name
-                name_text = font.render(self.name, True, BLACK)
-                surface.blit(name_text, (self.rect.x + 5, self.rect.y + 5))
-                
-                # Type
-                type_text = font.render(str(self.card_type.value), True, BLACK)
-                surface.blit(type_text, (self.rect.x + 5, self.rect.y + 25))
-                
-        if self.is_selected:
-            pygame.draw.rect(surface, GOLD, self.rect, 4)
+    def __repr__(self):
+        return f"Card({self.name!r})"
+
+# Static card data is read through the shared definition
+for _field in CardDefinition.FIELDS:
+    setattr(Card, _field, property(attrgetter(f"definition.{_field}")))
 
 def create_damage_boost_effect(amount: int) -> Effect:
     return Effect(
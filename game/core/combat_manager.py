@@ -1,14 +1,208 @@
-from typing import Optional, List
+from dataclasses import dataclass
+from typing import Optional, Sequence
 from .card import Card
-from .types import Position, Timing
+from ..types.enums import CardType, Position
+
+try:
+    import numpy as np
+except ImportError:  # Batch resolution falls back to the scalar path
+    np = None
+
+@dataclass(frozen=True)
+class DamageModifier:
+    """Affine damage modifier: damage * multiply + add"""
+    add: float = 0
+    multiply: float = 1
+
+    def apply(self, damage):
+        return damage * self.multiply + self.add
+
+@dataclass(frozen=True)
+class ComposedModifier(DamageModifier):
+    """A run of integer affine modifiers folded into one, keeping the run"""
+    parts: tuple = ()
+
+    def apply(self, damage):
+        if isinstance(damage, int):
+            return damage * self.multiply + self.add
+        # Folded float arithmetic rounds differently, so replay the run
+        for part in self.parts:
+            damage = part.apply(damage)
+        return damage
+
+class AttackContext:
+    """The attack being resolved, exposed to effects as state.current_attack"""
+    __slots__ = ('attacker', 'defender', 'target_player', 'damage')
+
+    def __init__(self, attacker: Card, defender: Optional[Card], target_player, damage):
+        self.attacker = attacker
+        self.defender = defender
+        self.target_player = target_player
+        self.damage = damage
+
+def _is_affine(modifier) -> bool:
+    return isinstance(modifier, DamageModifier)
+
+def _is_integral(modifier) -> bool:
+    return _is_affine(modifier) and type(modifier.add) is int and type(modifier.multiply) is int
+
+def _expand(modifiers) -> list:
+    """Modifiers with composed stages replaced by the runs they fold"""
+    expanded = []
+    for modifier in modifiers:
+        expanded.extend(modifier.parts if isinstance(modifier, ComposedModifier) else (modifier,))
+    return expanded
+
+def calculate_damage_batch(base_damage: Sequence, modifier_lists: Sequence[Sequence],
+                           shared_modifiers: Sequence = ()) -> list:
+    """Vectorized equivalent of applying each attack's modifiers in order.
+
+    modifier_lists holds each attack's own modifiers; shared_modifiers are
+    then applied to every attack as broadcast scalars. Modifier k of every
+    attack is applied in the same vector step, so the arithmetic (and
+    therefore the result) matches the scalar path exactly. Attacks with
+    fewer modifiers are padded with the identity (x * 1 + 0). Falls back to
+    the scalar loop without NumPy or for non-affine modifiers.
+    """
+    if np is None or not all(_is_affine(m) for m in shared_modifiers) or \
+            not all(_is_affine(m) for mods in modifier_lists for m in mods):
+        return [
+            _apply_modifiers(damage, list(mods) + list(shared_modifiers))
+            for damage, mods in zip(base_damage, modifier_lists)
+        ]
+
+    values = [m.add for mods in modifier_lists for m in mods] + [m.multiply for mods in modifier_lists for m in mods]
+    values += [m.add for m in shared_modifiers] + [m.multiply for m in shared_modifiers]
+    dtype = np.int64 if all(isinstance(value, int) for value in values) else np.float64
+    if dtype is np.float64:
+        # Composed stages are only exact on integers, as in ComposedModifier.apply
+        modifier_lists = [_expand(mods) for mods in modifier_lists]
+        shared_modifiers = _expand(shared_modifiers)
+
+    count = len(base_damage)
+    width = max(map(len, modifier_lists), default=0)
+
+    damage = np.asarray(base_damage, dtype=dtype)
+    if width:
+        # Pack row-major in Python lists, convert once
+        multiply = [[1] * count for _ in range(width)]
+        add = [[0] * count for _ in range(width)]
+        for column, mods in enumerate(modifier_lists):
+            for row, modifier in enumerate(mods):
+                multiply[row][column] = modifier.multiply
+                add[row][column] = modifier.add
+        multiply = np.array(multiply, dtype=dtype)
+        add = np.array(add, dtype=dtype)
+        for row in range(width):
+            damage = damage * multiply[row] + add[row]
+
+    for modifier in shared_modifiers:
+        damage = damage * modifier.multiply + modifier.add
+    return np.maximum(damage, 0).tolist()
+
+def _apply_modifiers(damage, modifiers):
+    for modifier in modifiers:
+        damage = modifier.apply(damage)
+    return max(0, damage)
+
+def compose_modifiers(modifiers: Sequence) -> tuple:
+    """Fold a modifier stack into as few stages as possible.
+
+    Runs of consecutive integer affine modifiers collapse into one
+    ComposedModifier: (d * m1 + a1) * m2 + a2 == d * (m1 * m2) + (a1 * m2 + a2),
+    which is exact for integers only. Float modifiers, and any others, are
+    kept as their own stage, in order, so results match applying the stack
+    one modifier at a time.
+    """
+    stages = []
+    for modifier in modifiers:
+        if _is_integral(modifier) and stages and _is_integral(stages[-1]):
+            previous = stages[-1]
+            parts = previous.parts if isinstance(previous, ComposedModifier) else (previous,)
+            stages[-1] = ComposedModifier(
+                add=previous.add * modifier.multiply + modifier.add,
+                multiply=previous.multiply * modifier.multiply,
+                parts=parts + (modifier,)
+            )
+        else:
+            stages.append(modifier)
+    return tuple(stages)
 
 class CombatManager:
+    # Pending attacks needed before resolve_attacks switches to the vectorized path
+    BATCH_THRESHOLD = 64
+
     def __init__(self):
         self.pending_attacks = []
-        self.damage_modifiers = []
+        self._damage_modifiers = []
+        self._pipeline = ()
+        # Per defending player: [(modifier, direct_only)] and the stacks
+        # precomposed from it for (attacks on believers, direct attacks)
+        self._defense_modifiers = {}
+        self._defense_pipelines = {}
+        
+    @property
+    def damage_modifiers(self) -> tuple:
+        """Global modifiers in application order (use add/remove to change)"""
+        return tuple(self._damage_modifiers)
+        
+    @damage_modifiers.setter
+    def damage_modifiers(self, modifiers):
+        self._damage_modifiers = []
+        for modifier in modifiers:
+            self._check_modifier(modifier)
+            self._damage_modifiers.append(modifier)
+        self._pipeline = compose_modifiers(self._damage_modifiers)
+        
+    def add_damage_modifier(self, modifier, defender=None, direct_only: bool = False):
+        """Add a modifier and recompose its pipeline.
+
+        Without `defender` the modifier is global. With one it only applies
+        to attacks on that player (and with `direct_only` only to attacks on
+        the player themself), after on_damage has adjusted the damage, as
+        with defensive card abilities.
+        """
+        self._check_modifier(modifier)
+        if defender is None:
+            self._damage_modifiers.append(modifier)
+            self._pipeline = compose_modifiers(self._damage_modifiers)
+            return
+        self._defense_modifiers.setdefault(defender, []).append((modifier, direct_only))
+        self._compose_defense(defender)
+        
+    def remove_damage_modifier(self, modifier, defender=None, direct_only: bool = False) -> bool:
+        """Remove a modifier added with the same arguments and recompose its pipeline"""
+        if defender is None:
+            if modifier not in self._damage_modifiers:
+                return False
+            self._damage_modifiers.remove(modifier)
+            self._pipeline = compose_modifiers(self._damage_modifiers)
+            return True
+        modifiers = self._defense_modifiers.get(defender, [])
+        if (modifier, direct_only) not in modifiers:
+            return False
+        modifiers.remove((modifier, direct_only))
+        self._compose_defense(defender)
+        return True
+        
+    def _compose_defense(self, defender):
+        modifiers = self._defense_modifiers[defender]
+        if not modifiers:
+            del self._defense_modifiers[defender]
+            del self._defense_pipelines[defender]
+            return
+        self._defense_pipelines[defender] = (
+            compose_modifiers([modifier for modifier, direct_only in modifiers if not direct_only]),
+            compose_modifiers([modifier for modifier, _ in modifiers])
+        )
+        
+    @staticmethod
+    def _check_modifier(modifier):
+        if not hasattr(modifier, 'apply'):
+            raise TypeError(f"Damage modifier {modifier!r} is missing an apply method")
         
     def declare_attack(self, attacker: Card, defender: Optional[Card], position: Position):
-        if attacker.card_type != "BELIEVER":
+        if attacker.card_type != CardType.BELIEVER:
             return False
             
         attack_data = {
@@ -22,21 +216,82 @@ class CombatManager:
         self.pending_attacks.append(attack_data)
         return True
 
-    def resolve_attacks(self):
-        for attack in self.pending_attacks:
-            total_damage = self._calculate_damage(attack)
-            if attack.get("defender"):
-                attack["defender"].take_damage(total_damage)
-            else:
-                # Direct attack to player
-                attack["attacker"].player.opponent.take_damage(total_damage)
+    def resolve_attacks(self, on_damage=None, batch=None):
+        """Apply all pending attacks; on_damage(attack, damage) may adjust each total.
+
+        Each defender's own modifiers then apply to the adjusted total.
+        batch=True computes every attack's damage in one vectorized pass,
+        batch=None does so once BATCH_THRESHOLD attacks are pending.
+        """
+        if batch is None:
+            batch = np is not None and len(self.pending_attacks) >= self.BATCH_THRESHOLD
+            
+        if batch:
+            damages = self.calculate_damages()
+        else:
+            damages = None
+            
+        for index, attack in enumerate(self.pending_attacks):
+            total_damage = damages[index] if damages is not None else self._calculate_damage(attack)
+            if on_damage is not None:
+                total_damage = on_damage(attack, total_damage)
+            self._apply_damage(attack, self._defend(attack, total_damage))
         self.pending_attacks.clear()
+        
+    def calculate_damages(self) -> list:
+        """Damage for every pending attack, vectorized where possible"""
+        return calculate_damage_batch(
+            [attack["attacker"].faith_points or 0 for attack in self.pending_attacks],
+            [attack["modifiers"] for attack in self.pending_attacks],
+            self._pipeline
+        )
+        
+    def _defend(self, attack, damage):
+        """Damage after the defending player's precomposed modifiers"""
+        pipelines = self._defense_pipelines.get(attack["attacker"].owner.opponent)
+        if pipelines is None:
+            return damage
+        for stage in pipelines[attack.get("defender") is None]:
+            damage = stage.apply(damage)
+        return max(0, damage)
+        
+    def _apply_damage(self, attack, total_damage):
+        if attack.get("defender"):
+            attack["defender"].take_damage(total_damage)
+        else:
+            # Direct attack to player
+            attack["attacker"].owner.opponent.take_damage(total_damage)
 
     def _calculate_damage(self, attack_data):
-        base_damage = attack_data["attacker"].faith_points
-        for modifier in attack_data["modifiers"] + self.damage_modifiers:
-            if hasattr(modifier, 'apply'):
-                base_damage = modifier.apply(base_damage)
-            else:
-                print("Error: Modifier missing apply method")
-        return max(0, base_damage) 
\ No newline at end of file
+        damage = attack_data["attacker"].faith_points or 0
+        for modifier in attack_data["modifiers"]:
+            damage = modifier.apply(damage)
+        # The global stack is precomposed; usually a single affine stage
+        for stage in self._pipeline:
+            damage = stage.apply(damage)
+        return max(0, damage)
+
+def resolve_lockstep(managers: Sequence[CombatManager], hooks: Optional[Sequence] = None):
+    """Resolve the pending attacks of many games in one vectorized pass.
+
+    hooks, if given, holds one on_damage callable (or None) per manager.
+    Damage is applied game by game in declaration order, as resolve_attacks
+    would.
+    """
+    attacks = [attack for manager in managers for attack in manager.pending_attacks]
+    damages = calculate_damage_batch(
+        [attack["attacker"].faith_points or 0 for attack in attacks],
+        [attack["modifiers"] + list(manager._pipeline)
+         for manager in managers for attack in manager.pending_attacks]
+    )
+    
+    index = 0
+    for position, manager in enumerate(managers):
+        on_damage = hooks[position] if hooks else None
+        for attack in manager.pending_attacks:
+            total_damage = damages[index]
+            index += 1
+            if on_damage is not None:
+                total_damage = on_damage(attack, total_damage)
+            manager._apply_damage(attack, manager._defend(attack, total_damage))
+        manager.pending_attacks.clear() 
\ No newline at end of file
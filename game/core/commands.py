@@ -0,0 +1,228 @@
+"""Game state changes as small, serializable commands.
+
+Every change a player can make is a Command: a frozen dataclass naming its
+cards by zone index rather than by object, so it can be logged, sent over
+the network and replayed against any copy of the state. GameEngine routes
+its mutating methods through a CommandDispatcher, which makes it the one
+place where changes are validated, applied and announced.
+
+Card indexes are into the active player's hand or sanctuary, except
+DeclareAttack's defender, which indexes the opponent's sanctuary.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from typing import ClassVar, Dict, Iterable, Optional, Type
+
+from .constants import MAX_SANCTUARY_SIZE
+from ..managers.event_manager import EventType
+from ..types.enums import CardType, Position
+
+class CommandError(ValueError):
+    """Raised for data that does not describe a command"""
+
+COMMANDS: Dict[str, Type["Command"]] = {}
+
+def _register(cls):
+    COMMANDS[cls.kind] = cls
+    return cls
+
+@dataclass(frozen=True)
+class Command(ABC):
+    kind: ClassVar[str] = ""
+
+    @abstractmethod
+    def validate(self, engine) -> bool:
+        """Whether the command is legal in the engine's current state"""
+
+    @abstractmethod
+    def apply(self, engine):
+        """Carry out a validated command"""
+
+    def to_tuple(self) -> tuple:
+        """Plain (kind, *fields) form for logs and the network"""
+        return (self.kind,) + tuple(getattr(self, f.name) for f in fields(self))
+
+def command_from_tuple(data) -> Command:
+    """Inverse of Command.to_tuple()"""
+    try:
+        return COMMANDS[data[0]](*data[1:])
+    except (KeyError, IndexError, TypeError) as error:
+        raise CommandError(f"Not a command: {data!r}") from error
+
+def _card(cards: list, index) -> Optional[object]:
+    if isinstance(index, int) and 0 <= index < len(cards):
+        return cards[index]
+    return None
+
+@_register
+@dataclass(frozen=True)
+class DrawCard(Command):
+    """A player draws up to `count` cards, as hand size allows"""
+    kind: ClassVar[str] = "draw_card"
+    player: int
+    count: int = 1
+
+    def validate(self, engine) -> bool:
+        if engine.game_over or self.player not in (0, 1) or self.count < 1:
+            return False
+        player = engine.players[self.player]
+        return len(player.hand) < player.MAX_HAND_SIZE and bool(player.deck)
+
+    def apply(self, engine):
+        engine.players[self.player].draw_cards(self.count)
+
+@_register
+@dataclass(frozen=True)
+class PlayCard(Command):
+    """Play a card from hand to the sanctuary or mission zone"""
+    kind: ClassVar[str] = "play_card"
+    card: int
+    zone: str
+
+    def validate(self, engine) -> bool:
+        if not engine.can_perform("play_card"):
+            return False
+        player = engine.active_player
+        card = _card(player.hand, self.card)
+        return card is not None and self.zone in engine.get_valid_zones(card) \
+            and (card.skp_cost or 0) <= player.current_skp
+
+    def apply(self, engine):
+        player = engine.active_player
+        card = player.hand[self.card]
+        player.play_card(self.card, self.zone)
+        engine._enter_play(card)
+
+@_register
+@dataclass(frozen=True)
+class SummonBeliever(Command):
+    """Summon a believer from hand to the sanctuary"""
+    kind: ClassVar[str] = "summon"
+    card: int
+
+    def validate(self, engine) -> bool:
+        if not engine.can_perform("summon"):
+            return False
+        player = engine.active_player
+        card = _card(player.hand, self.card)
+        return card is not None and card.card_type == CardType.BELIEVER \
+            and len(player.sanctuary) < MAX_SANCTUARY_SIZE and (card.skp_cost or 0) <= player.current_skp
+
+    def apply(self, engine):
+        player = engine.active_player
+        card = player.hand[self.card]
+        player.play_card(self.card, "SANCTUARY")
+        engine._enter_play(card)
+
+@_register
+@dataclass(frozen=True)
+class AssignMission(Command):
+    """Send a sanctuary believer out to preach, allowing it to attack"""
+    kind: ClassVar[str] = "assign_mission"
+    card: int
+
+    def validate(self, engine) -> bool:
+        if not engine.can_perform("assign_mission"):
+            return False
+        card = _card(engine.active_player.sanctuary, self.card)
+        return card is not None and card.card_type == CardType.BELIEVER and card.position != Position.PREACHING
+
+    def apply(self, engine):
+        player = engine.active_player
+        player.set_position(player.sanctuary[self.card], Position.PREACHING)
+        engine.state_version += 1
+
+@_register
+@dataclass(frozen=True)
+class DeclareAttack(Command):
+    """Attack with a preaching believer; no defender means a direct attack"""
+    kind: ClassVar[str] = "attack"
+    attacker: int
+    defender: Optional[int] = None
+
+    def validate(self, engine) -> bool:
+        if not engine.can_perform("attack"):
+            return False
+        player = engine.active_player
+        attacker = _card(player.sanctuary, self.attacker)
+        if attacker is None or attacker.card_type != CardType.BELIEVER:
+            return False
+        if attacker.position != Position.PREACHING or attacker in engine.attacked_this_turn:
+            return False
+
+        if self.defender is None:
+            # Direct attacks are only allowed against an empty sanctuary
+            return "direct_attack" not in engine.blocked_actions \
+                and not any(card.card_type == CardType.BELIEVER for card in player.opponent.sanctuary)
+        defender = _card(player.opponent.sanctuary, self.defender)
+        return defender is not None and defender.card_type == CardType.BELIEVER
+
+    def apply(self, engine):
+        player = engine.active_player
+        attacker = player.sanctuary[self.attacker]
+        defender = None if self.defender is None else player.opponent.sanctuary[self.defender]
+        engine.combat_manager.declare_attack(attacker, defender, attacker.position)
+        engine.attacked_this_turn.add(attacker)
+        engine.state_version += 1
+        engine.events.publish(EventType.ATTACK_DECLARED, attacker, defender)
+
+@_register
+@dataclass(frozen=True)
+class AdvancePhase(Command):
+    """Leave the current phase; leaving REFLECTION ends the turn"""
+    kind: ClassVar[str] = "end_phase"
+
+    def validate(self, engine) -> bool:
+        return engine.can_perform("end_phase")
+
+    def apply(self, engine):
+        engine._next_phase()
+        if engine.skip_empty_phases:
+            engine._skip_empty_phases()
+
+@_register
+@dataclass(frozen=True)
+class EndTurn(Command):
+    """Finish the active player's turn and start the opponent's"""
+    kind: ClassVar[str] = "end_turn"
+
+    def validate(self, engine) -> bool:
+        return engine.can_perform("end_turn")
+
+    def apply(self, engine):
+        engine._end_turn()
+        if engine.skip_empty_phases:
+            engine._skip_empty_phases()
+
+class CommandDispatcher:
+    """Validates, applies and announces commands for one engine.
+
+    Top-level commands are published as COMMAND_APPLIED once applied.
+    Commands issued while another one applies, such as the draw on entering
+    INVOCATION, run through the same path but are consequences of it:
+    replaying the announced commands reproduces them, so they are not
+    announced themselves.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._depth = 0
+
+    def dispatch(self, command: Command, validate: bool = True) -> bool:
+        """Apply a command if legal; pass validate=False for commands already checked"""
+        engine = self.engine
+        if validate and not command.validate(engine):
+            return False
+
+        self._depth += 1
+        try:
+            command.apply(engine)
+        finally:
+            self._depth -= 1
+        if not self._depth:
+            engine.events.publish(EventType.COMMAND_APPLIED, command)
+        return True
+
+    def dispatch_all(self, commands: Iterable[Command], validate: bool = True) -> int:
+        """Apply commands in order, skipping illegal ones; returns how many applied"""
+        return sum(self.dispatch(command, validate) for command in commands)
@@ -10,4 +10,9 @@ DARK_BLUE = (0, 0, 139)
 
 # Game constants
 MAX_HAND_SIZE = 7
-STARTING_LIFE = 20 
\ No newline at end of file
+STARTING_LIFE = 20
+STARTING_HAND_SIZE = 5
+STARTING_GRACE_POINTS = 8000
+STARTING_SKP = 3
+MAX_SKP = 10
+MAX_SANCTUARY_SIZE = 5
\ No newline at end of file
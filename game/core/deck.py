@@ -0,0 +1,89 @@
+from collections import deque
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from .zobrist import DECK, MASK, zone_key
+
+class Deck:
+    """Draw pile backed by a deque; the left end is the top of the deck.
+
+    The deck keeps a zobrist hash of its order. Cards are keyed by their
+    position counted from the bottom, so drawing or adding at the top
+    changes one key and costs O(1).
+    """
+
+    __slots__ = ('_cards', '_hash')
+
+    def __init__(self, cards: Iterable = ()):
+        self._cards = deque(cards)
+        self._hash = self.compute_hash()
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __bool__(self):
+        return bool(self._cards)
+
+    def __iter__(self):
+        """Iterate from top to bottom"""
+        return iter(self._cards)
+
+    def __contains__(self, card):
+        return card in self._cards
+
+    def __repr__(self):
+        return f"Deck({len(self._cards)} cards)"
+
+    @property
+    def zobrist(self) -> int:
+        return self._hash
+
+    def compute_hash(self) -> int:
+        """Hash the deck order from scratch"""
+        size = len(self._cards)
+        return sum(zone_key(card, DECK, size - 1 - i) for i, card in enumerate(self._cards)) & MASK
+
+    def draw(self, count: Optional[int] = None):
+        """Draw the top card, or a list of up to `count` cards when given"""
+        cards = self._cards
+        if count is None:
+            card = cards.popleft()
+            self._hash = (self._hash - zone_key(card, DECK, len(cards))) & MASK
+            return card
+
+        drawn = []
+        for _ in range(min(count, len(cards))):
+            card = cards.popleft()
+            self._hash -= zone_key(card, DECK, len(cards))
+            drawn.append(card)
+        self._hash &= MASK
+        return drawn
+
+    def mill(self, count: int) -> List:
+        """Remove up to `count` cards from the top without drawing them"""
+        return self.draw(count)
+
+    def peek(self, count: int = 1) -> List:
+        """Look at the top `count` cards without removing them"""
+        return list(islice(self._cards, count))
+
+    def shuffle(self, rng):
+        """Shuffle in place with the given random.Random instance"""
+        cards = list(self._cards)
+        rng.shuffle(cards)
+        self._cards.clear()
+        self._cards.extend(cards)
+        self._hash = self.compute_hash()
+
+    def place_on_top(self, cards: Iterable):
+        """Put cards on top; the first card given ends up on top"""
+        for card in reversed(list(cards)):
+            self._hash += zone_key(card, DECK, len(self._cards))
+            self._cards.appendleft(card)
+        self._hash &= MASK
+
+    def place_on_bottom(self, cards: Iterable):
+        """Put cards on the bottom in the given order"""
+        # Every existing card moves up, so the hash is rebuilt
+        self._cards.extend(cards)
+        self._hash = self.compute_hash()
@@ -0,0 +1,458 @@
+import logging
+import random
+from collections import namedtuple
+from typing import Iterator, List, Optional, Tuple
+
+from .player import Player
+from .combat_manager import AttackContext, CombatManager
+from .commands import (AdvancePhase, AssignMission, Command, CommandDispatcher, DeclareAttack, EndTurn,
+                       PlayCard, SummonBeliever)
+from . import zobrist
+from .constants import MAX_SANCTUARY_SIZE, MAX_SKP, STARTING_HAND_SIZE
+from ..effect_system import EffectManager, Timing
+from ..effects.ability_compiler import card_effects
+from ..managers.event_manager import EventBus, EventType
+from ..phases.phase_manager import PHASE_ORDER, PhaseManager
+from ..types.enums import Phase, CardType, Position
+
+logger = logging.getLogger('TestamentDuel')
+
+# A move for the active player; card, zone and target are None where unused
+Action = namedtuple("Action", "kind card zone target", defaults=(None, None, None))
+
+END_PHASE = Action("end_phase")
+END_TURN = Action("end_turn")
+
+# What effects can stop a player doing on their next turn: actions, plus the
+# draw on entering INVOCATION and attacking the player directly
+BLOCKABLE = ("draw", "play_card", "summon", "assign_mission", "attack", "direct_attack")
+
+class GameEngine:
+    """Pure-Python rules core: players, zones, phases, combat and effects.
+
+    The engine never touches pygame, so it can run headless for simulation,
+    AI and server use. The pygame client in game/game.py is a view over it.
+    Every change a player makes goes through `commands`, a CommandDispatcher;
+    the methods below are conveniences that build the command.
+    """
+
+    def __init__(self, player1_deck: list, player2_deck: list,
+                 player_names=("Player 1", "Player 2"), seed=None,
+                 skip_empty_phases: bool = False):
+        # All randomness flows through this RNG so seeded games are reproducible
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Headless play can pass straight through phases with nothing to do
+        self.skip_empty_phases = skip_empty_phases
+        
+        # Initialize managers
+        self.combat_manager = CombatManager()
+        self.effect_manager = EffectManager()
+        self.phase_manager = PhaseManager(self)
+        self.events = EventBus()
+        self.commands = CommandDispatcher(self)
+
+        self.players = [
+            Player(player_names[0], player1_deck),
+            Player(player_names[1], player2_deck)
+        ]
+        self.players[0].opponent = self.players[1]
+        self.players[1].opponent = self.players[0]
+
+        # Win conditions can only change when grace, a deck or a hand does,
+        # so players flag the state dirty and checks skip clean states
+        self._state_dirty = True
+        for player in self.players:
+            player.on_change = self._mark_dirty
+            player.events = self.events
+
+        # Game state
+        self.current_phase = Phase.INVOCATION
+        self.active_player_index = 0
+        self.turn_count = 1
+        self.game_over = False
+        self.winner: Optional[Player] = None
+        self.current_attack = None
+        self.effect_source = None
+        self.card_effect_handles = {}
+        # Damage modifiers that cards in play added to the combat manager
+        self.card_damage_modifiers = {}
+        # The cards themselves rather than id()s, which would not survive pickling (MCTS snapshots)
+        self.attacked_this_turn = set()
+        # Limits on the active player's turn, and those waiting for each player's next turn
+        self.blocked_actions = frozenset()
+        self.next_turn_blocks = [frozenset(), frozenset()]
+        self.next_turn_skp_loss = [0, 0]
+        # [owner index, owner's turns left, modifier, direct_only] for modifiers that expire
+        self.timed_damage_modifiers = []
+
+        # Bumped by every engine action and player change; keys derived caches
+        self.state_version = 0
+        self._legal_actions = (None, ())
+
+        # Shuffle and draw starting hands
+        for player in self.players:
+            player.deck.shuffle(self.rng)
+            for _ in range(STARTING_HAND_SIZE):
+                player.draw_card()
+
+        self._start_turn()
+        if skip_empty_phases:
+            self._skip_empty_phases()
+
+    @property
+    def active_player(self) -> Player:
+        return self.players[self.active_player_index]
+
+    @property
+    def owner(self) -> Player:
+        """Player whose effects are currently resolving"""
+        if self.effect_source is not None:
+            return self.effect_source.owner
+        return self.active_player
+
+    def state_hash(self) -> int:
+        """64-bit zobrist hash of both players, the phase, the active player and turn restrictions.
+
+        Player hashes are maintained incrementally, so this is O(1).
+        """
+        return zobrist.combine(
+            zobrist.splitmix64(self.players[0].zobrist ^ zobrist.key(zobrist.SEAT, 0)),
+            zobrist.splitmix64(self.players[1].zobrist ^ zobrist.key(zobrist.SEAT, 1)),
+            zobrist.key(zobrist.PHASE, self.phase_manager.current.index),
+            zobrist.key(zobrist.ACTIVE_PLAYER, self.active_player_index),
+            self._restrictions_key()
+        )
+
+    def _restrictions_key(self) -> int:
+        # Packed into an int, as keys of strings would differ between processes
+        packed = 0
+        for blocks in (self.blocked_actions, *self.next_turn_blocks):
+            packed = packed << len(BLOCKABLE) | sum(1 << BLOCKABLE.index(action) for action in blocks)
+        for loss in self.next_turn_skp_loss:
+            packed = packed << 8 | min(loss, 0xFF)
+        return zobrist.key(zobrist.RESTRICTIONS, packed) if packed else 0
+
+    def can_perform(self, action: str) -> bool:
+        """Check whether an action is allowed in the current phase"""
+        return not self.game_over and action in self.phase_manager.current.actions \
+            and action not in self.blocked_actions
+
+    # Effects on later turns
+
+    def block_next_turn(self, player: Player, actions):
+        """Stop a player taking BLOCKABLE actions during their next turn"""
+        index = self.players.index(player)
+        self.next_turn_blocks[index] = self.next_turn_blocks[index] | frozenset(actions)
+        self.state_version += 1
+
+    def drain_next_turn(self, player: Player, amount: int):
+        """Take SKP from a player once their next turn has refreshed it"""
+        self.next_turn_skp_loss[self.players.index(player)] += amount
+        self.state_version += 1
+
+    def add_timed_damage_modifier(self, player: Player, modifier, turns: int, direct_only: bool = False):
+        """Modify damage to a player until `turns` more of their own turns have started.
+
+        Only the opponent attacks in between, so one turn lasts through the
+        opponent's next turn.
+        """
+        self.combat_manager.add_damage_modifier(modifier, player, direct_only)
+        self.timed_damage_modifiers.append([self.players.index(player), turns, modifier, direct_only])
+
+    # Phases and turns
+
+    def advance_phase(self) -> Phase:
+        """Leave the current phase and enter the next one, ending the turn after REFLECTION"""
+        self.commands.dispatch(AdvancePhase())
+        return self.current_phase
+
+    def end_turn(self):
+        """Finish the active player's turn and start the opponent's"""
+        self.commands.dispatch(EndTurn())
+
+    def _next_phase(self):
+        self.state_version += 1
+        if not self.phase_manager.advance():
+            self._end_turn()
+            return
+        self.check_win_condition()
+
+    def _skip_empty_phases(self):
+        """Pass through phases where the active player can only pass, at most one lap"""
+        for _ in PHASE_ORDER:
+            if self.game_over or not self.phase_manager.is_idle():
+                return
+            self._next_phase()
+
+    def _end_turn(self):
+        self.state_version += 1
+        self.phase_manager.exit()
+
+        self.effect_manager.resolve_effects(Timing.END_OF_TURN, self)
+
+        self.active_player_index = 1 - self.active_player_index
+        if self.active_player_index == 0:
+            self.turn_count += 1
+
+        self._start_turn()
+        self.events.publish(EventType.TURN_CHANGED, self.active_player_index, self.turn_count)
+        self.check_win_condition()
+
+    def _start_turn(self):
+        """Refresh resources and enter the draw phase"""
+        player = self.active_player
+        index = self.active_player_index
+        if self.turn_count > 1:
+            player.max_skp = min(MAX_SKP, player.max_skp + 1)
+        player.current_skp = max(0, player.max_skp - self.next_turn_skp_loss[index])
+        self.next_turn_skp_loss[index] = 0
+        self.blocked_actions, self.next_turn_blocks[index] = self.next_turn_blocks[index], frozenset()
+        self.attacked_this_turn.clear()
+        self._expire_damage_modifiers(index)
+
+        self.effect_manager.resolve_effects(Timing.START_OF_TURN, self)
+        self.phase_manager.enter(Phase.INVOCATION)
+
+    def _expire_damage_modifiers(self, player_index: int):
+        kept = []
+        for entry in self.timed_damage_modifiers:
+            if entry[0] == player_index:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    self.combat_manager.remove_damage_modifier(entry[2], self.players[player_index], entry[3])
+                    continue
+            kept.append(entry)
+        self.timed_damage_modifiers = kept
+
+    # Player actions
+
+    def get_valid_zones(self, card) -> List[str]:
+        """Get valid zones for playing a card"""
+        valid_zones = []
+        player = self.active_player
+
+        if card.card_type == CardType.BELIEVER:
+            if len(player.sanctuary) < MAX_SANCTUARY_SIZE:
+                valid_zones.append("SANCTUARY")
+        elif card.card_type == CardType.RELIC:
+            if player.sanctuary and len(player.sanctuary) < MAX_SANCTUARY_SIZE:
+                valid_zones.append("SANCTUARY")
+        elif card.card_type in [CardType.MIRACLE, CardType.MISSION, CardType.SCRIPTURE]:
+            valid_zones.append("MISSION")
+
+        return valid_zones
+
+    def play_card(self, card, zone: str) -> bool:
+        """Play a card from the active player's hand to a zone"""
+        hand = self.active_player.hand
+        return card in hand and self.commands.dispatch(PlayCard(hand.index(card), zone))
+
+    def summon_believer(self, card) -> bool:
+        """Summon a believer from hand to the sanctuary"""
+        hand = self.active_player.hand
+        return card in hand and self.commands.dispatch(SummonBeliever(hand.index(card)))
+
+    def assign_mission(self, card) -> bool:
+        """Send a sanctuary believer out to preach, allowing it to attack"""
+        sanctuary = self.active_player.sanctuary
+        return card in sanctuary and self.commands.dispatch(AssignMission(sanctuary.index(card)))
+
+    def declare_attack(self, attacker, defender=None) -> bool:
+        """Declare an attack by a preaching believer"""
+        player = self.active_player
+        if attacker not in player.sanctuary:
+            return False
+        if defender is not None and defender not in player.opponent.sanctuary:
+            return False
+        target = None if defender is None else player.opponent.sanctuary.index(defender)
+        return self.commands.dispatch(DeclareAttack(player.sanctuary.index(attacker), target))
+
+    def legal_actions(self) -> Tuple[Action, ...]:
+        """Every action the active player can take now, memoized per state_version"""
+        version, actions = self._legal_actions
+        if version != self.state_version:
+            actions = tuple(self.iter_actions())
+            self._legal_actions = (self.state_version, actions)
+        return actions
+
+    def iter_actions(self) -> Iterator[Action]:
+        """Lazily generate legal actions, passing moves last; cheap to stop early"""
+        if self.game_over:
+            return
+
+        allowed = self.phase_manager.current.actions
+        if self.blocked_actions:
+            allowed = allowed - self.blocked_actions
+        player = self.active_player
+
+        if "play_card" in allowed:
+            for card in player.hand:
+                if (card.skp_cost or 0) <= player.current_skp:
+                    for zone in self.get_valid_zones(card):
+                        yield Action("play_card", card, zone)
+
+        if "summon" in allowed and len(player.sanctuary) < MAX_SANCTUARY_SIZE:
+            for card in player.hand:
+                if card.card_type == CardType.BELIEVER and (card.skp_cost or 0) <= player.current_skp:
+                    yield Action("summon", card)
+
+        if "assign_mission" in allowed or "attack" in allowed:
+            defenders = None
+            for card in player.sanctuary:
+                if card.card_type != CardType.BELIEVER:
+                    continue
+                if card.position != Position.PREACHING:
+                    if "assign_mission" in allowed:
+                        yield Action("assign_mission", card)
+                elif "attack" in allowed and card not in self.attacked_this_turn:
+                    if defenders is None:
+                        defenders = [c for c in player.opponent.sanctuary if c.card_type == CardType.BELIEVER]
+                        # Direct attacks are only allowed against an empty sanctuary
+                        if not defenders and "direct_attack" not in self.blocked_actions:
+                            defenders = [None]
+                    for defender in defenders:
+                        yield Action("attack", card, target=defender)
+
+        yield END_PHASE
+        yield END_TURN
+
+    def action_key(self, action: Action) -> tuple:
+        """Describe an action by zone indexes so it can be replayed on a copy of the state"""
+        player = self.active_player
+        card_index = target_index = None
+        if action.card is not None:
+            zone = player.hand if action.kind in ("play_card", "summon") else player.sanctuary
+            card_index = zone.index(action.card)
+        if action.target is not None:
+            target_index = player.opponent.sanctuary.index(action.target)
+        return (action.kind, card_index, action.zone, target_index)
+
+    def action_from_key(self, key: tuple) -> Action:
+        """Inverse of action_key() against this engine's current state"""
+        kind, card_index, zone, target_index = key
+        player = self.active_player
+        card = target = None
+        if card_index is not None:
+            cards = player.hand if kind in ("play_card", "summon") else player.sanctuary
+            card = cards[card_index]
+        if target_index is not None:
+            target = player.opponent.sanctuary[target_index]
+        return Action(kind, card, zone, target)
+
+    def command_for(self, action: Action) -> Command:
+        """The command that carries out an action in the current state"""
+        return self.command_from_key(self.action_key(action))
+
+    @staticmethod
+    def command_from_key(key: tuple) -> Command:
+        """Command for an action_key() tuple; both name cards by zone index"""
+        kind, card_index, zone, target_index = key
+        if kind == "play_card":
+            return PlayCard(card_index, zone)
+        if kind == "summon":
+            return SummonBeliever(card_index)
+        if kind == "assign_mission":
+            return AssignMission(card_index)
+        if kind == "attack":
+            return DeclareAttack(card_index, target_index)
+        if kind == "end_phase":
+            return AdvancePhase()
+        if kind == "end_turn":
+            return EndTurn()
+        raise ValueError(f"Unknown action: {kind}")
+
+    def perform(self, action: Action, validate: bool = True) -> bool:
+        """Carry out an action; validate=False skips re-checking one from legal_actions()"""
+        return self.commands.dispatch(self.command_for(action), validate)
+
+    def resolve_combat(self):
+        """Resolve pending attacks and clear destroyed cards"""
+        if not self.combat_manager.pending_attacks:
+            return
+
+        self.combat_manager.resolve_attacks(self._apply_attack_effects)
+        self._discard_destroyed()
+        self.events.publish(EventType.COMBAT_RESOLVED)
+
+    def _apply_attack_effects(self, attack, damage):
+        """Let ON_ATTACK and ON_DEFEND effects adjust an attack's damage"""
+        attacker = attack["attacker"]
+        self.current_attack = AttackContext(attacker, attack.get("defender"), attacker.owner.opponent, damage)
+        self.effect_manager.resolve_effects(Timing.ON_ATTACK, self)
+        self.effect_manager.resolve_effects(Timing.ON_DEFEND, self)
+        damage = max(0, self.current_attack.damage)
+        self.current_attack = None
+        return damage
+
+    # Card effects
+
+    def _enter_play(self, card):
+        """Resolve a card's immediate effects and activate its lasting ones"""
+        self.state_version += 1
+        self.events.publish(EventType.CARD_PLAYED, card.owner, card)
+        handles = []
+        modifiers = []
+        for effect in card_effects(card.definition):
+            modifier = getattr(effect, "modifier", None)
+            if effect.timing == Timing.IMMEDIATE:
+                self.effect_source = card
+                if effect.condition(self):
+                    effect.action(self)
+                self.effect_source = None
+            elif modifier is not None:
+                # Static reductions join the owner's precomposed defense pipeline
+                self.combat_manager.add_damage_modifier(modifier, card.owner, effect.direct_only)
+                modifiers.append((modifier, effect.direct_only))
+            else:
+                handles.append(self.effect_manager.activate_effect(effect, card))
+        if handles:
+            self.card_effect_handles[card] = handles
+        if modifiers:
+            self.card_damage_modifiers[card] = modifiers
+
+        # Miracles are spent once resolved
+        if card.card_type == CardType.MIRACLE and card in card.owner.mission_cards:
+            card.owner.retire_mission_card(card)
+
+        self._discard_destroyed()
+        self.check_win_condition()
+
+    def _discard_destroyed(self):
+        """Send destroyed cards to the vault and deactivate their effects"""
+        for player in self.players:
+            for card in player.discard_destroyed():
+                self.events.publish(EventType.CARD_DESTROYED, player, card)
+                for handle in self.card_effect_handles.pop(card, ()):
+                    self.effect_manager.deactivate_effect(handle)
+                for modifier, direct_only in self.card_damage_modifiers.pop(card, ()):
+                    self.combat_manager.remove_damage_modifier(modifier, player, direct_only)
+
+    # State checks
+
+    def _mark_dirty(self, player=None):
+        self._state_dirty = True
+        self.state_version += 1
+
+    def check_win_condition(self) -> bool:
+        """Check if game is over; a no-op unless a player changed since the last check"""
+        if self.game_over or not self._state_dirty:
+            return self.game_over
+        self._state_dirty = False
+
+        for i, player in enumerate(self.players):
+            if player.grace_points <= 0:
+                self._finish(self.players[1 - i], "")
+                break
+
+            if len(player.deck) == 0 and len(player.hand) == 0:
+                self._finish(self.players[1 - i], " by deck out")
+                break
+
+        return self.game_over
+
+    def _finish(self, winner: Player, reason: str):
+        self.game_over = True
+        self.winner = winner
+        self.events.publish(EventType.GAME_OVER, winner)
+        logger.info(f"Game Over! {winner.name} wins{reason}!")
@@ -1,4 +1,16 @@
+import logging
 from .constants import *
+from .deck import Deck
+from . import zobrist
+from .zobrist import MASK, zone_key
+from ..managers.event_manager import EventType
+from ..state.persistent import PMap
+from ..types.enums import Position
+
+logger = logging.getLogger('TestamentDuel')
+
+# Zones captured by Player.snapshot(), besides the deck
+ZONES = ('hand', 'sanctuary', 'mission_cards', 'vault')
 
 class Player:
     MAX_HAND_SIZE = 5  # Example value
@@ -7,26 +19,216 @@ class Player:
         """Initialize a player with a name and a deck of cards."""
         self.name = name
         self.deck = deck
-        self.hand = []        self.sanctuary = []
+        self.hand = []
+        self.sanctuary = []
         self.mission_cards = []
-        self.grace_points = STARTING_GRACE_POINTS
-        self.max_skp = STARTING_SKP
-        self.current_skp = STARTING_SKP
+        self.vault = []
+        self.opponent = None
+        # Called with this player whenever grace, deck or hand size changes
+        self.on_change = None
+        # EventBus shared with the engine, if any
+        self.events = None
+        self._grace_points = STARTING_GRACE_POINTS
+        self._max_skp = STARTING_SKP
+        self._current_skp = STARTING_SKP
+        # Incremental hash of everything but the deck, which hashes itself
+        self._hash = self.compute_hash(include_deck=False)
+        # Last snapshot, and the zones changed since it was taken
+        self._snapshot = None
+        self._snapshot_deck = None
+        self._stale = set(ZONES)
+        
+        for card in self.deck:
+            card.owner = self
+            
+    @property
+    def deck(self) -> Deck:
+        return self._deck
+        
+    @deck.setter
+    def deck(self, cards):
+        self._deck = cards if isinstance(cards, Deck) else Deck(cards)
+        
+    @property
+    def grace_points(self) -> int:
+        return self._grace_points
+        
+    @grace_points.setter
+    def grace_points(self, value: int):
+        if value != self._grace_points:
+            old = self._grace_points
+            self._rekey(zobrist.GRACE, old, value)
+            self._grace_points = value
+            self._changed()
+            if self.events is not None:
+                self.events.publish(EventType.GRACE_CHANGED, self, old, value)
+            
+    @property
+    def current_skp(self) -> int:
+        return self._current_skp
+        
+    @current_skp.setter
+    def current_skp(self, value: int):
+        self._rekey(zobrist.SKP, self._current_skp, value)
+        self._current_skp = value
+        
+    @property
+    def max_skp(self) -> int:
+        return self._max_skp
         
+    @max_skp.setter
+    def max_skp(self, value: int):
+        self._rekey(zobrist.MAX_SKP, self._max_skp, value)
+        self._max_skp = value
+        
+    # Zobrist hashing
+    
+    @property
+    def zobrist(self) -> int:
+        """64-bit hash of hand, deck order, zones, grace and SKP"""
+        return (self._hash + self._deck.zobrist) & MASK
+        
+    def compute_hash(self, include_deck: bool = True) -> int:
+        """Hash the player from scratch; equals `zobrist` unless lists were edited directly"""
+        keys = [
+            zobrist.key(zobrist.GRACE, self._grace_points),
+            zobrist.key(zobrist.SKP, self._current_skp),
+            zobrist.key(zobrist.MAX_SKP, self._max_skp)
+        ]
+        keys.extend(zone_key(card, zobrist.HAND) for card in self.hand)
+        keys.extend(self._sanctuary_key(card) for card in self.sanctuary)
+        keys.extend(zone_key(card, zobrist.MISSION) for card in self.mission_cards)
+        if include_deck:
+            keys.append(self._deck.compute_hash())
+        return sum(keys) & MASK
+        
+    def _rekey(self, tag: int, old: int, new: int):
+        self._hash = (self._hash - zobrist.key(tag, old) + zobrist.key(tag, new)) & MASK
+        
+    def _hash_in(self, key: int):
+        self._hash = (self._hash + key) & MASK
+        
+    def _hash_out(self, key: int):
+        self._hash = (self._hash - key) & MASK
+        
+    @staticmethod
+    def _sanctuary_key(card) -> int:
+        zone = zobrist.PREACHING if card.position == Position.PREACHING else zobrist.SANCTUARY
+        return zone_key(card, zone)
+        
+    def set_position(self, card, position: Position):
+        """Change a sanctuary card's position, keeping the hash in step"""
+        self._hash_out(self._sanctuary_key(card))
+        card.position = position
+        self._hash_in(self._sanctuary_key(card))
+        self._stale.add('sanctuary')
+        
+    # Persistent snapshots
+    
+    def snapshot(self) -> PMap:
+        """Immutable view of the player; zones unchanged since the last call are shared"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = PMap({"name": self.name})
+        changes = {}
+        for field in ("grace_points", "current_skp", "max_skp"):
+            value = getattr(self, field)
+            if snapshot.get(field) != value:
+                changes[field] = value
+        for zone in self._stale:
+            if zone == 'sanctuary':
+                changes[zone] = tuple((card.name, card.position.name) for card in self.sanctuary)
+            else:
+                changes[zone] = tuple(card.name for card in getattr(self, zone))
+        # The deck's order-sensitive hash tells whether it moved
+        deck_hash = self._deck.zobrist
+        if deck_hash != self._snapshot_deck:
+            changes["deck"] = tuple(card.name for card in self._deck)
+            self._snapshot_deck = deck_hash
+        
+        if changes:
+            snapshot = snapshot.update(changes)
+        self._snapshot = snapshot
+        self._stale.clear()
+        return snapshot
+            
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
+            
     def draw_card(self):
         """Draw a card from the deck to the hand, if possible."""
         if len(self.hand) >= self.MAX_HAND_SIZE:
-            print(f"{self.name}'s hand is full!")
+            logger.debug(f"{self.name}'s hand is full!")
             return False
             
         if not self.deck:
-            print(f"{self.name}'s deck is empty!")
+            logger.debug(f"{self.name}'s deck is empty!")
             return False
             
-        card = self.deck.pop(0)
+        card = self.deck.draw()
         self.hand.append(card)
+        self._hash_in(zone_key(card, zobrist.HAND))
+        self._stale.add('hand')
+        self._changed()
+        if self.events is not None:
+            self.events.publish(EventType.CARD_DRAWN, self, card)
         return True
         
+    def draw_cards(self, count: int) -> int:
+        """Draw up to `count` cards, limited by hand size; returns cards drawn"""
+        cards = self.deck.draw(min(count, self.MAX_HAND_SIZE - len(self.hand)))
+        self.hand.extend(cards)
+        self._stale.add('hand')
+        for card in cards:
+            self._hash_in(zone_key(card, zobrist.HAND))
+            if self.events is not None:
+                self.events.publish(EventType.CARD_DRAWN, self, card)
+        if cards:
+            self._changed()
+        return len(cards)
+        
+    def mill(self, count: int) -> int:
+        """Send up to `count` cards from the top of the deck to the Heavenly Vault"""
+        cards = self.deck.mill(count)
+        self.vault.extend(cards)
+        self._stale.add('vault')
+        if cards:
+            self._changed()
+        return len(cards)
+        
+    def discard(self, card_index: int):
+        """Move a card from hand to the Heavenly Vault"""
+        card = self.hand.pop(card_index)
+        self.vault.append(card)
+        self._hash_out(zone_key(card, zobrist.HAND))
+        self._stale.update(('hand', 'vault'))
+        self._changed()
+        return card
+        
+    def discard_hand(self):
+        """Move the whole hand to the Heavenly Vault"""
+        if self.hand:
+            for card in self.hand:
+                self._hash_out(zone_key(card, zobrist.HAND))
+            self.vault.extend(self.hand)
+            self.hand.clear()
+            self._stale.update(('hand', 'vault'))
+            self._changed()
+        
+    def shuffle_hand_into_deck(self, rng) -> int:
+        """Shuffle the whole hand back into the deck; returns how many cards it held"""
+        count = len(self.hand)
+        if count:
+            for card in self.hand:
+                self._hash_out(zone_key(card, zobrist.HAND))
+            self.deck.place_on_top(self.hand)
+            self.hand.clear()
+            self.deck.shuffle(rng)
+            self._stale.add('hand')
+            self._changed()
+        return count
+        
     def play_card(self, card_index: int, zone: str) -> bool:
         """Play a card from hand to a specific zone"""
         if card_index >= len(self.hand):
@@ -37,15 +239,67 @@ class Player:
         # Check zone-specific conditions
         if zone == 'SANCTUARY':
             if len(self.sanctuary) >= MAX_SANCTUARY_SIZE:
-                print(f"{self.name}'s sanctuary is full!")
+                logger.debug(f"{self.name}'s sanctuary is full!")
                 return False
                 
             if self.current_skp >= card.skp_cost:
                 self.current_skp -= card.skp_cost
-                self.sanctuary.append(self.hand.pop(card_index))
-                print(f"{self.name} played {card.name} to sanctuary")
+                self.hand.pop(card_index)
+                card.position = Position.SANCTUARY
+                self.sanctuary.append(card)
+                self._hash_out(zone_key(card, zobrist.HAND))
+                self._hash_in(self._sanctuary_key(card))
+                self._stale.update(('hand', 'sanctuary'))
+                self._changed()
+                logger.debug(f"{self.name} played {card.name} to sanctuary")
+                return True
+            else:
+                logger.debug(f"Not enough SKP to play {card.name}")
+                
+        elif zone == 'MISSION':
+            if self.current_skp >= card.skp_cost:
+                self.current_skp -= card.skp_cost
+                self.hand.pop(card_index)
+                card.position = Position.MISSION
+                self.mission_cards.append(card)
+                self._hash_out(zone_key(card, zobrist.HAND))
+                self._hash_in(zone_key(card, zobrist.MISSION))
+                self._stale.update(('hand', 'mission_cards'))
+                self._changed()
+                logger.debug(f"{self.name} played {card.name} to missions")
                 return True
             else:
-                print(f"Not enough SKP to play {card.name}")
+                logger.debug(f"Not enough SKP to play {card.name}")
                 
         return False
+        
+    def take_damage(self, amount: int):
+        """Reduce grace points by the given amount"""
+        self.grace_points -= amount
+        
+    def heal(self, amount: int):
+        """Restore grace points by the given amount"""
+        self.grace_points += amount
+        
+    def discard_destroyed(self):
+        """Move destroyed cards from the sanctuary and mission zone to the Heavenly Vault"""
+        destroyed = [card for card in self.sanctuary if card.is_destroyed]
+        if destroyed:
+            self.sanctuary = [card for card in self.sanctuary if not card.is_destroyed]
+            self.vault.extend(destroyed)
+            self._stale.update(('sanctuary', 'vault'))
+            for card in destroyed:
+                self._hash_out(self._sanctuary_key(card))
+                
+        # Only ability effects destroy mission cards, such as Scriptures
+        retired = [card for card in self.mission_cards if card.is_destroyed]
+        for card in retired:
+            self.retire_mission_card(card)
+        return destroyed + retired
+        
+    def retire_mission_card(self, card):
+        """Move a spent card from the mission zone to the Heavenly Vault"""
+        self.mission_cards.remove(card)
+        self.vault.append(card)
+        self._hash_out(zone_key(card, zobrist.MISSION))
+        self._stale.update(('mission_cards', 'vault'))
@@ -0,0 +1,77 @@
+"""Zobrist-style 64-bit keys for incremental game-state hashing.
+
+Every feature of the state (a card in a zone, a grace total, the phase) maps
+to a pseudo-random 64-bit key. A state's hash is the sum of its feature keys
+modulo 2**64, so a mutation updates it in O(1) by subtracting the old key and
+adding the new one. Sums are used instead of XOR so that two copies of the
+same card in a zone do not cancel out.
+
+Keys come from a splitmix64 mix of stable inputs rather than a random table,
+so hashes agree across processes and machines, which desync checks rely on.
+They are computed on first use and cached.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Dict
+
+MASK = (1 << 64) - 1
+
+# Feature tags
+HAND = 1
+DECK = 2
+SANCTUARY = 3
+PREACHING = 4
+MISSION = 5
+GRACE = 6
+SKP = 7
+MAX_SKP = 8
+PHASE = 9
+ACTIVE_PLAYER = 10
+SEAT = 11
+RESTRICTIONS = 12
+
+def splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+@lru_cache(maxsize=8192)
+def key(tag: int, value=0) -> int:
+    """Key for a tagged scalar such as grace points or the phase index"""
+    if not isinstance(value, int):
+        # Float totals from multiplying modifiers; numeric hashes are not salted
+        value = hash(value)
+    return splitmix64(splitmix64(tag) ^ (value & MASK))
+
+_card_keys: Dict[object, int] = {}
+
+def card_key(card) -> int:
+    """Stable key for a card's definition; copies of a card share a key"""
+    definition = getattr(card, "definition", card)
+    result = _card_keys.get(definition)
+    if result is None:
+        if hasattr(definition, "name"):
+            card_type = getattr(definition.card_type, "name", definition.card_type)
+            identity = (definition.name, card_type, definition.level, definition.faith_points,
+                        definition.divinity_points, definition.skp_cost, definition.faction)
+        else:
+            identity = definition
+        digest = hashlib.blake2b(repr(identity).encode(), digest_size=8).digest()
+        result = _card_keys[definition] = int.from_bytes(digest, "little")
+    return result
+
+_zone_keys: Dict[tuple, int] = {}
+
+def zone_key(card, zone: int, slot: int = 0) -> int:
+    """Key for a card in a zone; `slot` distinguishes ordered positions"""
+    definition = getattr(card, "definition", card)
+    cache_key = (definition, zone, slot)
+    result = _zone_keys.get(cache_key)
+    if result is None:
+        result = _zone_keys[cache_key] = splitmix64(card_key(definition) ^ key(zone, slot))
+    return result
+
+def combine(*hashes: int) -> int:
+    """Sum component hashes into one 64-bit value"""
+    return sum(hashes) & MASK
@@ -1,4 +1,5 @@
-from typing import List, Callable
+from bisect import bisect_left, insort
+from typing import Dict, List, Callable
 from dataclasses import dataclass
 from enum import Enum, auto
 
@@ -22,9 +23,8 @@ class EffectChain:
         self.effects: List[Effect] = []
         
     def add_effect(self, effect: Effect):
-        self.effects.append(effect)
-        # Sort by priority
-        self.effects.sort(key=lambda x: x.priority, reverse=True)
+        # Binary insert keeps priority order (ties stay first-come) without re-sorting
+        insort(self.effects, effect, key=lambda x: -x.priority)
         
     def resolve(self, game_state):
         """Resolve all effects in chain"""
@@ -32,24 +32,92 @@ class EffectChain:
             if effect.condition(game_state):
                 effect.action(game_state)
 
+class EffectRegistry:
+    """Active effects bucketed by Timing, each bucket kept in priority order.
+
+    Entries are (-priority, sequence, effect, source) tuples, so plain tuple
+    comparison orders them by priority and then registration order. The same
+    Effect object may be registered many times with different sources.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Timing, List[tuple]] = {}
+        # A plain int rather than itertools.count so registries pickle
+        self._sequence = 0
+        self._size = 0
+        
+    def __len__(self):
+        return self._size
+        
+    def add(self, effect: Effect, source=None) -> tuple:
+        """Register an effect; returns a handle for remove()"""
+        entry = (-effect.priority, self._sequence, effect, source)
+        self._sequence += 1
+        insort(self._buckets.setdefault(effect.timing, []), entry)
+        self._size += 1
+        return entry
+        
+    def remove(self, handle: tuple) -> bool:
+        """Unregister an effect by the handle add() returned"""
+        bucket = self._buckets.get(handle[2].timing)
+        if not bucket:
+            return False
+            
+        index = bisect_left(bucket, handle)
+        if index < len(bucket) and bucket[index] is handle:
+            del bucket[index]
+            self._size -= 1
+            return True
+        return False
+        
+    def get(self, timing: Timing) -> List[tuple]:
+        """Entries for a timing, in resolution order"""
+        return self._buckets.get(timing, [])
+        
+    def __iter__(self):
+        for bucket in self._buckets.values():
+            for entry in bucket:
+                yield entry[2]
+
 class EffectManager:
     def __init__(self):
-        self.active_effects = []
+        self.registry = EffectRegistry()
         self.pending_chain = EffectChain()
         
+    @property
+    def active_effects(self) -> List[Effect]:
+        return list(self.registry)
+        
     def register_effect(self, effect: Effect):
         """Register a new effect to be resolved"""
         self.pending_chain.add_effect(effect)
         
-    def resolve_effects(self, timing: Timing, game_state):
-        """Resolve effects for a specific timing"""
-        relevant_effects = [
-            effect for effect in self.active_effects 
-            if effect.timing == timing
-        ]
+    def activate_effect(self, effect: Effect, source=None) -> tuple:
+        """Make an effect persist until deactivated"""
+        return self.registry.add(effect, source)
+        
+    def deactivate_effect(self, handle: tuple) -> bool:
+        """Remove a persistent effect"""
+        return self.registry.remove(handle)
         
-        chain = EffectChain()
-        for effect in relevant_effects:
-            chain.add_effect(effect)
+    def resolve_pending(self, game_state):
+        """Resolve and clear the pending chain"""
+        chain, self.pending_chain = self.pending_chain, EffectChain()
+        chain.resolve(game_state)
         
-        chain.resolve(game_state) 
\ No newline at end of file
+    def resolve_effects(self, timing: Timing, game_state):
+        """Resolve effects for a specific timing.
+
+        Each effect sees the card it was activated for as
+        game_state.effect_source.
+        """
+        bucket = self.registry.get(timing)
+        if not bucket:
+            return
+            
+        # Snapshot so effects may (de)activate others while resolving
+        for _, _, effect, source in tuple(bucket):
+            game_state.effect_source = source
+            if effect.condition(game_state):
+                effect.action(game_state)
+        game_state.effect_source = None
@@ -0,0 +1,466 @@
+"""Compile free-text card abilities into Effect objects.
+
+Abilities such as "Pray: Restores 300 FP every other turn." are parsed once
+into an Effect with a Timing, a condition and an action. Compilation is
+cached by text, so identical abilities share one compiled tuple, and by
+CardDefinition, so the engine never touches strings while resolving.
+
+Effects follow the engine's conventions: `state.owner` is the player who
+owns the resolving card, `state.effect_source` is that card and
+`state.current_attack` is the attack being resolved, if any.
+
+An ability may join several actions with "and", such as "Destroys one
+enemy Believer and deals 1000 FP damage"; it compiles to one effect per
+action, and only if every action is understood.
+
+Text the grammar does not understand compiles to no effects rather than
+to a guess. check_abilities() reports such cards when a deck is built:
+it warns once per card, or raises UnsupportedAbilityError when strict.
+Stat boosts, negation, immunity and abilities of equipped Relics have no
+engine mechanics yet, so they are among the unsupported texts.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from ..core.combat_manager import DamageModifier
+from ..effect_system import Effect, Timing
+from ..types.enums import CardType, Position
+
+logger = logging.getLogger('TestamentDuel')
+
+@dataclass
+class CompiledEffect(Effect):
+    """Effect compiled from ability text; pickles as its text.
+
+    Static damage reductions also carry the equivalent DamageModifier, which
+    the engine adds to the owner's defense pipeline in the CombatManager
+    instead of resolving the effect on every attack.
+    """
+    modifier: Optional[DamageModifier] = None
+    direct_only: bool = False
+
+    def __reduce__(self):
+        # Conditions and actions are closures, so recompile (from the cache)
+        # instead; this lets engines be snapshotted and sent to other processes
+        return (_recompile, (self.name, _compile(self.name).index(self)))
+
+def _recompile(text: str, index: int = 0) -> "CompiledEffect":
+    return _compile(text)[index]
+
+def _trailing(pattern: str):
+    return re.compile(r",?\s*(?:" + pattern + r")$")
+
+# Trailing qualifiers, stripped from the end of the text one at a time
+QUALIFIERS = [
+    (_trailing(r"every other turn"), lambda m: ("period", 2)),
+    (_trailing(r"every third turn"), lambda m: ("period", 3)),
+    (_trailing(r"(?:each|per|every) turn(?: while active)?"), lambda m: ("periodic", None)),
+    (_trailing(r"at the start of your turn"), lambda m: ("periodic", None)),
+    (_trailing(r"at the start of their turn"), lambda m: ("their_turn", None)),
+    (_trailing(r"when attacking directly|when this card attacks directly"), lambda m: ("direct_attack", None)),
+    (_trailing(r"after combat|after attacking|when attacking|(?:for each|for every|on a) successful attack"),
+     lambda m: ("attack", None)),
+    (_trailing(r"when your fp is attacked directly"), lambda m: ("defend_direct", None)),
+    (_trailing(r"if attacked|when attacked"), lambda m: ("defend", None)),
+    # Lasting effects already stop when their card leaves play
+    (_trailing(r"while equipped"), lambda m: ("while_in_play", None)),
+    (_trailing(r"if (?:the )?opponent has fewer than (\d+) skp"), lambda m: ("opponent_skp_below", int(m.group(1)))),
+    (_trailing(r"to opponents with a full hand"), lambda m: ("opponent_full_hand", None)),
+    # Lasting until the owner's next turn (or the one after that), see GameEngine.add_timed_damage_modifier()
+    (_trailing(r"this turn|for one turn|next turn|during their next turn"), lambda m: ("duration", 1)),
+    (_trailing(r"for (?:the next )?(\d+|two|three) turns"), lambda m: ("duration", NUMBERS.get(m.group(1)) or int(m.group(1)))),
+]
+
+NUMBERS = {"one": 1, "two": 2, "three": 3}
+CARD_TYPES = {"believer": CardType.BELIEVER, "relic": CardType.RELIC, "scripture": CardType.SCRIPTURE,
+              "miracle": CardType.MIRACLE}
+
+# What the opponent loses on their next turn, by the phrase naming it; see engine.BLOCKABLE
+BLOCKS = {
+    "summoning phase": ("summon",),
+    # Cards are played in the PREPARATION phase
+    "holy phase": ("play_card",),
+    "attack phase": ("assign_mission", "attack"),
+    "draw phase": ("draw",),
+    "attack": ("attack",),
+    "attack directly": ("direct_attack",),
+    "summon any believers": ("summon",),
+    "play any cards during their next holy phase": ("play_card",),
+    "drawing a card": ("draw",),
+    # Players draw one card a turn
+    "draws one fewer card": ("draw",),
+}
+
+# Kinds that change the damage their owner takes from attacks
+DEFENSES = ("reduce", "reduce_direct", "prevent")
+
+# Core actions; the text left after stripping qualifiers must match one fully
+ACTIONS = [
+    (re.compile(r"(?:restores|heals) (\d+) fp to both players"), "heal_both"),
+    # A player "gains" FP into their grace meter, as with "Gains 200 FP for every destroyed Believer"
+    (re.compile(r"(?:restores|heals|adds|transfers|gains) (\d+) fp(?: to your (?:grace meter|pool))?"), "heal"),
+    (re.compile(r"deals (\d+) fp damage to both players"), "damage_both"),
+    (re.compile(r"deals (\d+) fp damage for each (?:of your )?believers? in (?:your )?preaching position"),
+     "damage_per_preacher"),
+    (re.compile(r"opponent loses (\d+) fp for each card in their hand"), "damage_per_card"),
+    (re.compile(r"(?:gains|restores) (\d+) fp for each (believer|relic|scripture|miracle) in play"), "heal_per_card"),
+    (re.compile(r"gains (\d+) fp for every destroyed believer"), "heal_per_destroyed"),
+    (re.compile(r"deals (\d+) fp damage(?: to (?:the )?opponent(?:'s fp)?)?"), "damage"),
+    (re.compile(r"reduces opponent's fp by (\d+)|opponent loses (\d+) fp"), "damage"),
+    (re.compile(r"deals (?:an )?(?:additional|extra) (\d+) fp damage|deals (\d+) additional fp damage"
+                r"|increases fp damage by (\d+)"), "attack_bonus"),
+    (re.compile(r"reduces (?:all )?(?:incoming )?(?:fp )?damage"
+                r"(?: from all incoming attacks| from all sources| to your grace meter)? by (\d+)"
+                r"|opponent's fp damage is reduced by (\d+)"), "reduce"),
+    (re.compile(r"prevents all (?:fp |combat )?damage(?: to you)?"), "prevent"),
+    (re.compile(r"reduces fp damage from direct attacks by (\d+)|opponent's direct attacks deal (\d+) less fp damage"
+                r"|reduces all damage to your grace points by (\d+)"), "reduce_direct"),
+    (re.compile(r"opponent loses (\d+) skp"), "drain_skp"),
+    (re.compile(r"(?:adds|grants|restores) (\d+) skp(?: to your pool)?"), "gain_skp"),
+    (re.compile(r"draws? (\d+|one|two|three) (?:extra |additional )?cards?"), "draw"),
+    (re.compile(r"opponent discards one card(?: randomly)?"), "discard"),
+    (re.compile(r"opponent loses (\d+|one|two|three) cards? from their hand at random"), "discard"),
+    (re.compile(r"opponent discards one (believer|relic|scripture|miracle) card"), "discard_type"),
+    (re.compile(r"forces the opponent to discard their entire hand"), "discard_hand"),
+    (re.compile(r"both players shuffle their hands into their decks and redraw"), "shuffle_hands"),
+    (re.compile(r"(?:opponent skips|forces the opponent to skip) their next "
+                r"(summoning phase|holy phase|attack phase|draw phase)"
+                r"|opponent cannot (attack directly|attack|summon any believers|play any cards during their next holy phase)"
+                r"|prevents the opponent from (drawing a card)|opponent (draws one fewer card)"), "block"),
+    (re.compile(r"destroys all enemy believers"), "destroy_enemies"),
+    (re.compile(r"destroys all (enemy )?believers with (fp|dp) (greater|less) than (\d+)"), "destroy_where"),
+    (re.compile(r"destroys one (enemy |of your own )?believers?(?: with (fp|dp) (greater|less) than (\d+))?"),
+     "destroy_believer"),
+    (re.compile(r"(?:destroys|removes) (one|1|all) (?:enemy |equipped )?(relic|scripture)s?(?: cards?)?"
+                r"(?: on the field| from the field| from the opponent's equipped believer)?"), "destroy_card"),
+]
+
+# Joins between the actions of a compound ability
+CONJUNCTION = re.compile(r",? and ")
+
+def _normalize(text: str) -> str:
+    text = text.replace("’", "'").replace("\x92", "'")
+    return " ".join(text.strip().rstrip(".").lower().split())
+
+def _amount(match) -> int:
+    value = next(group for group in match.groups() if group)
+    return NUMBERS.get(value) or int(value)
+
+def _strongest(cards):
+    # Removal picks the biggest threat, so the outcome needs no choice from the player
+    return max(cards, key=lambda card: card.faith_points or 0, default=None)
+
+def _destroy(card):
+    if card is not None:
+        card.is_destroyed = True
+
+def _defense_modifier(kind: str, match) -> DamageModifier:
+    if kind == "prevent":
+        return DamageModifier(multiply=0)
+    return DamageModifier(add=-_amount(match))
+
+def _build_action(kind: str, match, duration: Optional[int] = None):
+    if kind in DEFENSES and duration:
+        modifier, direct_only = _defense_modifier(kind, match), kind == "reduce_direct"
+        return lambda state: state.add_timed_damage_modifier(state.owner, modifier, duration, direct_only)
+    if kind == "prevent":
+        def prevent(state):
+            state.current_attack.damage = 0
+        return prevent
+
+    if kind in ("destroy_where", "destroy_believer"):
+        whose, stat, comparison, threshold = match.groups()
+        field = "faith_points" if stat == "fp" else "divinity_points"
+        threshold = int(threshold) if threshold else None
+        greater = comparison == "greater"
+
+        def matches(card):
+            if card.card_type != CardType.BELIEVER:
+                return False
+            if threshold is None:
+                return True
+            value = getattr(card, field) or 0
+            return value > threshold if greater else value < threshold
+
+        if kind == "destroy_believer":
+            # "one believer" with no owner means an enemy one
+            own = whose == "of your own "
+            return lambda state: _destroy(_strongest(
+                [card for card in (state.owner if own else state.owner.opponent).sanctuary if matches(card)]))
+
+        enemy_only = whose
+
+        def destroy_where(state):
+            players = [state.owner.opponent] if enemy_only else state.players
+            for player in players:
+                for card in player.sanctuary:
+                    if matches(card):
+                        card.is_destroyed = True
+        return destroy_where
+
+    if kind == "destroy_card":
+        count, type_name = match.groups()
+        card_type = CARD_TYPES[type_name]
+
+        def destroy_card(state):
+            opponent = state.owner.opponent
+            # Relics stand in the sanctuary, Scriptures in the mission zone
+            targets = [card for card in opponent.sanctuary + opponent.mission_cards if card.card_type == card_type]
+            for card in targets if count == "all" else targets[:1]:
+                card.is_destroyed = True
+        return destroy_card
+
+    if kind == "discard_type":
+        card_type = CARD_TYPES[match.group(1)]
+
+        def discard_type(state):
+            opponent = state.owner.opponent
+            index = next((i for i, card in enumerate(opponent.hand) if card.card_type == card_type), None)
+            if index is not None:
+                opponent.discard(index)
+        return discard_type
+
+    if kind == "destroy_enemies":
+        def destroy_enemies(state):
+            for card in state.owner.opponent.sanctuary:
+                if card.card_type == CardType.BELIEVER:
+                    card.is_destroyed = True
+        return destroy_enemies
+
+    if kind == "discard":
+        count = _amount(match) if match.groups() else 1
+
+        def discard(state):
+            opponent = state.owner.opponent
+            for _ in range(min(count, len(opponent.hand))):
+                opponent.discard(state.rng.randrange(len(opponent.hand)))
+        return discard
+
+    if kind == "discard_hand":
+        return lambda state: state.owner.opponent.discard_hand()
+
+    if kind == "shuffle_hands":
+        def shuffle_hands(state):
+            for player in state.players:
+                player.draw_cards(player.shuffle_hand_into_deck(state.rng))
+        return shuffle_hands
+
+    if kind == "block":
+        actions = BLOCKS[next(group for group in match.groups() if group)]
+        return lambda state: state.block_next_turn(state.owner.opponent, actions)
+
+    amount = _amount(match)
+    if kind == "heal":
+        return lambda state: state.owner.heal(amount)
+    if kind == "heal_both":
+        return lambda state: [player.heal(amount) for player in state.players]
+    if kind == "damage":
+        return lambda state: state.owner.opponent.take_damage(amount)
+    if kind == "damage_both":
+        return lambda state: [player.take_damage(amount) for player in state.players]
+    if kind == "damage_per_preacher":
+        def damage_per_preacher(state):
+            preachers = sum(1 for card in state.owner.sanctuary
+                            if card.card_type == CardType.BELIEVER and card.position == Position.PREACHING)
+            state.owner.opponent.take_damage(amount * preachers)
+        return damage_per_preacher
+    if kind == "damage_per_card":
+        return lambda state: state.owner.opponent.take_damage(amount * len(state.owner.opponent.hand))
+    if kind == "heal_per_card":
+        card_type = CARD_TYPES[match.group(2)]
+
+        def heal_per_card(state):
+            in_play = sum(1 for player in state.players for card in player.sanctuary + player.mission_cards
+                          if card.card_type == card_type)
+            state.owner.heal(amount * in_play)
+        return heal_per_card
+    if kind == "heal_per_destroyed":
+        def heal_per_destroyed(state):
+            destroyed = sum(1 for player in state.players for card in player.vault
+                            if card.card_type == CardType.BELIEVER)
+            state.owner.heal(amount * destroyed)
+        return heal_per_destroyed
+    if kind == "attack_bonus":
+        def attack_bonus(state):
+            state.current_attack.damage += amount
+        return attack_bonus
+    if kind in ("reduce", "reduce_direct"):
+        def reduce(state):
+            state.current_attack.damage = max(0, state.current_attack.damage - amount)
+        return reduce
+    if kind == "drain_skp" and duration:
+        return lambda state: state.drain_next_turn(state.owner.opponent, amount)
+    if kind == "drain_skp":
+        def drain_skp(state):
+            opponent = state.owner.opponent
+            opponent.current_skp = max(0, opponent.current_skp - amount)
+        return drain_skp
+    if kind == "gain_skp":
+        def gain_skp(state):
+            state.owner.current_skp += amount
+        return gain_skp
+    if kind == "draw":
+        return lambda state: state.owner.draw_cards(amount)
+    raise ValueError(f"Unknown action kind: {kind}")
+
+def _timing(prefix: str, kind: str, qualifiers: dict) -> Timing:
+    if "attack" in qualifiers or "direct_attack" in qualifiers or kind == "attack_bonus":
+        return Timing.ON_ATTACK
+    if qualifiers.keys() & {"defend", "defend_direct"} or (kind in DEFENSES and "duration" not in qualifiers):
+        return Timing.ON_DEFEND
+    if qualifiers.keys() & {"period", "periodic", "their_turn"}:
+        return Timing.START_OF_TURN
+    if prefix == "preach":
+        return Timing.ON_ATTACK
+    if prefix == "pray":
+        return Timing.START_OF_TURN
+    return Timing.IMMEDIATE
+
+def _build_condition(timing: Timing, kind: str, qualifiers: dict):
+    checks = []
+
+    if timing == Timing.START_OF_TURN:
+        if "their_turn" in qualifiers or kind == "drain_skp":
+            # Draining SKP only sticks after the opponent's refresh
+            checks.append(lambda state: state.active_player is state.owner.opponent)
+        else:
+            checks.append(lambda state: state.active_player is state.owner)
+    elif timing == Timing.ON_ATTACK:
+        checks.append(lambda state: state.current_attack.attacker is state.effect_source)
+    elif timing == Timing.ON_DEFEND:
+        checks.append(lambda state: state.current_attack.target_player is state.owner)
+
+    if qualifiers.keys() & {"direct_attack", "defend_direct"} or (kind == "reduce_direct" and timing == Timing.ON_DEFEND):
+        checks.append(lambda state: state.current_attack.defender is None)
+    if "period" in qualifiers:
+        period = qualifiers["period"]
+        checks.append(lambda state: state.turn_count % period == 0)
+    if "opponent_skp_below" in qualifiers:
+        limit = qualifiers["opponent_skp_below"]
+        checks.append(lambda state: state.owner.opponent.current_skp < limit)
+    if "opponent_full_hand" in qualifiers:
+        checks.append(lambda state: len(state.owner.opponent.hand) >= state.owner.opponent.MAX_HAND_SIZE)
+
+    if not checks:
+        return lambda state: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda state: all(check(state) for check in checks)
+
+def _parse(text: str):
+    """Split normalized text into (prefix, [(action kind, match)], qualifiers)"""
+    prefix = ""
+    if text.startswith(("pray:", "preach:")):
+        prefix, text = (part.strip() for part in text.split(":", 1))
+
+    qualifiers = {}
+    stripped = True
+    while stripped:
+        stripped = False
+        for pattern, build in QUALIFIERS:
+            match = pattern.search(text)
+            if match and match.start() > 0:
+                name, value = build(match)
+                qualifiers[name] = value
+                text = text[:match.start()]
+                stripped = True
+                break
+
+    if prefix == "pray":
+        # Pray abilities renew every turn, so a duration adds nothing
+        qualifiers.pop("duration", None)
+
+    # Some single actions contain "and" themselves
+    action = _match_action(text)
+    if action is not None:
+        return prefix, [action], qualifiers
+    actions = []
+    for part in CONJUNCTION.split(text):
+        action = _match_action(part)
+        if action is None:
+            return None
+        actions.append(action)
+    return prefix, actions, qualifiers
+
+def _match_action(text: str):
+    for pattern, kind in ACTIONS:
+        match = pattern.fullmatch(text)
+        if match:
+            return kind, match
+    return None
+
+def compile_ability(text: str) -> Tuple[Effect, ...]:
+    """Compile ability text into effects; unsupported text yields ()"""
+    if not text:
+        return ()
+    # Effects are named by, and pickle as, their cache key, so it must be canonical
+    return _compile(text.strip())
+
+@lru_cache(maxsize=None)
+def _compile(text: str) -> Tuple[Effect, ...]:
+    parsed = _parse(_normalize(text))
+    if parsed is None:
+        # Deck builders report the cards, see check_abilities()
+        logger.debug(f"Unsupported ability: {text!r}")
+        return ()
+
+    prefix, actions, qualifiers = parsed
+    duration = qualifiers.get("duration")
+    effects = []
+    for kind, match in actions:
+        timing = _timing(prefix, kind, qualifiers)
+        effects.append(CompiledEffect(
+            name=text,
+            timing=timing,
+            condition=_build_condition(timing, kind, qualifiers),
+            action=_build_action(kind, match, duration),
+            modifier=_defense_modifier(kind, match) if timing == Timing.ON_DEFEND and kind in DEFENSES else None,
+            direct_only=kind == "reduce_direct"
+        ))
+    return tuple(effects)
+
+def is_supported(text: str) -> bool:
+    """Whether the compiler understands the given ability text"""
+    return bool(compile_ability(text))
+
+class UnsupportedAbilityError(ValueError):
+    """Raised when a strictly built deck holds ability text the compiler cannot play"""
+
+_reported = set()
+
+def check_abilities(cards, strict: bool = False) -> list:
+    """Cards whose ability text compiles to nothing; deck builders call this.
+
+    Such cards would play with no effect, so each one is logged as a
+    warning the first time a deck holds it, or raised as an
+    UnsupportedAbilityError when `strict`.
+    """
+    unsupported = [card for card in cards
+                   if isinstance(card.effect, str) and card.effect.strip() and not is_supported(card.effect)]
+    if strict and unsupported:
+        names = ", ".join(sorted({card.name for card in unsupported}))
+        raise UnsupportedAbilityError(f"Cards with abilities the engine cannot play: {names}")
+    for card in unsupported:
+        if card.definition not in _reported:
+            _reported.add(card.definition)
+            logger.warning(f"{card.name}'s ability is not supported and will have no effect: {card.effect.strip()!r}")
+    return unsupported
+
+_card_effects: Dict[object, Tuple[Effect, ...]] = {}
+
+def card_effects(definition) -> Tuple[Effect, ...]:
+    """Compiled effects for a CardDefinition, looked up by identity"""
+    effects = _card_effects.get(definition)
+    if effects is None:
+        effect = definition.effect
+        if isinstance(effect, Effect):
+            effects = (effect,)
+        elif isinstance(effect, str):
+            effects = compile_ability(effect)
+        else:
+            effects = ()
+        _card_effects[definition] = effects
+    return effects
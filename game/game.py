@@ -1,66 +1,70 @@
 import pygame
-import json
-from pathlib import Path
-from .core.player import Player
-from .core.card import Card
-from .core.combat import CombatManager
+from .core.engine import GameEngine
+from .phases.phase_manager import PHASE_ACTIONS
+from .state.replay_player import ReplayPlayer
 from .ui.ui_manager import UIManager
-from .constants import *
-from .types import Position, CardType, Phase
+from .utils.deck_loader import load_deck
+from .core.constants import *
+from .types import Phase
 
 class TestamentDuelGame:
-    def __init__(self, screen, clock, debug=False):
+    """Pygame view over the headless GameEngine"""
+
+    def __init__(self, screen, clock, debug=False, engine=None, ai=None, replay_path=None, checkpoint_interval=32):
         self.screen = screen
         self.clock = clock
         self.debug = debug
+        self.debug_font = pygame.font.Font(None, 24)
+        
+        # Load decks from JSON unless a ready engine is supplied
+        if engine is None:
+            player1_deck = load_deck("assets/decks/player1_deck.json")
+            player2_deck = load_deck("assets/decks/player2_deck.json")
+            engine = GameEngine(player1_deck, player2_deck)
+        self.engine = engine
+        self.phase_actions = PHASE_ACTIONS
+        
+        # Optional computer opponent (game.ai.mcts.AIController), searched off-thread
+        self.ai = ai
+        
+        # Every command, from the UI or the AI, is recorded for review and saved on exit
+        self.replay = ReplayPlayer(checkpoint_interval)
+        self.replay.record(self.engine)
+        self.replay_path = replay_path
         
         # Initialize managers
         self.ui_manager = UIManager(screen, self)
-        self.combat_manager = CombatManager()
-        
-        # Load decks from JSON
-        player1_deck = self._load_deck("assets/decks/player1_deck.json")
-        player2_deck = self._load_deck("assets/decks/player2_deck.json")
-        
-        # Initialize players with proper decks
-        self.players = [
-            Player("Player 1", player1_deck),
-            Player("Player 2", player2_deck)
-        ]
-        
-        # Game state
-        self.current_phase = Phase.INVOCATION
-        self.active_player_index = 0
-        self.turn_count = 1
-        self.game_over = False
-        
-        # Draw starting hands
-        for player in self.players:
-            for _ in range(5):
-                player.draw_card()
-                
-    def _load_deck(self, filepath: str) -> list:
-        """Load deck from JSON file"""
-        path = Path(filepath)
-        if not path.exists():
-            raise FileNotFoundError(f"Deck file not found: {filepath}")
-            
-        with open(path) as f:
-            deck_data = json.load(f)
-            
-        deck = []
-        for card_data in deck_data:
-            card = Card(
-                name=card_data["name"],
-                card_type=CardType[card_data["card_type"]],
-                effect=card_data["effect"],
-                faith_points=card_data.get("faith_points"),
-                divinity_points=card_data.get("divinity_points"),
-                skp_cost=card_data["skp_cost"]
-            )
-            deck.append(card)
-        return deck
-
+        
+    # Game state lives in the engine; the view only reads it
+    
+    @property
+    def players(self):
+        return self.engine.players
+        
+    @property
+    def current_phase(self):
+        return self.engine.current_phase
+        
+    @property
+    def active_player_index(self):
+        return self.engine.active_player_index
+        
+    @property
+    def turn_count(self):
+        return self.engine.turn_count
+        
+    @property
+    def game_over(self):
+        return self.engine.game_over
+        
+    @property
+    def winner(self):
+        return self.engine.winner
+        
+    @property
+    def combat_manager(self):
+        return self.engine.combat_manager
+        
     def handle_event(self, event):
         """Handle game events"""
         if event.type == pygame.QUIT:
@@ -76,16 +80,17 @@ class TestamentDuelGame:
             
         return True
         
+    @property
+    def ai_turn(self) -> bool:
+        return self.ai is not None and self.ai.is_turn(self.engine)
+        
     def _handle_key_press(self, event):
         """Handle keyboard controls"""
-        if self.game_over:
+        if self.game_over or self.ai_turn:
             return
             
-        current_player = self.players[self.active_player_index]
-        
-        if event.key == pygame.K_SPACE:  # Draw card
+        if event.key == pygame.K_SPACE:  # Finish draw phase (the engine draws on entry)
             if self.current_phase == Phase.INVOCATION:
-                current_player.draw_card()
                 self._advance_phase()
                 
         elif event.key == pygame.K_TAB:  # End phase
@@ -96,7 +101,7 @@ class TestamentDuelGame:
             
     def _handle_mouse_click(self, event):
         """Handle mouse interactions"""
-        if self.game_over:
+        if self.game_over or self.ai_turn:
             return
             
         if event.button == 1:  # Left click
@@ -114,24 +119,22 @@ class TestamentDuelGame:
 
     def _handle_card_selection(self, card):
         """Handle card selection logic"""
-        current_player = self.players[self.active_player_index]
+        actions = [action for action in self.engine.legal_actions() if action.card is card]
         
         if self.current_phase == Phase.PREPARATION:
             # Handle playing cards to zones
-            if card in current_player.hand:
-                valid_zones = self._get_valid_zones(card)
-                self.ui_manager.show_zone_selection(valid_zones)
+            zones = [action.zone for action in actions if action.kind == "play_card"]
+            if zones:
+                self.ui_manager.show_zone_selection(zones)
                 
         elif self.current_phase == Phase.SUMMONING:
             # Handle summoning believers
-            if card.card_type == CardType.BELIEVER and card in current_player.hand:
-                if current_player.current_skp >= card.skp_cost:
-                    if len(current_player.sanctuary) < MAX_SANCTUARY_SIZE:
-                        self._summon_believer(card)
+            if any(action.kind == "summon" for action in actions):
+                self._summon_believer(card)
                         
         elif self.current_phase == Phase.MISSION:
             # Handle mission assignments
-            if card in current_player.sanctuary:
+            if any(action.kind == "assign_mission" for action in actions):
                 self._assign_mission(card)
 
     def _handle_right_click(self, pos):
@@ -142,47 +145,53 @@ class TestamentDuelGame:
 
     def _get_valid_zones(self, card) -> list:
         """Get valid zones for playing a card"""
-        valid_zones = []
-        
-        if card.card_type == CardType.BELIEVER:
-            valid_zones.append("SANCTUARY")
-        elif card.card_type == CardType.RELIC:
-            if self.players[self.active_player_index].sanctuary:
-                valid_zones.append("SANCTUARY")
-        elif card.card_type in [CardType.MIRACLE, CardType.MISSION]:
-            valid_zones.append("MISSION")
-            
-        return valid_zones
+        return self.engine.get_valid_zones(card)
 
     def _summon_believer(self, card):
         """Handle believer summoning"""
-        current_player = self.players[self.active_player_index]
-        card_index = current_player.hand.index(card)
-        
-        if current_player.play_card(card_index, "SANCTUARY"):
+        if self.engine.summon_believer(card):
             self.ui_manager.show_message(f"Summoned {card.name}")
             return True
         return False
+        
+    def _assign_mission(self, card):
+        """Handle mission assignment"""
+        if self.engine.assign_mission(card):
+            self.ui_manager.show_message(f"{card.name} is preaching")
+            return True
+        return False
+        
+    def handle_action(self, action):
+        """Dispatch a phase action chosen in the UI"""
+        if action == "end_phase":
+            self._advance_phase()
+        elif action == "end_turn":
+            self._end_turn()
+            
+    # The UI shows phase and turn transitions from engine events
+    
+    def _advance_phase(self):
+        """Advance to the next phase"""
+        self.engine.advance_phase()
+        
+    def _end_turn(self):
+        """End the active player's turn"""
+        self.engine.end_turn()
 
     def update(self):
         """Update game state"""
         if not self.game_over:
+            # Win checks run in the engine when grace, decks or hands change
             self.ui_manager.update()
-            self._check_win_condition()
-            
-    def _check_win_condition(self):
-        """Check if game is over"""
-        for i, player in enumerate(self.players):
-            if player.grace_points <= 0:
-                self.game_over = True
-                print(f"Game Over! {self.players[1-i].name} wins!")
-                break
-                
-            if len(player.deck) == 0 and len(player.hand) == 0:
-                self.game_over = True
-                print(f"Game Over! {self.players[1-i].name} wins by deck out!")
-                break
+            if self.ai is not None:
+                self._update_ai()
                 
+    def _update_ai(self):
+        """Apply the AI's move once its background search has finished"""
+        action = self.ai.poll(self.engine)
+        if action is not None:
+            self.engine.perform(action)
+            
     def draw(self):
         """Draw game state"""
         self.screen.fill((50, 50, 50))  # Dark gray background
@@ -196,6 +205,17 @@ class TestamentDuelGame:
             
         pygame.display.flip()
         
+    def _draw_game_over(self):
+        """Draw game over banner"""
+        text = f"Game Over! {self.winner.name} wins!" if self.winner else "Game Over!"
+        surface = self.debug_font.render(text, True, WHITE)
+        self.screen.blit(surface, surface.get_rect(center=self.screen.get_rect().center))
+        
+    def _draw_debug_info(self):
+        """Draw turn and phase information"""
+        text = f"Turn {self.turn_count} - {self.current_phase.value} - Player {self.active_player_index + 1}"
+        self.screen.blit(self.debug_font.render(text, True, WHITE), (10, 10))
+        
     def run(self):
         """Main game loop"""
         running = True
@@ -209,4 +229,9 @@ class TestamentDuelGame:
             self.draw()
             self.clock.tick(60)
             
+        if self.ai is not None:
+            self.ai.close()
+        self.replay.stop()
+        if self.replay_path is not None:
+            self.replay.save(self.replay_path)
         return 0
@@ -0,0 +1,97 @@
+from collections import deque
+from enum import IntEnum
+from typing import Callable, List, Tuple
+
+class EventType(IntEnum):
+    CARD_DRAWN = 0
+    CARD_PLAYED = 1
+    CARD_DESTROYED = 2
+    PHASE_CHANGED = 3
+    TURN_CHANGED = 4
+    GRACE_CHANGED = 5
+    ATTACK_DECLARED = 6
+    COMBAT_RESOLVED = 7
+    GAME_OVER = 8
+    COMMAND_APPLIED = 9
+
+# Payloads, passed positionally to handlers:
+#   CARD_DRAWN       (player, card)
+#   CARD_PLAYED      (player, card)
+#   CARD_DESTROYED   (player, card)
+#   PHASE_CHANGED    (phase,)
+#   TURN_CHANGED     (player_index, turn_count)
+#   GRACE_CHANGED    (player, old, new)
+#   ATTACK_DECLARED  (attacker, defender)  defender is None for direct attacks
+#   COMBAT_RESOLVED  ()
+#   GAME_OVER        (winner,)
+#   COMMAND_APPLIED  (command,)  top-level commands only, see core/commands.py
+
+class EventBus:
+    """Topic-indexed publish/subscribe.
+
+    Handlers live in per-topic tuples indexed by EventType, so publishing is a
+    list lookup and a truth test when nobody listens. publish() dispatches
+    immediately; post() queues the event until flush(), and batch handlers
+    receive every queued payload of their topic in one call.
+    """
+
+    def __init__(self):
+        self._handlers: List[Tuple[Callable, ...]] = [() for _ in EventType]
+        self._batch_handlers: List[Tuple[Callable, ...]] = [() for _ in EventType]
+        self._queue = deque()
+
+    def __reduce__(self):
+        # Subscribers belong to the live game, not to copies of its state
+        return (EventBus, ())
+
+    def subscribe(self, event_type: EventType, handler: Callable) -> Callable:
+        """Call `handler(*payload)` for every event of this type"""
+        self._handlers[event_type] += (handler,)
+        return handler
+
+    def subscribe_batch(self, event_type: EventType, handler: Callable) -> Callable:
+        """Call `handler(payloads)` once per flush with the queued events of this type"""
+        self._batch_handlers[event_type] += (handler,)
+        return handler
+
+    def unsubscribe(self, event_type: EventType, handler: Callable):
+        self._handlers[event_type] = tuple(h for h in self._handlers[event_type] if h != handler)
+        self._batch_handlers[event_type] = tuple(h for h in self._batch_handlers[event_type] if h != handler)
+
+    def has_subscribers(self, event_type: EventType) -> bool:
+        """Let hot paths skip building payloads nobody will see"""
+        return bool(self._handlers[event_type] or self._batch_handlers[event_type])
+
+    def publish(self, event_type: EventType, *payload):
+        """Dispatch synchronously to the topic's handlers"""
+        handlers = self._handlers[event_type]
+        if handlers:
+            for handler in handlers:
+                handler(*payload)
+        if self._batch_handlers[event_type]:
+            self._queue.append((event_type, payload, True))
+
+    def post(self, event_type: EventType, *payload):
+        """Queue an event for the next flush()"""
+        if self._handlers[event_type] or self._batch_handlers[event_type]:
+            self._queue.append((event_type, payload, False))
+
+    def flush(self) -> int:
+        """Dispatch queued events in order; returns how many were dispatched"""
+        if not self._queue:
+            return 0
+
+        queue, self._queue = self._queue, deque()
+        batches = {}
+        for event_type, payload, dispatched in queue:
+            # Published events already reached their synchronous handlers
+            if not dispatched:
+                for handler in self._handlers[event_type]:
+                    handler(*payload)
+            if self._batch_handlers[event_type]:
+                batches.setdefault(event_type, []).append(payload)
+
+        for event_type, payloads in batches.items():
+            for handler in self._batch_handlers[event_type]:
+                handler(payloads)
+        return len(queue)
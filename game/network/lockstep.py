@@ -0,0 +1,154 @@
+"""Lockstep play: peers exchange only inputs and run the rules themselves.
+
+Both peers build their engine from the same seed, which the host picks
+and sends at match start, and from then on send nothing but the commands
+their own player issues. Each applies its opponent's commands to its
+engine, so both play out the identical match. The relay server only
+forwards a few bytes per action and never decodes them.
+
+At every turn change each peer sends the engine's state_hash() for the
+turn. The first mismatch, or a remote command this engine finds illegal,
+is reported at once as a DesyncError carrying the turn number.
+
+Every applied command is kept in an input log. Together with the seed it
+reproduces the whole match; see replay_inputs().
+"""
+import logging
+import secrets
+from typing import Callable, Dict, List, Optional
+
+from ..core.commands import COMMANDS, Command, command_from_tuple
+from ..managers.event_manager import EventType
+from .protocol import command_message, message_command
+
+logger = logging.getLogger('TestamentDuel')
+
+class DesyncError(RuntimeError):
+    """The peers' engines no longer agree; `turn` is the first turn that differs"""
+
+    def __init__(self, turn: int, message: str):
+        super().__init__(f"Desync at turn {turn}: {message}")
+        self.turn = turn
+
+def new_seed() -> int:
+    return secrets.randbits(63)
+
+class LockstepSession:
+    """One peer's side of a lockstep match.
+
+    `network` is anything with send_game_action() and register_handler(),
+    such as a NetworkManager. The local player's commands are issued with
+    submit() (or the engine's own methods) on their turns; the opponent's
+    arrive through the network handlers. Desyncs go to `on_desync`, or are
+    raised from the handler that found them when it is None.
+    """
+
+    def __init__(self, network, engine, seat: int, on_desync: Optional[Callable[[DesyncError], None]] = None):
+        self.network = network
+        self.engine = engine
+        self.seat = seat
+        self.on_desync = on_desync
+        self.turn = 0  # Turns started since the match began, both players'
+        self.inputs: List[tuple] = []  # (turn, seat, command tuple) in the order applied
+        self.checksums: Dict[int, int] = {}
+        self.desync: Optional[DesyncError] = None
+        self._remote_checksums: Dict[int, int] = {}
+        self._remote = False  # Whether the command being applied came from the opponent
+
+        engine.events.subscribe(EventType.COMMAND_APPLIED, self._on_command)
+        engine.events.subscribe(EventType.TURN_CHANGED, self._on_turn)
+        for kind in COMMANDS:
+            network.register_handler(kind, self._on_remote_command)
+        network.register_handler("turn_checksum", self._on_remote_checksum)
+        # Turn 0 catches peers that built different matches, such as from other decks
+        self._send_checksum()
+
+    @classmethod
+    def host(cls, network, make_engine: Callable[[int], object], **kwargs) -> "LockstepSession":
+        """Start a match as seat 0; call once the opponent is connected"""
+        seed = new_seed()
+        network.send_game_action({"action": "lockstep_start", "seed": seed})
+        return cls(network, make_engine(seed), 0, **kwargs)
+
+    @classmethod
+    def join(cls, network, make_engine: Callable[[int], object],
+             on_start: Callable[["LockstepSession"], None], **kwargs):
+        """Wait for the host's start message, then hand the seat 1 session to `on_start`"""
+        def start(message):
+            on_start(cls(network, make_engine(message["seed"]), 1, **kwargs))
+        network.register_handler("lockstep_start", start)
+
+    @property
+    def seed(self) -> int:
+        return self.engine.seed
+
+    @property
+    def our_turn(self) -> bool:
+        return self.engine.active_player_index == self.seat and not self.engine.game_over
+
+    def submit(self, command: Command) -> bool:
+        """Apply a command for the local player and send it to the opponent"""
+        if not self.our_turn:
+            return False
+        return self.engine.commands.dispatch(command)
+
+    def stop(self):
+        self.engine.events.unsubscribe(EventType.COMMAND_APPLIED, self._on_command)
+        self.engine.events.unsubscribe(EventType.TURN_CHANGED, self._on_turn)
+
+    def _on_command(self, command: Command):
+        seat = 1 - self.seat if self._remote else self.seat
+        self.inputs.append((self.turn, seat, command.to_tuple()))
+        if not self._remote:
+            self.network.send_game_action(command_message(command))
+
+    def _on_turn(self, player_index: int, turn_count: int):
+        self.turn += 1
+        self._send_checksum()
+
+    def _send_checksum(self):
+        checksum = self.checksums[self.turn] = self.engine.state_hash()
+        self.network.send_game_action({"action": "turn_checksum", "turn": self.turn, "checksum": checksum})
+        self._compare(self.turn)
+
+    def _on_remote_command(self, message: Dict):
+        if self.desync is not None:
+            return
+        command = message_command(message)
+        if self.engine.active_player_index == self.seat:
+            self._report(DesyncError(self.turn, f"opponent sent {command.kind} on our turn"))
+            return
+        self._remote = True
+        try:
+            applied = self.engine.commands.dispatch(command)
+        finally:
+            self._remote = False
+        if not applied:
+            self._report(DesyncError(self.turn, f"opponent's {command.to_tuple()} is illegal here"))
+
+    def _on_remote_checksum(self, message: Dict):
+        self._remote_checksums[message["turn"]] = message["checksum"]
+        self._compare(message["turn"])
+
+    def _compare(self, turn: int):
+        # Either side's checksum for a turn can arrive first
+        local, remote = self.checksums.get(turn), self._remote_checksums.get(turn)
+        if local is None or remote is None or self.desync is not None:
+            return
+        del self._remote_checksums[turn]
+        if local != remote:
+            self._report(DesyncError(turn, f"state checksum {local:016x} != opponent's {remote:016x}"))
+
+    def _report(self, error: DesyncError):
+        self.desync = error
+        logger.error(str(error))
+        if self.on_desync is None:
+            raise error
+        self.on_desync(error)
+
+def replay_inputs(engine, inputs) -> int:
+    """Re-apply a session's input log to a new engine built from its seed; returns the final turn"""
+    for turn, seat, command in inputs:
+        if not engine.commands.dispatch(command_from_tuple(command)):
+            raise DesyncError(turn, f"{command} from seat {seat} is illegal on replay")
+    return inputs[-1][0] if inputs else 0
@@ -1,90 +1,86 @@
-import socket
-import json
+import asyncio
 import threading
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional, Union
 from queue import Queue
+from .transport import GameClient, GameServer
 
 class NetworkManager:
-    def __init__(self, host: str, port: int):
+    """Blocking facade over the asyncio transport for the pygame loop.
+
+    The transport runs on one background event loop thread however many
+    peers there are. Received messages are queued, and process_messages()
+    calls the registered handlers on the caller's (game) thread.
+
+    Actions sent during a frame are held and written together by flush(),
+    or after `flush_delay` seconds if flush() is not called first; urgent
+    actions are written at once.
+    """
+        
+    def __init__(self, host: str, port: int, binary: bool = True, flush_delay: float = 1 / 60):
         self.host = host
         self.port = port
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # False sends every message as JSON, for debugging
+        self.binary = binary
+        self.flush_delay = flush_delay
         self.message_queue = Queue()
         self.handlers: Dict[str, Callable] = {}
         self.running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._endpoint: Optional[Union[GameServer, GameClient]] = None
         
-    def start_server(self):
-        """Start server for hosting games"""
-        self.socket.bind((self.host, self.port))
-        self.socket.listen(1)
+    def _start_loop(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="network", daemon=True)
+        self._thread.start()
         self.running = True
         
-        # Start listener thread
-        threading.Thread(target=self._accept_connections).start()
+    def _call(self, coroutine, timeout: Optional[float] = 10):
+        """Run a coroutine on the network loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
         
-    def connect_to_server(self):
-        """Connect to existing game server"""
-        self.socket.connect((self.host, self.port))
-        self.running = True
+    def start_server(self):
+        """Start server for hosting games"""
+        self._start_loop()
+        self._endpoint = GameServer(lambda message, connection: self.message_queue.put(message), self.binary,
+                                    self.flush_delay)
+        # Port 0 picks a free port; keep the real one for clients
+        self.port = self._call(self._endpoint.start(self.host, self.port))
         
-        # Start listener thread
-        threading.Thread(target=self._receive_messages).start()
+    def connect_to_server(self, match: Optional[str] = None):
+        """Connect to existing game server"""
+        self._start_loop()
+        self._endpoint = GameClient(self.message_queue.put, self.binary, self.flush_delay)
+        self._call(self._endpoint.connect(self.host, self.port, match))
+        asyncio.run_coroutine_threadsafe(self._endpoint.run(), self._loop)
         
-    def send_game_action(self, action_data: Dict):
+    def send_game_action(self, action_data: Dict, urgent: bool = False):
         """Send game action to other player"""
-        message = json.dumps(action_data)
-        self.socket.send(message.encode())
+        self._loop.call_soon_threadsafe(lambda: self._endpoint.send_game_action(action_data, urgent=urgent))
+        
+    def flush(self):
+        """Write the actions sent this frame; call once per game tick"""
+        self._loop.call_soon_threadsafe(self._endpoint.flush)
         
     def register_handler(self, action_type: str, handler: Callable):
         """Register handler for specific action type"""
         self.handlers[action_type] = handler
         
-    def _accept_connections(self):
-        """Accept incoming connections"""
-        while self.running:
-            client_socket, _ = self.socket.accept()
-            threading.Thread(
-                target=self._handle_client,
-                args=(client_socket,)
-            ).start()
-            
-    def _handle_client(self, client_socket: socket.socket):
-        """Handle client connection"""
-        while self.running:
-            try:
-                data = client_socket.recv(4096)
-                if not data:
-                    break
-                    
-                message = json.loads(data.decode())
-                self.message_queue.put(message)
-                
-            except Exception as e:
-                print(f"Error handling client: {e}")
-                break
-                
-        client_socket.close()
-        
-    def _receive_messages(self):
-        """Receive and process messages"""
-        while self.running:
-            try:
-                data = self.socket.recv(4096)
-                if not data:
-                    break
-                    
-                message = json.loads(data.decode())
-                self.message_queue.put(message)
-                
-            except Exception as e:
-                print(f"Error receiving message: {e}")
-                break
-                
     def process_messages(self):
         """Process queued messages"""
         while not self.message_queue.empty():
             message = self.message_queue.get()
             action_type = message.get("action")
-            
+        
             if action_type in self.handlers:
-                self.handlers[action_type](message) 
\ No newline at end of file
+                self.handlers[action_type](message)
+        
+    def stop(self):
+        """Close connections and stop the network thread"""
+        if not self.running:
+            return
+        self.running = False
+        self._call(self._endpoint.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,140 @@
+"""Wire encoding of game actions: compact binary with a JSON fallback.
+
+Messages are dicts such as {"action": "play_card", "card": 2, "zone": "MISSION"},
+the same shape as a command's fields (see core/commands.py). Actions in the
+command vocabulary are sent as
+
+    version (u8) | opcode (u8) | fixed-width fields
+
+with cards as u8 zone indexes and zones as u8 ids, a few bytes instead of a
+few dozen. State sync messages (see state_sync.py) carry persistent maps,
+so after the opcode their fields are codec-encoded, whatever `binary` says.
+Anything else (joins, chat, debugging) goes as JSON, and every decoder
+accepts both: a JSON object starts with '{', which is never a protocol
+version.
+"""
+import json
+import struct
+from typing import Dict, Optional
+
+from ..core.commands import Command, command_from_tuple
+from ..state import codec
+
+VERSION = 1
+
+ZONES = ("SANCTUARY", "MISSION")
+ZONE_IDS = {zone: index for index, zone in enumerate(ZONES)}
+NO_CARD = 0xFF  # DeclareAttack's defender for a direct attack
+
+class ProtocolError(ValueError):
+    """Raised for a payload this protocol version cannot decode"""
+
+class _Op:
+    """One action's opcode and field layout"""
+
+    __slots__ = ('kind', 'opcode', 'fields', 'struct')
+
+    def __init__(self, kind: str, opcode: int, fields: tuple, layout: Optional[str]):
+        self.kind = kind
+        self.opcode = opcode
+        self.fields = fields
+        # No layout: variable-length, codec-encoded fields
+        self.struct = struct.Struct('<BB' + layout) if layout is not None else None
+
+_OPS = [
+    _Op("draw_card", 1, ("player", "count"), "BB"),
+    _Op("play_card", 2, ("card", "zone"), "BB"),
+    _Op("summon", 3, ("card",), "B"),
+    _Op("assign_mission", 4, ("card",), "B"),
+    _Op("attack", 5, ("attacker", "defender"), "BB"),
+    _Op("end_phase", 6, (), ""),
+    _Op("end_turn", 7, (), ""),
+    _Op("turn_checksum", 8, ("turn", "checksum"), "IQ"),
+    _Op("state_snapshot", 16, ("tick", "state", "checksum"), None),
+    _Op("state_delta", 17, ("tick", "changes", "checksum"), None),
+    _Op("resync", 18, ("tick",), None),
+]
+_BY_KIND = {op.kind: op for op in _OPS}
+_BY_OPCODE = {op.opcode: op for op in _OPS}
+
+def _pack_field(name: str, value) -> int:
+    if name == "zone":
+        return ZONE_IDS[value]
+    if name == "defender" and value is None:
+        return NO_CARD
+    return value
+
+def _unpack_field(name: str, value: int):
+    if name == "zone":
+        return ZONES[value]
+    if name == "defender" and value == NO_CARD:
+        return None
+    return value
+
+def _encode_binary(op: _Op, message: Dict) -> Optional[bytes]:
+    if len(message) != len(op.fields) + 1:
+        return None
+    try:
+        if op.struct is None:
+            return bytes((VERSION, op.opcode)) + codec.encode(tuple(message[name] for name in op.fields))
+        values = [_pack_field(name, message[name]) for name in op.fields]
+        return op.struct.pack(VERSION, op.opcode, *values)
+    except (KeyError, TypeError, struct.error):
+        # Out-of-range or unexpected values still get through as JSON
+        return None
+
+def encode_message(message: Dict, binary: bool = True) -> bytes:
+    """Binary when the action is in the vocabulary and `binary`, else JSON"""
+    op = _BY_KIND.get(message.get("action"))
+    if op is not None and (binary or op.struct is None):
+        payload = _encode_binary(op, message)
+        if payload is not None:
+            return payload
+    return json.dumps(message, separators=(',', ':')).encode()
+
+def decode_message(payload: bytes) -> Dict:
+    if not payload:
+        raise ProtocolError("Empty message")
+    if payload[0] == VERSION:
+        if len(payload) < 2 or payload[1] not in _BY_OPCODE:
+            raise ProtocolError(f"Unknown opcode in {bytes(payload[:2])!r}")
+        op = _BY_OPCODE[payload[1]]
+        if op.struct is None:
+            try:
+                values = codec.decode(memoryview(payload)[2:])
+            except codec.CodecError as error:
+                raise ProtocolError(f"Malformed {op.kind} message: {error}") from error
+            if not isinstance(values, tuple) or len(values) != len(op.fields):
+                raise ProtocolError(f"Malformed {op.kind} message")
+            return dict(zip(("action",) + op.fields, (op.kind,) + values))
+        try:
+            _, _, *values = op.struct.unpack(payload)
+        except struct.error as error:
+            raise ProtocolError(f"Malformed {op.kind} message: {error}") from error
+        message = {"action": op.kind}
+        for name, value in zip(op.fields, values):
+            message[name] = _unpack_field(name, value)
+        return message
+    if payload[0] == ord('{'):
+        message = json.loads(payload)
+        if isinstance(message, dict):
+            return message
+    raise ProtocolError(f"Unsupported message (version byte {payload[0]})")
+
+def is_binary(payload: bytes) -> bool:
+    """Whether a payload is a binary action, which needs no decoding to relay"""
+    return bool(payload) and payload[0] == VERSION
+
+def command_message(command: Command) -> Dict:
+    """Message form of a command: its kind as "action" plus its fields"""
+    kind, *values = command.to_tuple()
+    op = _BY_KIND[kind]
+    return dict(zip(("action",) + op.fields, [kind] + values))
+
+def message_command(message: Dict) -> Command:
+    """Inverse of command_message()"""
+    op = _BY_KIND.get(message.get("action"))
+    if op is None:
+        raise ProtocolError(f"Not a command: {message.get('action')!r}")
+    # Omitted trailing fields take the command's defaults
+    return command_from_tuple((op.kind,) + tuple(message[name] for name in op.fields if name in message))
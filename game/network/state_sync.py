@@ -0,0 +1,159 @@
+"""Host-authoritative state synchronisation over the transport.
+
+The host publishes a GameState every tick. Peers get only the leaves that
+changed, as a "state_delta" message numbered by tick, plus a checksum of
+the resulting state. A peer that joins, reconnects, misses a tick or
+computes a different checksum sends one "resync" and gets back a full
+"state_snapshot", so it is in sync again after a single round trip
+however long the match has run. The host also sends a snapshot every
+`resync_interval` ticks, which bounds how long a silent desync can last.
+
+Checksums are a sum of per-leaf hashes, so both ends update them from a
+delta alone instead of rehashing the whole state each tick.
+"""
+import hashlib
+import logging
+from collections.abc import Mapping
+from typing import Callable, Dict, Optional
+
+from ..state import codec
+from ..state.game_state_manager import GameState, _freeze_state, diff_states
+from ..state.persistent import MISSING, PMap, get_in, set_in
+
+logger = logging.getLogger('TestamentDuel')
+
+MASK = (1 << 64) - 1
+
+def _leaf_hash(path: tuple, value) -> int:
+    data = codec.encode((path, value))
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+def checksum(value, path: tuple = ()) -> int:
+    """Order-independent hash of a frozen state (or of the subtree at `path`)"""
+    if value is MISSING:
+        return 0
+    # Split where diff_states() does, so deltas can update a checksum
+    if isinstance(value, Mapping):
+        return sum(checksum(item, path + (key,)) for key, item in value.items()) & MASK
+    if isinstance(value, tuple) and any(isinstance(item, Mapping) for item in value):
+        return sum(checksum(item, path + (index,)) for index, item in enumerate(value)) & MASK
+    return _leaf_hash(path, value)
+
+def update_checksum(total: int, changes) -> int:
+    """Checksum after (path, old, new) changes, costing only the changed leaves"""
+    for path, old, new in changes:
+        total += checksum(new, path) - checksum(old, path)
+    return total & MASK
+
+class StateSyncHost:
+    """Streams the authoritative state to peers as per-tick deltas.
+
+    `send(message)` broadcasts to every peer of the match. Register
+    on_resync() as the "resync" handler; with a `reply` callable (such as
+    the requesting Connection's send) the snapshot goes only to that peer.
+    """
+
+    def __init__(self, send: Callable[[Dict], None], resync_interval: int = 300):
+        self.send = send
+        self.resync_interval = resync_interval
+        self.tick = 0
+        self.checksum = 0
+        self._state: Optional[PMap] = None
+
+    def publish(self, game_state: GameState):
+        """Send what changed since the last publish; unchanged states send nothing"""
+        state = _freeze_state(game_state)
+        if self._state is None:
+            self._state = state
+            self.checksum = checksum(state)
+            self.tick += 1
+            self.send(self.snapshot_message())
+            return
+
+        changes = diff_states(self._state, state)
+        if not changes:
+            return
+        self._state = state
+        self.checksum = update_checksum(self.checksum, changes)
+        self.tick += 1
+        if self.resync_interval and self.tick % self.resync_interval == 0:
+            self.send(self.snapshot_message())
+        else:
+            # Peers already hold the old values, so only new ones are sent
+            self.send({"action": "state_delta", "tick": self.tick,
+                       "changes": tuple((path, new) for path, _, new in changes),
+                       "checksum": self.checksum})
+
+    def snapshot_message(self) -> Dict:
+        return {"action": "state_snapshot", "tick": self.tick, "state": self._state, "checksum": self.checksum}
+
+    def on_resync(self, message: Dict, reply: Optional[Callable[[Dict], None]] = None):
+        if self._state is not None:
+            (reply or self.send)(self.snapshot_message())
+
+    def register(self, endpoint):
+        """Answer resync requests arriving at a GameServer, GameClient or NetworkManager"""
+        endpoint.register_handler("resync", self.on_resync)
+
+class StateSyncClient:
+    """A peer's copy of the host's state, kept current from deltas.
+
+    Call request_resync() after connecting or reconnecting; deltas that do
+    not follow on from the current tick, or that produce a different
+    checksum, trigger one automatically.
+    """
+
+    def __init__(self, send: Callable[[Dict], None]):
+        self.send = send
+        self.tick: Optional[int] = None
+        self.checksum = 0
+        self.resyncs = 0
+        self._state: Optional[PMap] = None
+        self._awaiting_snapshot = False
+
+    @property
+    def in_sync(self) -> bool:
+        return self._state is not None and not self._awaiting_snapshot
+
+    @property
+    def state(self) -> Optional[GameState]:
+        return None if self._state is None else GameState(**dict(self._state.items()))
+
+    def request_resync(self):
+        if self._awaiting_snapshot:
+            return
+        self._awaiting_snapshot = True
+        self.resyncs += 1
+        self.send({"action": "resync", "tick": self.tick})
+
+    def on_snapshot(self, message: Dict):
+        # Snapshots answering another peer's resync may be behind this one
+        if self.tick is not None and message["tick"] < self.tick and not self._awaiting_snapshot:
+            return
+        self._state = message["state"]
+        self.tick = message["tick"]
+        self.checksum = message["checksum"]
+        self._awaiting_snapshot = False
+
+    def on_delta(self, message: Dict):
+        if self._awaiting_snapshot or (self.tick is not None and message["tick"] <= self.tick):
+            return
+        if self._state is None or message["tick"] != self.tick + 1:
+            logger.warning(f"Missed state ticks before {message['tick']}; resyncing")
+            self.request_resync()
+            return
+
+        state, total = self._state, self.checksum
+        for path, new in message["changes"]:
+            total = update_checksum(total, ((path, get_in(state, path, MISSING), new),))
+            state = set_in(state, path, new)
+        if total != message["checksum"]:
+            logger.warning(f"State checksum mismatch at tick {message['tick']}; resyncing")
+            self.request_resync()
+            return
+        self._state, self.checksum, self.tick = state, total, message["tick"]
+
+    def register(self, endpoint):
+        """Receive sync messages through a GameServer, GameClient or NetworkManager"""
+        endpoint.register_handler("state_snapshot", self.on_snapshot)
+        endpoint.register_handler("state_delta", self.on_delta)
@@ -0,0 +1,276 @@
+"""asyncio transport: length-prefixed message frames over TCP.
+
+Every message is a 4-byte big-endian length followed by that many bytes of
+payload, so messages survive TCP splitting and coalescing. One event loop
+serves every connection; there is no thread per socket.
+
+Outgoing frames are queued per connection and written together, one
+writelines() call (a single sendmsg() on Python 3.12+) per flush. By
+default a connection flushes once the current pass of the event loop is
+done, so everything sent while handling one batch of input goes out
+together; a positive `flush_delay` waits up to that long to fill bigger
+batches. Urgent messages and flush() skip the wait.
+
+GameServer relays game actions between the players of each match, so a
+single process can host many matches. GameClient is the player's end.
+Both keep NetworkManager's register_handler()/send_game_action() API;
+handlers are called with the decoded message dict. Payloads use the
+binary action encoding in protocol.py, or JSON with binary=False.
+"""
+import asyncio
+import logging
+import struct
+from typing import Callable, Dict, List, Optional, Set
+
+from .protocol import decode_message, encode_message, is_binary
+
+logger = logging.getLogger('TestamentDuel')
+
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 1 << 20
+# A peer that lets this much output pile up is dropped rather than buffered forever
+MAX_WRITE_BUFFER = 4 << 20
+# Queued output beyond this is flushed without waiting for the deadline
+MAX_BATCH = 64 << 10
+DEFAULT_MATCH = ""
+
+class FrameError(ConnectionError):
+    """Raised for a frame that breaks the protocol"""
+
+def encode_frame(payload: bytes) -> bytes:
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Next frame's payload, or None once the peer has closed between frames"""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as error:
+        if error.partial:
+            raise FrameError("Connection closed inside a frame header") from error
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {length} bytes exceeds {MAX_FRAME_SIZE}")
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError as error:
+        raise FrameError("Connection closed inside a frame") from error
+
+class Connection:
+    """One peer: framed, non-blocking sends and awaitable receives"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, binary: bool = True,
+                 flush_delay: float = 0.0):
+        self.reader = reader
+        self.writer = writer
+        self.binary = binary
+        self.flush_delay = flush_delay
+        self.peer = writer.get_extra_info('peername')
+        self.match: Optional[str] = None
+        self._pending: List[bytes] = []  # Headers and payloads, in order
+        self._pending_bytes = 0
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing()
+
+    def send(self, message: Dict, urgent: bool = False):
+        """Queue a message; the event loop writes it without blocking the caller"""
+        self.send_frame(encode_message(message, self.binary), urgent)
+
+    def send_frame(self, payload: bytes, urgent: bool = False):
+        if self.closed:
+            return
+        if len(payload) > MAX_FRAME_SIZE:
+            raise FrameError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME_SIZE}")
+        self._pending += (HEADER.pack(len(payload)), payload)
+        self._pending_bytes += HEADER.size + len(payload)
+        if urgent or self._pending_bytes >= MAX_BATCH:
+            self.flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            if self.flush_delay > 0:
+                self._flush_handle = loop.call_later(self.flush_delay, self.flush)
+            else:
+                self._flush_handle = loop.call_soon(self.flush)
+
+    def flush(self):
+        """Write every queued frame in one call"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending or self.closed:
+            return
+        pending, self._pending, self._pending_bytes = self._pending, [], 0
+        self.writer.writelines(pending)
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            logger.warning(f"Dropping {self.peer}: not reading its messages")
+            self.close()
+
+    async def receive(self) -> Optional[Dict]:
+        """Next message, or None when the peer disconnects"""
+        payload = await read_frame(self.reader)
+        return None if payload is None else decode_message(payload)
+
+    async def drain(self):
+        self.flush()
+        await self.writer.drain()
+
+    def close(self):
+        if not self.closed:
+            # Queued frames still go out before the close
+            self.flush()
+            self.writer.close()
+
+class _Handlers:
+    def __init__(self):
+        self.handlers: Dict[str, Callable] = {}
+
+    def register_handler(self, action_type: str, handler: Callable):
+        """Register handler for specific action type"""
+        self.handlers[action_type] = handler
+
+    def _dispatch(self, message: Dict):
+        handler = self.handlers.get(message.get("action"))
+        if handler is not None:
+            handler(message)
+
+class GameServer(_Handlers):
+    """Relays each player's game actions to the other players of their match.
+
+    Connections start in the default match; a {"action": "join", "match": id}
+    message moves them to another. Handlers registered here see every
+    message, and `on_message(message, connection)` does too, in the event
+    loop's thread.
+    """
+
+    def __init__(self, on_message: Optional[Callable] = None, binary: bool = True, flush_delay: float = 0.0):
+        super().__init__()
+        self.on_message = on_message
+        self.binary = binary
+        self.flush_delay = flush_delay
+        self.matches: Dict[str, Set[Connection]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int) -> int:
+        """Listen for players; returns the bound port, useful with port 0"""
+        self._server = await asyncio.start_server(self._serve, host, port, backlog=1024)
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def connections(self) -> int:
+        return sum(len(players) for players in self.matches.values())
+
+    def send_game_action(self, action_data: Dict, match: str = DEFAULT_MATCH, urgent: bool = False):
+        """Send a game action to every player of a match"""
+        payload = encode_message(action_data, self.binary)
+        for connection in tuple(self.matches.get(match, ())):
+            connection.send_frame(payload, urgent)
+
+    def flush(self):
+        """Write all queued output now, such as at the end of a game tick"""
+        for players in self.matches.values():
+            for connection in players:
+                connection.flush()
+
+    def _join(self, connection: Connection, match: str):
+        self._leave(connection)
+        connection.match = match
+        self.matches.setdefault(match, set()).add(connection)
+
+    def _leave(self, connection: Connection):
+        players = self.matches.get(connection.match)
+        if players is not None:
+            players.discard(connection)
+            if not players:
+                del self.matches[connection.match]
+        connection.match = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(reader, writer, self.binary, self.flush_delay)
+        self._join(connection, DEFAULT_MATCH)
+        try:
+            while True:
+                payload = await read_frame(reader)
+                if payload is None:
+                    break
+                # A pure relay never needs to decode binary actions
+                listening = self.handlers or self.on_message is not None
+                message = decode_message(payload) if listening or not is_binary(payload) else None
+                if message is not None and message.get("action") == "join":
+                    self._join(connection, str(message.get("match", DEFAULT_MATCH)))
+                    continue
+
+                # Relay the frame as received; it is never re-encoded
+                for other in tuple(self.matches.get(connection.match, ())):
+                    if other is not connection:
+                        other.send_frame(payload)
+                if message is None:
+                    continue
+                self._dispatch(message)
+                if self.on_message is not None:
+                    self.on_message(message, connection)
+        except (FrameError, ValueError, ConnectionError) as error:
+            logger.warning(f"Closing connection from {connection.peer}: {error}")
+        finally:
+            self._leave(connection)
+            connection.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for players in list(self.matches.values()):
+                for connection in list(players):
+                    connection.close()
+            await self._server.wait_closed()
+            self._server = None
+
+class GameClient(_Handlers):
+    """A player's connection to a GameServer; binary=False sends readable JSON"""
+
+    def __init__(self, on_message: Optional[Callable] = None, binary: bool = True, flush_delay: float = 0.0):
+        super().__init__()
+        self.on_message = on_message
+        self.binary = binary
+        self.flush_delay = flush_delay
+        self.connection: Optional[Connection] = None
+
+    async def connect(self, host: str, port: int, match: Optional[str] = None):
+        reader, writer = await asyncio.open_connection(host, port)
+        self.connection = Connection(reader, writer, self.binary, self.flush_delay)
+        if match is not None:
+            self.connection.send({"action": "join", "match": match})
+
+    def send_game_action(self, action_data: Dict, urgent: bool = False):
+        """Send game action to other player"""
+        self.connection.send(action_data, urgent)
+
+    def flush(self):
+        """Write all queued output now, such as at the end of a game tick"""
+        self.connection.flush()
+
+    async def run(self):
+        """Receive and dispatch messages until the server disconnects"""
+        try:
+            while True:
+                message = await self.connection.receive()
+                if message is None:
+                    break
+                self._dispatch(message)
+                if self.on_message is not None:
+                    self.on_message(message)
+        except (FrameError, ValueError, ConnectionError) as error:
+            logger.warning(f"Lost connection to server: {error}")
+        finally:
+            self.connection.close()
+
+    async def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            try:
+                await self.connection.writer.wait_closed()
+            except ConnectionError:
+                pass
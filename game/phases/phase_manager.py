@@ -1,41 +1,130 @@
+from typing import Callable, Dict, FrozenSet, Optional
+from ..core.commands import DrawCard
+from ..managers.event_manager import EventType
 from ..types import Phase
 
+PHASE_ORDER = [
+    Phase.INVOCATION,
+    Phase.PREPARATION,
+    Phase.SUMMONING,
+    Phase.MISSION,
+    Phase.REFLECTION
+]
+
+# Actions the active player may take in each phase
+PHASE_ACTIONS: Dict[Phase, FrozenSet[str]] = {
+    Phase.INVOCATION: frozenset({"end_phase", "end_turn"}),
+    Phase.PREPARATION: frozenset({"play_card", "end_phase", "end_turn"}),
+    Phase.SUMMONING: frozenset({"summon", "end_phase", "end_turn"}),
+    Phase.MISSION: frozenset({"assign_mission", "attack", "end_phase", "end_turn"}),
+    Phase.REFLECTION: frozenset({"end_phase", "end_turn"})
+}
+
+# Actions that only move the game along
+PASSING_ACTIONS = frozenset({"end_phase", "end_turn"})
+
+class PhaseSpec:
+    """One row of the transition table"""
+
+    __slots__ = ('phase', 'index', 'actions', 'passive', 'next', 'on_enter', 'on_exit')
+
+    def __init__(self, phase: Phase, index: int, on_enter: Callable, on_exit: Optional[Callable] = None):
+        self.phase = phase
+        self.index = index
+        self.actions = PHASE_ACTIONS[phase]
+        # Nothing but passing is ever possible, so no legality check is needed
+        self.passive = self.actions <= PASSING_ACTIONS
+        self.next: Optional["PhaseSpec"] = None  # None means the turn ends
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+
 class PhaseManager:
+    """Phase state machine: a precomputed transition table plus enter/exit hooks.
+
+    Rows are linked PhaseSpec objects, so moving to the next phase and
+    looking up its allowed actions never hash a Phase. Turn-level
+    bookkeeping (resource refresh, switching players) stays in the engine;
+    this class only moves between phases within a turn.
+    """
+
     def __init__(self, game):
         self.game = game
-        self.phase_handlers = {
-            Phase.INVOCATION: self.handle_invocation,
-            Phase.PREPARATION: self.handle_preparation,
-            Phase.SUMMONING: self.handle_summoning,
-            Phase.MISSION: self.handle_mission,
-            Phase.REFLECTION: self.handle_reflection
+        hooks = {
+            Phase.INVOCATION: (self.handle_invocation, None),
+            Phase.PREPARATION: (self.handle_preparation, None),
+            Phase.SUMMONING: (self.handle_summoning, None),
+            Phase.MISSION: (self.handle_mission, self.exit_mission),
+            Phase.REFLECTION: (self.handle_reflection, None)
+        }
+        self.table: Dict[Phase, PhaseSpec] = {
+            phase: PhaseSpec(phase, index, *hooks[phase]) for index, phase in enumerate(PHASE_ORDER)
         }
+        for phase, next_phase in zip(PHASE_ORDER, PHASE_ORDER[1:]):
+            self.table[phase].next = self.table[next_phase]
+        self.current = self.table[PHASE_ORDER[0]]
+        
+    def allowed_actions(self, phase: Optional[Phase] = None) -> FrozenSet[str]:
+        """Actions allowed in `phase`, or in the current phase by default"""
+        return self.current.actions if phase is None else PHASE_ACTIONS[phase]
+        
+    def enter(self, phase: Phase):
+        """Make `phase` current and run its enter hook"""
+        self._enter(self.table[phase])
+        
+    def _enter(self, spec: PhaseSpec):
+        self.current = spec
+        self.game.current_phase = spec.phase
+        self.game.events.publish(EventType.PHASE_CHANGED, spec.phase)
+        spec.on_enter()
+        
+    def exit(self):
+        """Run the exit hook of the current phase as it is left"""
+        if self.current.on_exit is not None:
+            self.current.on_exit()
+            
+    def advance(self) -> bool:
+        """Leave the current phase for the next; False when the turn is over instead"""
+        next_spec = self.current.next
+        if next_spec is None:
+            return False
+        self.exit()
+        self._enter(next_spec)
+        return True
+        
+    def is_idle(self) -> bool:
+        """Whether the active player can only pass in the current phase"""
+        if self.current.passive:
+            return True
+        # Stops at the first real action; passing actions are generated last
+        action = next(self.game.iter_actions(), None)
+        return action is None or action.kind in PASSING_ACTIONS
         
     def handle_invocation(self):
         """Handle draw phase"""
-        current_player = self.game.players[self.game.active_player_index]
-        if self.game.turn_count > 1 or self.game.active_player_index == 1:
-            current_player.draw_card()
+        if (self.game.turn_count > 1 or self.game.active_player_index == 1) \
+                and "draw" not in self.game.blocked_actions:
+            self.game.commands.dispatch(DrawCard(self.game.active_player_index))
             
     def handle_preparation(self):
         """Handle card playing phase"""
-        current_player = self.game.players[self.game.active_player_index]
         # Allow playing Scriptures and Relics
         return True
         
     def handle_summoning(self):
         """Handle believer summoning phase"""
-        current_player = self.game.players[self.game.active_player_index]
         # Allow summoning Believers
         return True
         
     def handle_mission(self):
         """Handle mission assignment phase"""
-        current_player = self.game.players[self.game.active_player_index]
         # Allow assigning missions and attacking
         return True
         
+    def exit_mission(self):
+        """Attacks declared during the mission phase resolve as it ends"""
+        self.game.resolve_combat()
+        
     def handle_reflection(self):
         """Handle end phase"""
         # Reset phase-specific states and prepare for next turn
-        return True 
\ No newline at end of file
+        return True
@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core.engine import GameEngine
+from ..state.game_state_manager import GameState, GameStateManager
+from ..state.replay_file import write_replay
+from ..utils.deck_loader import build_deck
+from .policies import GreedyPolicy
+
+MAX_TURNS = 100
+
+@dataclass
+class MatchResult:
+    seed: int
+    winner: Optional[int]  # Player index, None for a draw
+    turns: int
+
+@dataclass
+class MatchStats:
+    games: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    draws: int = 0
+    total_turns: int = 0
+    turn_histogram: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, result: MatchResult):
+        """Record a single match"""
+        self.games += 1
+        if result.winner is None:
+            self.draws += 1
+        else:
+            self.wins[result.winner] += 1
+        self.total_turns += result.turns
+        self.turn_histogram[result.turns] = self.turn_histogram.get(result.turns, 0) + 1
+
+    def merge(self, other: "MatchStats"):
+        """Fold another set of statistics into this one"""
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.draws += other.draws
+        self.total_turns += other.total_turns
+        for turns, count in other.turn_histogram.items():
+            self.turn_histogram[turns] = self.turn_histogram.get(turns, 0) + count
+
+    def win_rate(self, player_index: int) -> float:
+        return self.wins[player_index] / self.games if self.games else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return self.total_turns / self.games if self.games else 0.0
+
+def match_seeds(base_seed: int, games: int) -> List[int]:
+    """Seeds for a batch; every deck pair replays the same seeds"""
+    return [base_seed + i for i in range(games)]
+
+@lru_cache(maxsize=None)
+def _deck_data(filepath: str) -> tuple:
+    """Parse each deck file once per worker process"""
+    with open(filepath) as f:
+        return tuple(json.load(f))
+
+def play_match(deck1_data: Sequence[dict], deck2_data: Sequence[dict], seed: int,
+               max_turns: int = MAX_TURNS, history: Optional[GameStateManager] = None) -> MatchResult:
+    """Play one headless match; the result depends only on the decks and seed.
+
+    With `history`, a snapshot is saved after every turn; snapshots share
+    unchanged zones, so recording a match costs little beyond playing it.
+    """
+    engine = GameEngine(build_deck(deck1_data), build_deck(deck2_data), seed=seed, skip_empty_phases=True)
+    policy = GreedyPolicy()
+    if history is not None:
+        history.save_state(GameState.from_engine(engine))
+
+    while not engine.game_over and engine.turn_count <= max_turns:
+        policy.play_turn(engine)
+        if history is not None:
+            history.save_state(GameState.from_engine(engine))
+
+    winner = engine.players.index(engine.winner) if engine.winner else None
+    return MatchResult(seed, winner, engine.turn_count)
+
+def replay_name(pair_index: int, seed: int) -> str:
+    """File name of a match's replay within the replay directory"""
+    return f"pair{pair_index}-seed{seed}.replay"
+
+def _run_chunk(task: Tuple[int, str, str, List[int], int, Optional[str]]) -> Tuple[int, MatchStats]:
+    pair_index, deck1_path, deck2_path, seeds, max_turns, replay_dir = task
+    deck1_data = _deck_data(deck1_path)
+    deck2_data = _deck_data(deck2_path)
+
+    stats = MatchStats()
+    for seed in seeds:
+        if replay_dir is None:
+            stats.add(play_match(deck1_data, deck2_data, seed, max_turns))
+            continue
+        # Keep the whole match; it is written out and dropped right after
+        history = GameStateManager(max_bytes=sys.maxsize)
+        stats.add(play_match(deck1_data, deck2_data, seed, max_turns, history))
+        write_replay(os.path.join(replay_dir, replay_name(pair_index, seed)), history.states())
+    return pair_index, stats
+
+def run_batch(deck_pairs: Sequence[Tuple[str, str]], games: int, base_seed: int = 0,
+              workers: Optional[int] = None, max_turns: int = MAX_TURNS,
+              chunk_size: Optional[int] = None, replay_dir: Optional[str] = None) -> List[MatchStats]:
+    """Play `games` matches for every deck pair across a process pool.
+
+    Returns one MatchStats per deck pair, in the order given. Statistics are
+    sums, so the result is identical for any worker count or scheduling.
+    With `replay_dir`, every match is also saved there as a replay file.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = match_seeds(base_seed, games)
+    if chunk_size is None:
+        # Enough chunks per worker to balance load without flooding the pool
+        chunk_size = max(1, games * len(deck_pairs) // (workers * 4))
+
+    tasks = [
+        (pair_index, str(deck1), str(deck2), seeds[start:start + chunk_size], max_turns, replay_dir)
+        for pair_index, (deck1, deck2) in enumerate(deck_pairs)
+        for start in range(0, games, chunk_size)
+    ]
+
+    results = [MatchStats() for _ in deck_pairs]
+    if workers == 1:
+        chunks = map(_run_chunk, tasks)
+        for pair_index, stats in chunks:
+            results[pair_index].merge(stats)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pair_index, stats in pool.map(_run_chunk, tasks):
+            results[pair_index].merge(stats)
+    return results
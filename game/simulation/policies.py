@@ -0,0 +1,51 @@
+from ..types.enums import CardType, Phase
+
+class GreedyPolicy:
+    """Deterministic scripted player used for headless simulations"""
+
+    def play_turn(self, engine):
+        """Play the active player's whole turn, phase by phase"""
+        player = engine.active_player
+        player_index, turn = engine.active_player_index, engine.turn_count
+        
+        # Driven by the current phase, so engines that skip empty phases work too
+        while not engine.game_over and (engine.active_player_index, engine.turn_count) == (player_index, turn):
+            if engine.current_phase == Phase.PREPARATION:
+                self._play_support_cards(engine, player)
+            elif engine.current_phase == Phase.SUMMONING:
+                self._summon_believers(engine, player)
+            elif engine.current_phase == Phase.MISSION:
+                self._attack(engine, player)
+            engine.advance_phase()
+        
+    def _play_support_cards(self, engine, player):
+        cards = [card for card in player.hand if card.card_type != CardType.BELIEVER]
+        for card in sorted(cards, key=lambda c: (-c.skp_cost, c.name)):
+            zones = engine.get_valid_zones(card)
+            if zones and card.skp_cost <= player.current_skp:
+                engine.play_card(card, zones[0])
+                
+    def _summon_believers(self, engine, player):
+        believers = [card for card in player.hand if card.card_type == CardType.BELIEVER]
+        for card in sorted(believers, key=lambda c: (-(c.faith_points or 0), c.name)):
+            if card.skp_cost <= player.current_skp:
+                engine.summon_believer(card)
+                
+    def _attack(self, engine, player):
+        attackers = [card for card in player.sanctuary if card.card_type == CardType.BELIEVER]
+        defenders = [card for card in player.opponent.sanctuary if card.card_type == CardType.BELIEVER]
+        
+        for attacker in sorted(attackers, key=lambda c: (-(c.faith_points or 0), c.name)):
+            engine.assign_mission(attacker)
+            power = attacker.faith_points or 0
+            
+            if not defenders:
+                engine.declare_attack(attacker)
+                continue
+                
+            # Take out the strongest defender this attacker can destroy
+            targets = [card for card in defenders if (card.divinity_points or 0) <= power]
+            if targets:
+                target = max(targets, key=lambda c: (c.divinity_points or 0, c.name))
+                if engine.declare_attack(attacker, target):
+                    defenders.remove(target)
@@ -0,0 +1,148 @@
+"""Compact binary encoding for frozen game-state values.
+
+Handles what snapshots and deltas are made of: None, bools, ints, floats,
+strings, tuples (lists encode as tuples), mappings (decoded as PMaps) and
+the MISSING marker. Every value starts with a one-byte tag; lengths and
+ints are varints, so small numbers take a single byte.
+
+Card names repeat throughout a state, so each string is written once per
+encoded value and later occurrences are back-references to it.
+"""
+import struct
+from collections.abc import Mapping
+
+from .persistent import MISSING, PMap
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+STR_REF = 6
+TUPLE = 7
+MAP = 8
+ABSENT = 9
+
+_DOUBLE = struct.Struct('<d')
+
+class CodecError(ValueError):
+    """Raised for data that is not a valid encoding"""
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _encode(value, out: bytearray, strings: dict):
+    if value is None:
+        out.append(NONE)
+    elif value is True:
+        out.append(TRUE)
+    elif value is False:
+        out.append(FALSE)
+    elif value is MISSING:
+        out.append(ABSENT)
+    elif isinstance(value, int):
+        out.append(INT)
+        # Zigzag so small negatives stay small
+        _write_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+    elif isinstance(value, float):
+        out.append(FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        index = strings.get(value)
+        if index is not None:
+            out.append(STR_REF)
+            _write_varint(out, index)
+        else:
+            strings[value] = len(strings)
+            data = value.encode()
+            out.append(STR)
+            _write_varint(out, len(data))
+            out += data
+    elif isinstance(value, (tuple, list)):
+        out.append(TUPLE)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode(item, out, strings)
+    elif isinstance(value, Mapping):
+        out.append(MAP)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _encode(key, out, strings)
+            _encode(item, out, strings)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__}")
+
+def encode(value) -> bytes:
+    """Encode a value and everything it contains"""
+    out = bytearray()
+    _encode(value, out, {})
+    return bytes(out)
+
+class _Reader:
+    __slots__ = ('data', 'offset', 'strings')
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+        self.strings = []
+
+    def varint(self) -> int:
+        data, offset = self.data, self.offset
+        result = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.offset = offset
+                return result
+            shift += 7
+
+    def value(self):
+        tag = self.data[self.offset]
+        self.offset += 1
+        if tag == STR_REF:
+            return self.strings[self.varint()]
+        if tag == STR:
+            length = self.varint()
+            start = self.offset
+            self.offset += length
+            text = bytes(self.data[start:self.offset]).decode()
+            self.strings.append(text)
+            return text
+        if tag == INT:
+            raw = self.varint()
+            return -((raw + 1) >> 1) if raw & 1 else raw >> 1
+        if tag == TUPLE:
+            return tuple(self.value() for _ in range(self.varint()))
+        if tag == MAP:
+            count = self.varint()
+            return PMap([(self.value(), self.value()) for _ in range(count)])
+        if tag == NONE:
+            return None
+        if tag == TRUE:
+            return True
+        if tag == FALSE:
+            return False
+        if tag == ABSENT:
+            return MISSING
+        if tag == FLOAT:
+            start = self.offset
+            self.offset += _DOUBLE.size
+            return _DOUBLE.unpack_from(self.data, start)[0]
+        raise CodecError(f"Unknown tag {tag} at offset {self.offset - 1}")
+
+def decode(data):
+    """Decode bytes (or a memoryview) produced by encode()"""
+    reader = _Reader(data)
+    try:
+        value = reader.value()
+    except (IndexError, UnicodeDecodeError, struct.error) as error:
+        raise CodecError(f"Truncated or corrupt value: {error}") from error
+    if reader.offset != len(data):
+        raise CodecError(f"{len(data) - reader.offset} trailing bytes")
+    return value
@@ -1,49 +1,277 @@
 import json
-from typing import Dict, List
-from dataclasses import dataclass, asdict
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 
+from . import codec
+from .match_log import MatchLog, RecordKind, SyncPolicy, read_records
+from .persistent import MISSING as _MISSING, PMap, freeze, set_in, thaw
+
 @dataclass
 class GameState:
     turn_number: int
     active_player: int
     current_phase: str
-    players: List[Dict]
-    board_state: Dict
+    players: Sequence[Mapping]
+    board_state: Mapping
+    
+    @classmethod
+    def from_engine(cls, engine) -> "GameState":
+        """Capture a GameEngine as persistent data, sharing zones unchanged since the last capture"""
+        players = tuple(player.snapshot() for player in engine.players)
+        
+        board_state = PMap({
+            "pending_attacks": tuple(
+                (attack["attacker"].name, attack["defender"].name if attack.get("defender") else None)
+                for attack in engine.combat_manager.pending_attacks
+            ),
+            "winner": engine.players.index(engine.winner) if engine.winner else None
+        })
+        return cls(engine.turn_count, engine.active_player_index, engine.current_phase.name,
+                   players, board_state)
+        
+    def to_dict(self) -> dict:
+        """Plain, JSON-friendly copy"""
+        return {f.name: thaw(getattr(self, f.name)) for f in fields(self)}
+
+def _freeze_state(game_state: GameState) -> PMap:
+    # O(1) per field for states captured by from_engine
+    return PMap((f.name, freeze(getattr(game_state, f.name))) for f in fields(game_state))
+
+# A reversible change: (path, old value, new value) for every changed leaf
+Delta = Tuple[Tuple[tuple, object, object], ...]
+
+def diff_states(old, new, path: tuple = ()) -> list:
+    """Changed leaves between two frozen state structures, as (path, old, new)"""
+    if old is new:
+        # Shared structure is unchanged by construction
+        return []
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        changes = []
+        for key in old.keys() | new.keys():
+            changes.extend(diff_states(old.get(key, _MISSING), new.get(key, _MISSING), path + (key,)))
+        return changes
+    if isinstance(old, tuple) and isinstance(new, tuple) and len(old) == len(new) \
+            and any(isinstance(item, Mapping) for item in old):
+        # Same-length sequences of records (such as players) are diffed per entry
+        changes = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            changes.extend(diff_states(old_item, new_item, path + (index,)))
+        return changes
+    if old == new:
+        return []
+    # Leaves are immutable, so deltas and states can share them
+    return [(path, old, new)]
+
+def apply_delta(state: PMap, delta: Delta, reverse: bool = False) -> PMap:
+    """New state with a delta applied, or undone when `reverse`; only changed paths are copied"""
+    for path, old, new in delta:
+        value = old if reverse else new
+        state = set_in(state, path, value)
+    return state
+
+def _size(value) -> int:
+    # The encoding depends only on the value, unlike pickle's, which changes
+    # with object sharing, so a manager rebuilt from a log trims identically
+    return len(codec.encode(value))
     
 class GameStateManager:
-    def __init__(self):
-        self.state_history: List[GameState] = []
+    """Undo/redo history stored as reversible deltas between full keyframes.
+
+    Each saved state costs only the leaves that changed since the previous
+    one. Every `keyframe_interval` states a keyframe is kept as well, so
+    any state can be rebuilt from a nearby keyframe and the oldest history
+    can be dropped a whole segment at a time once it exceeds `max_bytes`.
+    States are persistent maps, so keyframes and the states handed back by
+    undo() and redo() are references, never copies.
+
+    With a MatchLog attached, every save also appends its delta to the log,
+    and every undo, redo or seek the move, so from_log() can replay the
+    history and the position within it after a crash.
+    """
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, keyframe_interval: int = 64,
+                 log: Optional[MatchLog] = None):
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.log = log
+        if log is not None and log.is_empty:
+            # Replaying needs the same settings to trim history the same way
+            log.append(RecordKind.META, {"max_bytes": max_bytes, "keyframe_interval": keyframe_interval})
         self.current_index = -1
+        self.history_bytes = 0
+        self._deltas: List[Delta] = []  # _deltas[i] turns state i into state i + 1
+        self._delta_sizes: List[int] = []
+        self._keyframes: Dict[int, PMap] = {}
+        self._keyframe_sizes: Dict[int, int] = {}
+        self._current: Optional[PMap] = None
+        
+    def __len__(self):
+        return len(self._deltas) + 1 if self._keyframes else 0
         
     def save_state(self, game_state: GameState):
         """Save current game state"""
+        state = _freeze_state(game_state)
+        
+        if self._current is None:
+            self._current = state
+            self._add_keyframe(0, state)
+            self.current_index = 0
+            if self.log is not None:
+                self.log.append(RecordKind.KEYFRAME, state)
+            return
+            
         # Remove any states after current index (for undo/redo)
-        if self.current_index < len(self.state_history) - 1:
-            self.state_history = self.state_history[:self.current_index + 1]
+        self._truncate(self.current_index)
             
-        self.state_history.append(game_state)
+        delta = tuple(diff_states(self._current, state))
+        if self.log is not None:
+            self.log.append(RecordKind.DELTA, delta)
+        self._deltas.append(delta)
+        self._delta_sizes.append(_size(delta))
+        self.history_bytes += self._delta_sizes[-1]
+        self._current = state
         self.current_index += 1
         
+        if self.current_index % self.keyframe_interval == 0:
+            self._add_keyframe(self.current_index, state)
+        self._trim()
+        
     def undo(self) -> GameState:
         """Undo last action"""
         if self.current_index > 0:
             self.current_index -= 1
-            return self.state_history[self.current_index]
+            self._current = apply_delta(self._current, self._deltas[self.current_index], reverse=True)
+            if self.log is not None:
+                self.log.append(RecordKind.REWIND, 1)
+            return self._snapshot(self._current)
         return None
         
     def redo(self) -> GameState:
         """Redo last undone action"""
-        if self.current_index < len(self.state_history) - 1:
+        if 0 <= self.current_index < len(self._deltas):
+            self._current = apply_delta(self._current, self._deltas[self.current_index])
             self.current_index += 1
-            return self.state_history[self.current_index]
+            if self.log is not None:
+                self.log.append(RecordKind.REDO, 1)
+            return self._snapshot(self._current)
         return None
         
+    def state_at(self, index: int) -> GameState:
+        """Rebuild any retained state from the nearest keyframe at or before it"""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        # Keyframes sit on every multiple of the interval; trimming keeps that
+        start = index - index % self.keyframe_interval
+        state = self._keyframes[start]
+        for delta in self._deltas[start:index]:
+            state = apply_delta(state, delta)
+        return self._snapshot(state)
+        
+    def seek(self, index: int) -> GameState:
+        """Move to any retained state, walking at most `keyframe_interval` deltas"""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start = index - index % self.keyframe_interval
+        if self.log is not None and index != self.current_index:
+            moved = index - self.current_index
+            self.log.append(RecordKind.REDO if moved > 0 else RecordKind.REWIND, abs(moved))
+        
+        if abs(index - self.current_index) <= index - start:
+            # Closer to where we are than to the keyframe
+            state = self._current
+            while self.current_index < index:
+                state = apply_delta(state, self._deltas[self.current_index])
+                self.current_index += 1
+            while self.current_index > index:
+                self.current_index -= 1
+                state = apply_delta(state, self._deltas[self.current_index], reverse=True)
+        else:
+            state = self._keyframes[start]
+            for delta in self._deltas[start:index]:
+                state = apply_delta(state, delta)
+            self.current_index = index
+            
+        self._current = state
+        return self._snapshot(state)
+        
+    def states(self) -> Iterator[GameState]:
+        """Every retained state, oldest first"""
+        if not self._keyframes:
+            return
+        state = self._keyframes[0]
+        yield self._snapshot(state)
+        for delta in self._deltas:
+            state = apply_delta(state, delta)
+            yield self._snapshot(state)
+            
+    @property
+    def state_history(self) -> List[GameState]:
+        return list(self.states())
+        
+    def _snapshot(self, state: PMap) -> GameState:
+        return GameState(**dict(state.items()))
+        
+    def _add_keyframe(self, index: int, state: PMap):
+        self._keyframes[index] = state
+        self._keyframe_sizes[index] = _size(state)
+        self.history_bytes += self._keyframe_sizes[index]
+        
+    def _truncate(self, index: int):
+        """Forget states after `index`"""
+        for delta_size in self._delta_sizes[index:]:
+            self.history_bytes -= delta_size
+        del self._deltas[index:]
+        del self._delta_sizes[index:]
+        for key in [key for key in self._keyframes if key > index]:
+            del self._keyframes[key]
+            self.history_bytes -= self._keyframe_sizes.pop(key)
+            
+    def _trim(self):
+        """Drop the oldest segments, keyframe to keyframe, while over the byte cap"""
+        while self.history_bytes > self.max_bytes:
+            later = [key for key in self._keyframes if key > 0]
+            if not later or min(later) > self.current_index:
+                break
+            cut = min(later)
+            
+            self.history_bytes -= sum(self._delta_sizes[:cut]) + self._keyframe_sizes[0]
+            del self._deltas[:cut]
+            del self._delta_sizes[:cut]
+            del self._keyframes[0]
+            del self._keyframe_sizes[0]
+            self._keyframes = {key - cut: state for key, state in self._keyframes.items()}
+            self._keyframe_sizes = {key - cut: size for key, size in self._keyframe_sizes.items()}
+            self.current_index -= cut
+        
+    @classmethod
+    def from_log(cls, filename: str, sync: SyncPolicy = SyncPolicy.INTERVAL) -> "GameStateManager":
+        """Rebuild a manager by streaming a match log, then keep appending to it"""
+        manager = cls()
+        for kind, value in read_records(filename):
+            if kind == RecordKind.META:
+                manager = cls(**value)
+            elif kind == RecordKind.KEYFRAME:
+                # A keyframe starts a fresh history
+                manager.__init__(manager.max_bytes, manager.keyframe_interval)
+                manager.save_state(manager._snapshot(value))
+            elif kind == RecordKind.DELTA:
+                manager.save_state(manager._snapshot(apply_delta(manager._current, value)))
+            elif kind == RecordKind.REWIND:
+                for _ in range(value):
+                    manager.undo()
+            elif kind == RecordKind.REDO:
+                for _ in range(value):
+                    manager.redo()
+        manager.log = MatchLog(filename, sync)
+        return manager
+        
     def save_to_file(self, filename: str):
-        """Save game state to file"""
+        """Export the retained history as JSON; use a MatchLog to save as you go"""
         state_data = {
             "timestamp": datetime.now().isoformat(),
-            "states": [asdict(state) for state in self.state_history]
+            "states": [state.to_dict() for state in self.states()]
         }
         
         with open(filename, 'w') as f:
@@ -53,7 +281,7 @@ class GameStateManager:
         """Load game state from file"""
         with open(filename, 'r') as f:
             state_data = json.load(f)
-            self.state_history = [
-                GameState(**state) for state in state_data["states"]
-            ]
-            self.current_index = len(self.state_history) - 1 
\ No newline at end of file
+            
+        self.__init__(self.max_bytes, self.keyframe_interval, self.log)
+        for state in state_data["states"]:
+            self.save_state(GameState(**state))
@@ -0,0 +1,127 @@
+"""Append-only binary log of a match's saved states.
+
+A log is a magic header followed by records:
+
+    length (u32) | kind (u8) | crc32 of payload (u32) | payload
+
+where the payload is a codec-encoded value. Saving a state appends one
+record the size of its delta, so the cost does not grow with the match.
+A crash can at worst leave a torn final record; readers stop before it
+and writers truncate it before appending.
+"""
+import logging
+import os
+import struct
+import time
+import zlib
+from enum import Enum, IntEnum
+from typing import BinaryIO, Iterator, Tuple
+
+from . import codec
+
+logger = logging.getLogger('TestamentDuel')
+
+MAGIC = b"TDML\x01"
+RECORD = struct.Struct('<IBI')
+
+class RecordKind(IntEnum):
+    META = 0      # Settings of the manager that wrote the log
+    KEYFRAME = 1  # A full state
+    DELTA = 2     # Changes since the previous state
+    REWIND = 3    # States undone
+    REDO = 4      # Undone states redone
+
+class SyncPolicy(Enum):
+    ALWAYS = "always"      # fsync after every record
+    INTERVAL = "interval"  # fsync at most every `sync_interval` seconds
+    NEVER = "never"        # leave it to the OS
+
+class LogFormatError(ValueError):
+    """Raised when a file is not a match log"""
+
+def _scan(f: BinaryIO) -> Iterator[Tuple[int, RecordKind, bytes]]:
+    """Valid records after the header as (end offset, kind, payload)"""
+    offset = len(MAGIC)
+    while True:
+        header = f.read(RECORD.size)
+        if len(header) < RECORD.size:
+            return
+        length, kind, checksum = RECORD.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            logger.warning(f"Ignoring torn record at offset {offset} of match log")
+            return
+        offset += RECORD.size + length
+        yield offset, RecordKind(kind), payload
+
+def _check_magic(f: BinaryIO, path):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise LogFormatError(f"Not a match log: {path}")
+
+def read_records(path) -> Iterator[Tuple[RecordKind, object]]:
+    """Stream (kind, value) records from a log, oldest first"""
+    with open(path, 'rb') as f:
+        _check_magic(f, path)
+        for _, kind, payload in _scan(f):
+            yield kind, codec.decode(payload)
+
+class MatchLog:
+    """Writer for a match log; opening an existing log appends to it"""
+
+    def __init__(self, path, sync: SyncPolicy = SyncPolicy.INTERVAL, sync_interval: float = 1.0):
+        self.path = path
+        self.sync_policy = sync
+        self.sync_interval = sync_interval
+        self.records = 0
+        self._last_sync = time.monotonic()
+
+        # Unbuffered: every record reaches the OS in a single write
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b', buffering=0)
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.write(MAGIC)
+            self.sync()
+        else:
+            self._recover()
+
+    def _recover(self):
+        """Count the valid records and cut off a torn tail"""
+        reader = open(self._file.fileno(), 'rb', closefd=False)
+        _check_magic(reader, self.path)
+        end = len(MAGIC)
+        for end, _, _ in _scan(reader):
+            self.records += 1
+        self._file.truncate(end)
+        self._file.seek(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def is_empty(self) -> bool:
+        return self.records == 0
+
+    def append(self, kind: RecordKind, value):
+        """Write one record and sync according to the policy"""
+        payload = codec.encode(value)
+        self._file.write(RECORD.pack(len(payload), kind, zlib.crc32(payload)) + payload)
+        self.records += 1
+
+        if self.sync_policy is SyncPolicy.ALWAYS:
+            self.sync()
+        elif self.sync_policy is SyncPolicy.INTERVAL \
+                and time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """Force written records to disk"""
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            if self.sync_policy is not SyncPolicy.NEVER:
+                self.sync()
+            self._file.close()
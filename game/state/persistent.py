@@ -0,0 +1,247 @@
+"""Persistent (immutable, structurally shared) containers for game snapshots.
+
+PMap is a hash array mapped trie: every update copies only the nodes on the
+path to the changed key, O(log32 n), and shares the rest with the previous
+version. Sequences are plain tuples; zones hold at most a few dozen cards,
+so copying one on change is cheaper than a trie walk.
+
+Because nothing is ever mutated, taking or branching a snapshot is just
+keeping a reference, and unchanged parts of consecutive snapshots are the
+same objects, so they can be compared by identity.
+"""
+from collections.abc import Mapping
+from typing import Iterator
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+
+class _Node:
+    """Bitmap-indexed trie node; `entries` holds (key, value) pairs and subnodes"""
+
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+class _Collision:
+    """Keys whose full hashes are equal"""
+
+    __slots__ = ('keyhash', 'pairs')
+
+    def __init__(self, keyhash: int, pairs: tuple):
+        self.keyhash = keyhash
+        self.pairs = pairs
+
+_EMPTY = _Node(0, ())
+
+def _merge(shift: int, pair1: tuple, hash1: int, pair2: tuple, hash2: int):
+    """Smallest subtree holding two pairs with different keys"""
+    if hash1 == hash2:
+        return _Collision(hash1, (pair1, pair2))
+    bit1 = 1 << ((hash1 >> shift) & _MASK)
+    bit2 = 1 << ((hash2 >> shift) & _MASK)
+    if bit1 == bit2:
+        return _Node(bit1, (_merge(shift + _BITS, pair1, hash1, pair2, hash2),))
+    entries = (pair1, pair2) if bit1 < bit2 else (pair2, pair1)
+    return _Node(bit1 | bit2, entries)
+
+def _set(node, shift: int, keyhash: int, key, value):
+    """Returns (new node, whether a key was added)"""
+    if isinstance(node, _Collision):
+        if keyhash != node.keyhash:
+            # Push the collision down beside the new key
+            bit = 1 << ((node.keyhash >> shift) & _MASK)
+            return _set(_Node(bit, (node,)), shift, keyhash, key, value)
+        for index, (existing, _) in enumerate(node.pairs):
+            if existing == key:
+                pairs = node.pairs[:index] + ((key, value),) + node.pairs[index + 1:]
+                return _Collision(keyhash, pairs), False
+        return _Collision(keyhash, node.pairs + ((key, value),)), True
+
+    bit = 1 << ((keyhash >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        entries = node.entries[:index] + ((key, value),) + node.entries[index:]
+        return _Node(node.bitmap | bit, entries), True
+
+    entry = node.entries[index]
+    if isinstance(entry, tuple):
+        existing, existing_value = entry
+        if existing == key:
+            if existing_value is value:
+                return node, False
+            replacement, added = (key, value), False
+        else:
+            replacement = _merge(shift + _BITS, entry, hash(existing), (key, value), keyhash)
+            added = True
+    else:
+        replacement, added = _set(entry, shift + _BITS, keyhash, key, value)
+        if replacement is entry:
+            return node, False
+    return _Node(node.bitmap, node.entries[:index] + (replacement,) + node.entries[index + 1:]), added
+
+def _delete(node, shift: int, keyhash: int, key):
+    """Returns the new node (None when empty), or `node` itself if the key is absent"""
+    if isinstance(node, _Collision):
+        pairs = tuple(pair for pair in node.pairs if pair[0] != key)
+        if len(pairs) == len(node.pairs):
+            return node
+        return pairs[0] if len(pairs) == 1 else _Collision(keyhash, pairs)
+
+    bit = 1 << ((keyhash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entry = node.entries[index]
+    if isinstance(entry, tuple):
+        if entry[0] != key:
+            return node
+        replacement = None
+    else:
+        replacement = _delete(entry, shift + _BITS, keyhash, key)
+        if replacement is entry:
+            return node
+        if isinstance(replacement, _Node) and len(replacement.entries) == 1 \
+                and isinstance(replacement.entries[0], tuple):
+            # Pull a lone pair up so equal maps have equal shapes
+            replacement = replacement.entries[0]
+
+    if replacement is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap & ~bit, node.entries[:index] + node.entries[index + 1:])
+    return _Node(node.bitmap, node.entries[:index] + (replacement,) + node.entries[index + 1:])
+
+def _iterate(node) -> Iterator[tuple]:
+    entries = node.pairs if isinstance(node, _Collision) else node.entries
+    for entry in entries:
+        if isinstance(entry, tuple):
+            yield entry
+        else:
+            yield from _iterate(entry)
+
+class PMap(Mapping):
+    """Immutable hash map; set() and delete() return new maps sharing structure"""
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, items=()):
+        root, size = _EMPTY, 0
+        pairs = items.items() if isinstance(items, Mapping) else items
+        for key, value in pairs:
+            root, added = _set(root, 0, hash(key), key, value)
+            size += added
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def _from(cls, root, size) -> "PMap":
+        result = object.__new__(cls)
+        result._root = root if root is not None else _EMPTY
+        result._size = size
+        return result
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return (key for key, _ in _iterate(self._root))
+
+    def items(self):
+        return list(_iterate(self._root))
+
+    def __getitem__(self, key):
+        keyhash = hash(key)
+        node, shift = self._root, 0
+        while True:
+            if isinstance(node, _Collision):
+                for existing, value in node.pairs:
+                    if existing == key:
+                        return value
+                raise KeyError(key)
+            bit = 1 << ((keyhash >> shift) & _MASK)
+            if not node.bitmap & bit:
+                raise KeyError(key)
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(entry, tuple):
+                if entry[0] == key:
+                    return entry[1]
+                raise KeyError(key)
+            node, shift = entry, shift + _BITS
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash(frozenset(_iterate(self._root)))
+
+    def __repr__(self):
+        return f"PMap({dict(_iterate(self._root))!r})"
+
+    def __reduce__(self):
+        return (PMap, (self.items(),))
+
+    def set(self, key, value) -> "PMap":
+        root, added = _set(self._root, 0, hash(key), key, value)
+        if root is self._root:
+            return self
+        return PMap._from(root, self._size + added)
+
+    def delete(self, key) -> "PMap":
+        root = _delete(self._root, 0, hash(key), key)
+        if root is self._root:
+            raise KeyError(key)
+        if isinstance(root, tuple):
+            # A lone pair left at the top
+            root = _Node(1 << (hash(root[0]) & _MASK), (root,))
+        return PMap._from(root, self._size - 1)
+
+    def update(self, items=(), **changes) -> "PMap":
+        result = self
+        pairs = items.items() if isinstance(items, Mapping) else items
+        for key, value in list(pairs) + list(changes.items()):
+            result = result.set(key, value)
+        return result
+
+def freeze(value):
+    """Convert plain dicts and lists, recursively, into PMaps and tuples"""
+    if isinstance(value, PMap):
+        return value
+    if isinstance(value, Mapping):
+        return PMap((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """Inverse of freeze(), for JSON and other plain-data consumers"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+def get_in(structure, path: tuple, default=None):
+    for key in path:
+        try:
+            structure = structure[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return structure
+
+# Marks an absent key: set_in() removes it, and deltas use it for added or removed keys
+MISSING = object()
+
+def set_in(structure, path: tuple, value=MISSING):
+    """Copy the path to `path` with the leaf replaced (or removed when value is omitted)"""
+    key = path[0]
+    if len(path) > 1:
+        value = set_in(structure[key], path[1:], value)
+    if isinstance(structure, tuple):
+        return structure[:key] + (value,) + structure[key + 1:]
+    if value is MISSING:
+        return structure.delete(key)
+    return structure.set(key, value)
@@ -0,0 +1,162 @@
+"""Random-access replay files, read through mmap.
+
+A replay holds one record per state, framed like a match log, followed by
+a footer index and a fixed-size trailer:
+
+    MAGIC | record * count | offsets (u64 * count) | turns (u32 * count) | trailer
+
+Every `keyframe_interval`-th record is a full state and the rest are deltas
+from the previous state. The trailer points at the index, so opening a
+replay reads a few bytes no matter its size, and seeking decodes only the
+nearest keyframe and the deltas after it. The last state decoded is kept,
+so stepping forward from it costs one delta.
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from . import codec
+from .game_state_manager import GameState, _freeze_state, apply_delta, diff_states
+from .match_log import RECORD, LogFormatError, RecordKind
+
+MAGIC = b"TDRP\x01"
+# index offset, state count, keyframe interval, end marker
+TRAILER = struct.Struct('<QII4s')
+END = b"TDRI"
+
+def _to_little(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_little(typecode: str, data: memoryview):
+    if sys.byteorder == 'little':
+        return data.cast(typecode)
+    values = array(typecode, data)
+    values.byteswap()
+    return values
+
+def write_replay(path, states: Iterable[GameState], keyframe_interval: int = 32) -> int:
+    """Write states, oldest first, as a replay file; returns how many were written"""
+    offsets, turns = array('Q'), array('I')
+    previous = None
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        offset = len(MAGIC)
+        for index, game_state in enumerate(states):
+            state = _freeze_state(game_state)
+            if index % keyframe_interval == 0:
+                kind, payload = RecordKind.KEYFRAME, codec.encode(state)
+            else:
+                kind, payload = RecordKind.DELTA, codec.encode(tuple(diff_states(previous, state)))
+            f.write(RECORD.pack(len(payload), kind, zlib.crc32(payload)))
+            f.write(payload)
+            offsets.append(offset)
+            turns.append(game_state.turn_number)
+            offset += RECORD.size + len(payload)
+            previous = state
+
+        f.write(_to_little(offsets))
+        f.write(_to_little(turns))
+        f.write(TRAILER.pack(offset, len(offsets), keyframe_interval, END))
+    return len(offsets)
+
+class ReplayFile:
+    """Read-only view of a replay file; states are decoded on demand"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise LogFormatError(f"Not a replay file: {path}") from None
+        self._view = memoryview(self._map)
+
+        size = len(self._map)
+        if size < len(MAGIC) + TRAILER.size or self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise LogFormatError(f"Not a replay file: {path}")
+        index_offset, count, self.keyframe_interval, end = TRAILER.unpack_from(self._map, size - TRAILER.size)
+        if end != END or index_offset + count * 12 + TRAILER.size != size:
+            self.close()
+            raise LogFormatError(f"Replay file has no valid index: {path}")
+
+        turns_offset = index_offset + count * 8
+        self._offsets = _from_little('Q', self._view[index_offset:turns_offset])
+        self._turns = _from_little('I', self._view[turns_offset:turns_offset + count * 4])
+        self._last = (-1, None)  # Index and frozen state of the last decode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        if self._map.closed:
+            return
+        # Views into the map must be released before it can close
+        for name in ('_offsets', '_turns'):
+            values = getattr(self, name, None)
+            if isinstance(values, memoryview):
+                values.release()
+        self._view.release()
+        self._map.close()
+
+    def _record(self, index: int):
+        offset = self._offsets[index]
+        length, kind, checksum = RECORD.unpack_from(self._map, offset)
+        payload = self._view[offset + RECORD.size:offset + RECORD.size + length]
+        if zlib.crc32(payload) != checksum:
+            raise LogFormatError(f"Corrupt record {index} in {self.path}")
+        return kind, codec.decode(payload)
+
+    def _state(self, index: int):
+        """Frozen state at `index`, from the keyframe at or before it or the last decode"""
+        start = index - index % self.keyframe_interval
+        last, state = self._last
+        if start <= last <= index:
+            start = last
+        else:
+            _, state = self._record(start)
+        for position in range(start + 1, index + 1):
+            state = apply_delta(state, self._record(position)[1])
+        self._last = (index, state)
+        return state
+
+    def state(self, index: int) -> GameState:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return GameState(**dict(self._state(index % len(self)).items()))
+
+    def turn(self, index: int) -> int:
+        """Turn number of a state, read from the index without decoding it"""
+        return self._turns[index]
+
+    def turn_start(self, turn: int) -> int:
+        """Index of the first state at or after the start of `turn`"""
+        return bisect_left(self._turns, turn)
+
+    def seek_turn(self, turn: int) -> GameState:
+        """First state of a turn"""
+        return self.state(min(self.turn_start(turn), len(self) - 1))
+
+    def states(self, start: int = 0) -> Iterator[GameState]:
+        """States from `start` on, decoding each record once"""
+        if start >= len(self):
+            return
+        state = self._state(start)
+        yield GameState(**dict(state.items()))
+        for index in range(start + 1, len(self)):
+            kind, value = self._record(index)
+            state = value if kind == RecordKind.KEYFRAME else apply_delta(state, value)
+            yield GameState(**dict(state.items()))
@@ -0,0 +1,124 @@
+"""Scrubbable replays built on GameStateManager.
+
+A ReplayPlayer holds one state per action, with a checkpoint (keyframe)
+every `checkpoint_interval` actions, and a cursor that can move anywhere.
+Moving to an arbitrary action decodes at most `checkpoint_interval` deltas,
+from the nearest checkpoint or from the cursor, whichever is closer; single
+steps cost one delta.
+
+A replay opened with from_file() reads the file through its footer index
+instead, decoding states only as the cursor reaches them, with the file's
+keyframes as checkpoints.
+"""
+import sys
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+from ..managers.event_manager import EventType
+from .game_state_manager import GameState, GameStateManager
+from .replay_file import ReplayFile, write_replay
+
+class ReplayPlayer:
+    """Cursor over the states of a recorded match, one per action"""
+
+    def __init__(self, checkpoint_interval: int = 32):
+        self.checkpoint_interval = checkpoint_interval
+        # Replays are reviewed whole, so nothing is trimmed
+        self.history = GameStateManager(max_bytes=sys.maxsize, keyframe_interval=checkpoint_interval)
+        self.turns: List[int] = []  # Turn number of each state, for seek_turn()
+        self.commands: List[Optional[tuple]] = []  # Command that led to each state, if recorded
+        self._engine = None
+        self._file: Optional[ReplayFile] = None
+        self._index = 0
+        self._state: Optional[GameState] = None
+
+    @classmethod
+    def from_states(cls, states: Iterable[GameState], checkpoint_interval: int = 32) -> "ReplayPlayer":
+        player = cls(checkpoint_interval)
+        for state in states:
+            player._append(state)
+        player.seek(0)
+        return player
+
+    @classmethod
+    def from_file(cls, path) -> "ReplayPlayer":
+        """Open a replay file written by write_replay() or save(); close() releases it"""
+        replay = ReplayFile(path)
+        player = cls(replay.keyframe_interval)
+        player._file = replay
+        # Files hold states only, not the commands between them
+        player.commands = [None] * len(replay)
+        player.seek(0)
+        return player
+
+    def __len__(self):
+        return len(self._file) if self._file is not None else len(self.history)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    # Recording
+
+    def record(self, engine):
+        """Save the engine's state now and after every command it applies"""
+        self._engine = engine
+        self._append(GameState.from_engine(engine))
+        engine.events.subscribe(EventType.COMMAND_APPLIED, self._on_command)
+
+    def stop(self):
+        if self._engine is not None:
+            self._engine.events.unsubscribe(EventType.COMMAND_APPLIED, self._on_command)
+            self._engine = None
+        self._file: Optional[ReplayFile] = None
+        self._index = 0
+        self._state: Optional[GameState] = None
+
+    def _on_command(self, command):
+        self._append(GameState.from_engine(self._engine), command.to_tuple())
+
+    def _append(self, state: GameState, command: Optional[tuple] = None):
+        # Always extends the end, wherever the cursor was
+        if len(self.history):
+            self.history.seek(len(self.history) - 1)
+        self.history.save_state(state)
+        self.turns.append(state.turn_number)
+        self.commands.append(command)
+
+    def save(self, path) -> int:
+        """Write the recorded states as a replay file; returns how many were written"""
+        return write_replay(path, self.history.states(), self.checkpoint_interval)
+
+    # Playback
+
+    @property
+    def index(self) -> int:
+        return self._index if self._file is not None else self.history.current_index
+
+    @property
+    def state(self) -> GameState:
+        return self._state if self._file is not None else self.history.seek(self.index)
+
+    def seek(self, index: int) -> GameState:
+        """Move to an action index, clamped to the replay"""
+        index = max(0, min(index, len(self) - 1))
+        if self._file is None:
+            return self.history.seek(index)
+        if self._state is None or index != self._index:
+            self._index, self._state = index, self._file.state(index)
+        return self._state
+
+    def step(self, count: int = 1) -> GameState:
+        return self.seek(self.index + count)
+
+    def seek_fraction(self, fraction: float) -> GameState:
+        """Move to a point on a 0..1 timeline"""
+        return self.seek(round(fraction * (len(self) - 1)))
+
+    def turn_start(self, turn: int) -> int:
+        """Index of the first state of `turn`, or the end if the game is shorter"""
+        start = self._file.turn_start(turn) if self._file is not None else bisect_left(self.turns, turn)
+        return min(start, len(self) - 1)
+
+    def seek_turn(self, turn: int) -> GameState:
+        return self.seek(self.turn_start(turn))
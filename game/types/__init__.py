@@ -0,0 +1 @@
+from .enums import Phase, Position, CardType, Faction, Zone
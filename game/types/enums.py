@@ -16,6 +16,7 @@ class Position(Enum):
 class CardType(Enum):
     BELIEVER = "Believer"
     RELIC = "Relic"
+    SCRIPTURE = "Scripture"
     MIRACLE = "Miracle"
     MISSION = "Mission"
 
@@ -0,0 +1,67 @@
+import pygame
+from typing import Dict, Optional
+from ...core.constants import (
+    CARD_WIDTH, 
+    CARD_HEIGHT, 
+    BLACK, 
+    GOLD, 
+    WHITE,
+    DARK_BLUE
+)
+
+class CardRenderer:
+    """Draws engine cards; surfaces and images live here, not on the Card"""
+
+    def __init__(self):
+        self.image_cache: Dict[str, Optional[pygame.Surface]] = {}
+        self.font = None
+        
+    def get_rect(self, card) -> pygame.Rect:
+        """Get (and lazily attach) the screen rect of a card"""
+        if getattr(card, 'rect', None) is None:
+            card.rect = pygame.Rect(0, 0, CARD_WIDTH, CARD_HEIGHT)
+        return card.rect
+        
+    def get_image(self, card) -> Optional[pygame.Surface]:
+        """Load and scale card art once per image path"""
+        if not card.image_path:
+            return None
+            
+        if card.image_path not in self.image_cache:
+            image = pygame.image.load(card.image_path)
+            self.image_cache[card.image_path] = pygame.transform.scale(image, (CARD_WIDTH, CARD_HEIGHT))
+        return self.image_cache[card.image_path]
+        
+    def draw(self, card, surface):
+        """Draw the card on the given surface"""
+        rect = self.get_rect(card)
+        
+        # Create background
+        if card.is_face_down:
+            # Draw face-down card
+            pygame.draw.rect(surface, DARK_BLUE, rect)
+            pygame.draw.rect(surface, GOLD, rect, 2)
+        else:
+            # Draw card background
+            pygame.draw.rect(surface, WHITE, rect)
+            pygame.draw.rect(surface, BLACK, rect, 2)
+            
+            # Draw card image or details
+            image = self.get_image(card)
+            if image:
+                surface.blit(image, rect)
+            else:
+                # Draw card details
+                if self.font is None:
+                    self.font = pygame.font.Font(None, 20)
+                
+                # Name
+                name_text = self.font.render(card.name, True, BLACK)
+                surface.blit(name_text, (rect.x + 5, rect.y + 5))
+                
+                # Type
+                type_text = self.font.render(str(card.card_type.value), True, BLACK)
+                surface.blit(type_text, (rect.x + 5, rect.y + 25))
+                
+        if card.is_selected:
+            pygame.draw.rect(surface, GOLD, rect, 4)
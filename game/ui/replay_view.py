@@ -0,0 +1,180 @@
+import pygame
+from typing import Optional
+from ..core.constants import BLACK, GOLD, WHITE, DARK_BLUE
+from ..state.replay_player import ReplayPlayer
+
+TIMELINE_HEIGHT = 24
+TIMELINE_MARGIN = 40
+PLAYBACK_STEP_MS = 400
+
+class ReplayView:
+    """Pygame viewer for a ReplayPlayer with a scrubbable timeline.
+
+    Left/Right step one action, Page Up/Page Down jump a turn, Home/End go
+    to either end and Space plays or pauses. Clicking or dragging on the
+    timeline seeks; every seek decodes at most one checkpoint interval.
+    """
+
+    def __init__(self, screen, clock, replay: ReplayPlayer):
+        self.screen = screen
+        self.clock = clock
+        self.replay = replay
+        self.font = pygame.font.Font(None, 24)
+        self.small_font = pygame.font.Font(None, 20)
+        self.playing = False
+        self.dragging = False
+        self._since_step = 0
+        self._state = replay.state
+
+    @property
+    def timeline_rect(self) -> pygame.Rect:
+        width, height = self.screen.get_size()
+        return pygame.Rect(TIMELINE_MARGIN, height - TIMELINE_MARGIN - TIMELINE_HEIGHT,
+                           width - 2 * TIMELINE_MARGIN, TIMELINE_HEIGHT)
+
+    def seek(self, index: int):
+        self._state = self.replay.seek(index)
+
+    def _seek_to_pos(self, x: int):
+        rect = self.timeline_rect
+        fraction = min(max((x - rect.x) / rect.width, 0.0), 1.0)
+        self._state = self.replay.seek_fraction(fraction)
+
+    def handle_event(self, event) -> bool:
+        """Handle one pygame event; returns False to close the viewer"""
+        if event.type == pygame.QUIT:
+            return False
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+            if event.key == pygame.K_RIGHT:
+                self.seek(self.replay.index + 1)
+            elif event.key == pygame.K_LEFT:
+                self.seek(self.replay.index - 1)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.seek(self.replay.turn_start(self._state.turn_number + 1))
+            elif event.key == pygame.K_PAGEUP:
+                # From a turn's first action, go back to the previous turn
+                start = self.replay.turn_start(self._state.turn_number)
+                turn = self._state.turn_number - 1 if start == self.replay.index else self._state.turn_number
+                self.seek(self.replay.turn_start(turn))
+            elif event.key == pygame.K_HOME:
+                self.seek(0)
+            elif event.key == pygame.K_END:
+                self.seek(len(self.replay) - 1)
+            elif event.key == pygame.K_SPACE:
+                self.playing = not self.playing
+                self._since_step = 0
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.timeline_rect.inflate(0, 16).collidepoint(event.pos):
+                self.dragging = True
+                self.playing = False
+                self._seek_to_pos(event.pos[0])
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self._seek_to_pos(event.pos[0])
+        return True
+
+    def update(self, elapsed_ms: int):
+        """Advance playback"""
+        if not self.playing:
+            return
+        self._since_step += elapsed_ms
+        if self._since_step >= PLAYBACK_STEP_MS:
+            self._since_step = 0
+            if self.replay.index + 1 >= len(self.replay):
+                self.playing = False
+            else:
+                self.seek(self.replay.index + 1)
+
+    def draw(self):
+        self.screen.fill((50, 50, 50))
+        state = self._state
+        width, height = self.screen.get_size()
+
+        header = f"Turn {state.turn_number} - {state.current_phase} - Player {state.active_player + 1} to act"
+        self.screen.blit(self.font.render(header, True, WHITE), (TIMELINE_MARGIN, 10))
+        command = self.replay.commands[self.replay.index]
+        if command is not None:
+            kind, *args = command
+            text = " ".join([kind.replace("_", " ")] + [str(arg) for arg in args if arg is not None])
+            self.screen.blit(self.small_font.render(f"Last action: {text}", True, GOLD), (TIMELINE_MARGIN, 34))
+
+        # Player 2 on top, player 1 below, as in the game view
+        panel_height = (height - 120 - TIMELINE_MARGIN) // 2
+        for index, record in enumerate(state.players):
+            top = 60 if index == 1 else 60 + panel_height
+            self._draw_player(record, pygame.Rect(TIMELINE_MARGIN, top, width - 2 * TIMELINE_MARGIN,
+                                                  panel_height - 10), index == state.active_player)
+
+        winner = state.board_state.get("winner")
+        if winner is not None:
+            banner = self.font.render(f"{state.players[winner]['name']} wins!", True, GOLD)
+            self.screen.blit(banner, banner.get_rect(center=(width // 2, 22)))
+        self._draw_timeline()
+        pygame.display.flip()
+
+    def _draw_player(self, record, rect: pygame.Rect, active: bool):
+        pygame.draw.rect(self.screen, (35, 35, 35), rect)
+        pygame.draw.rect(self.screen, GOLD if active else (90, 90, 90), rect, 2)
+
+        summary = (f"{record['name']}   Grace {record['grace_points']}   "
+                   f"SKP {record['current_skp']}/{record['max_skp']}   "
+                   f"Deck {len(record['deck'])}   Vault {len(record['vault'])}")
+        self.screen.blit(self.font.render(summary, True, WHITE), (rect.x + 10, rect.y + 8))
+
+        rows = [
+            ("Hand", record["hand"]),
+            ("Sanctuary", [f"{name} ({position.title()})" for name, position in record["sanctuary"]]),
+            ("Missions", record["mission_cards"])
+        ]
+        y = rect.y + 36
+        for label, names in rows:
+            self.screen.blit(self.small_font.render(label, True, (180, 180, 180)), (rect.x + 10, y + 8))
+            x = rect.x + 100
+            for name in names:
+                text = self.small_font.render(name, True, BLACK)
+                card = pygame.Rect(x, y, text.get_width() + 12, 28)
+                if card.right > rect.right - 10:
+                    break
+                pygame.draw.rect(self.screen, WHITE, card)
+                pygame.draw.rect(self.screen, DARK_BLUE, card, 1)
+                self.screen.blit(text, (x + 6, y + 7))
+                x = card.right + 6
+            y += 36
+
+    def _draw_timeline(self):
+        rect = self.timeline_rect
+        count = len(self.replay)
+        pygame.draw.rect(self.screen, (80, 80, 80), rect)
+
+        # Checkpoints, where any seek starts decoding from
+        for index in range(0, count, self.replay.checkpoint_interval):
+            x = rect.x + rect.width * index // max(count - 1, 1)
+            pygame.draw.line(self.screen, (130, 130, 130), (x, rect.top), (x, rect.bottom))
+
+        fraction = self.replay.index / max(count - 1, 1)
+        handle = pygame.Rect(0, 0, 8, rect.height + 8)
+        handle.center = (rect.x + round(rect.width * fraction), rect.centery)
+        pygame.draw.rect(self.screen, GOLD, handle)
+
+        label = f"Action {self.replay.index + 1}/{count}" + ("  (playing)" if self.playing else "")
+        self.screen.blit(self.small_font.render(label, True, WHITE), (rect.x, rect.bottom + 6))
+
+    def run(self, start: Optional[int] = None):
+        """Viewer loop; returns when closed"""
+        if start is not None:
+            self.seek(start)
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if not self.handle_event(event):
+                    running = False
+                    break
+            self.update(self.clock.get_time())
+            self.draw()
+            self.clock.tick(60)
+        return 0
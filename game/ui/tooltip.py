@@ -67,14 +67,16 @@ class Tooltip:
     def show(self, pos: Tuple[int, int], lines: List[str], 
              style: TooltipStyle = TooltipStyle.DEFAULT,
              header: Optional[str] = None,
-             max_width: Optional[int] = None):
-        """Show tooltip with fade-in effect"""
+             max_width: Optional[int] = None,
+             duration: Optional[int] = None):
+        """Show tooltip with fade-in effect; hides itself after `duration` frames if given"""
         self.current_tooltip = {
             'pos': pos,
             'lines': lines,
             'style': style,
             'header': header,
-            'max_width': max_width
+            'max_width': max_width,
+            'frames_left': duration
         }
         self.fade_progress = 0
         
@@ -84,9 +86,17 @@ class Tooltip:
         
     def update(self):
         """Update tooltip state"""
-        if self.current_tooltip and self.fade_progress < self.fade_duration:
+        if not self.current_tooltip:
+            return
+            
+        if self.fade_progress < self.fade_duration:
             self.fade_progress += 1
             
+        if self.current_tooltip['frames_left'] is not None:
+            self.current_tooltip['frames_left'] -= 1
+            if self.current_tooltip['frames_left'] <= 0:
+                self.hide()
+            
     def draw(self):
         """Draw current tooltip if active"""
         if not self.current_tooltip:
@@ -1,11 +1,13 @@
 import pygame
-from typing import Optional, Tuple, Dict, List
-from ..card import Card
-from ..types import Phase, CardType
+from typing import Optional, List
+from ..core.card import Card
+from ..managers.event_manager import EventType
+from ..types import Phase
 from .tooltip import Tooltip, TooltipStyle
 from .visual_effects import VisualFeedbackManager, EffectType
 from .card_animator import CardAnimator
 from .menu import GameMenu
+from .renderers.card_renderer import CardRenderer
 
 class UIManager:
     def __init__(self, screen, game):
@@ -16,6 +18,7 @@ class UIManager:
         self.tooltip = Tooltip(screen, game.debug_font)
         self.visual_feedback = VisualFeedbackManager(screen)
         self.card_animator = CardAnimator()
+        self.card_renderer = CardRenderer()
         
         # Mouse state
         self.dragging_card = None
@@ -29,21 +32,49 @@ class UIManager:
         self.menu = GameMenu(screen)
         self.action_confirmation = None
         
+        # Hover and drag state only change when the mouse or the cards move
+        self._mouse_pos = None
+        self._layout_changed = True
+        self._pending_phase = None
+        self._pending_turn = None
+        
+        events = game.engine.events
+        events.subscribe(EventType.PHASE_CHANGED, self._on_phase_changed)
+        events.subscribe(EventType.TURN_CHANGED, self._on_turn_changed)
+        for event_type in (EventType.CARD_DRAWN, EventType.CARD_PLAYED, EventType.CARD_DESTROYED):
+            events.subscribe(event_type, self._on_layout_changed)
+        
+    def _on_phase_changed(self, phase):
+        self._pending_phase = phase
+        self._layout_changed = True
+        
+    def _on_turn_changed(self, player_index, turn_count):
+        self._pending_turn = player_index
+        
+    def _on_layout_changed(self, player, card):
+        self._layout_changed = True
+        
     def update(self):
         """Update UI state"""
-        mouse_pos = pygame.mouse.get_pos()
+        # A turn change hides the INVOCATION phase change it implies
+        if self._pending_turn is not None:
+            self.show_turn_change(self._pending_turn)
+        elif self._pending_phase is not None:
+            self.show_phase_change(self._pending_phase)
+        self._pending_turn = self._pending_phase = None
         
         # Update components
         self.visual_feedback.update()
         self.card_animator.update()
         self.tooltip.update()
         
-        # Update hover states
-        self._update_hover_states(mouse_pos)
-        
-        # Update drag states
-        if self.dragging_card:
-            self._update_drag_states(mouse_pos)
+        mouse_pos = pygame.mouse.get_pos()
+        if mouse_pos != self._mouse_pos or self._layout_changed:
+            self._mouse_pos = mouse_pos
+            self._layout_changed = False
+            self._update_hover_states(mouse_pos)
+            if self.dragging_card:
+                self._update_drag_states(mouse_pos)
             
     def draw(self):
         """Draw UI elements"""
@@ -217,15 +248,10 @@ class UIManager:
         if not self.dragging_card:
             return
             
-        current_player = self.game.players[self.game.active_player_index]
-        
-        # Check if card can be played based on current phase
-        if self.game.current_phase == Phase.PREPARATION:
-            # Check sanctuary placement
-            if (self.dragging_card.card_type in [CardType.BELIEVER, CardType.RELIC] and
-                len(current_player.sanctuary) < MAX_SANCTUARY_SIZE and
-                current_player.current_skp >= self.dragging_card.skp_cost):
-                self.valid_zones.append(f"SANCTUARY_P{self.game.active_player_index + 1}")
+        # Legal actions already account for phase, SKP and sanctuary space
+        for action in self.game.engine.legal_actions():
+            if action.kind == "play_card" and action.card is self.dragging_card:
+                self.valid_zones.append(f"{action.zone}_P{self.game.active_player_index + 1}")
         
     def _update_hover_states(self, mouse_pos):
         """Update all hover states"""
@@ -256,7 +282,7 @@ class UIManager:
     def _update_drag_states(self, mouse_pos):
         """Update drag-related states"""
         if self.dragging_card:
-            self.dragging_card.rect.center = mouse_pos
+            self.card_renderer.get_rect(self.dragging_card).center = mouse_pos
             self._update_valid_zones()
             
     def _highlight_zone(self, zone):
@@ -267,12 +293,9 @@ class UIManager:
     def _draw_dragged_card(self):
         """Draw card being dragged"""
         if self.dragging_card:
-            mouse_pos = pygame.mouse.get_pos()
-            self.dragging_card.draw(
-                self.screen,
-                mouse_pos[0] - self.dragging_card.rect.width // 2,
-                mouse_pos[1] - self.dragging_card.rect.height // 2
-            ) 
+            rect = self.card_renderer.get_rect(self.dragging_card)
+            rect.center = pygame.mouse.get_pos()
+            self.card_renderer.draw(self.dragging_card, self.screen)
         
     def handle_click(self, pos):
         # Check menu first
@@ -0,0 +1,72 @@
+import csv
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.card import Card, CardDefinition
+from ..core.deck import Deck
+from ..effects.ability_compiler import check_abilities
+from ..types.enums import CardType
+
+# Section titles in assets/card_data.csv and the card type they hold
+SECTIONS = {
+    "Believer Cards": CardType.BELIEVER,
+    "Relic Cards": CardType.RELIC,
+    "Miracle Cards": CardType.MIRACLE,
+}
+
+def _int(value: str) -> Optional[int]:
+    return int(value) if value and value.strip().isdigit() else None
+
+def _ability(value: str) -> Optional[str]:
+    value = (value or "").strip()
+    return None if value in ("", "None.") else value
+
+def _definition(card_type: CardType, row: dict) -> CardDefinition:
+    if card_type == CardType.BELIEVER:
+        return CardDefinition(
+            name=row["Name"],
+            card_type=card_type,
+            effect=_ability(row["Special Ability"]),
+            faith_points=_int(row["FP"]),
+            divinity_points=_int(row["DP"]),
+            skp_cost=_int(row["SKP Cost"]) or 0,
+            faction=row["Faction"].strip().upper()
+        )
+    return CardDefinition(
+        name=row["Name"],
+        card_type=card_type,
+        effect=_ability(row["Effect"]),
+        miracle_type=row["Type"].strip().upper() if row.get("Type") else None,
+        skp_cost=_int(row["SKP Cost"]) or 0
+    )
+
+def load_card_pool(filepath: str = "assets/card_data.csv") -> List[CardDefinition]:
+    """Load every card in the spreadsheet export as interned definitions"""
+    path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"Card data not found: {filepath}")
+
+    pool = []
+    seen = set()
+    card_type = header = None
+    with open(path, newline="", encoding="cp1252") as f:
+        for row in csv.reader(f):
+            first = row[0].strip() if row else ""
+            section = next((t for title, t in SECTIONS.items() if first.startswith(title)), None)
+            if section is not None:
+                card_type, header = section, None
+            elif first == "Name":
+                header = [column.strip() for column in row]
+            elif first and header and card_type:
+                definition = _definition(card_type, dict(zip(header, row)))
+                # The export repeats whole sections; interning makes repeats identical
+                if definition not in seen:
+                    seen.add(definition)
+                    pool.append(definition)
+    return pool
+
+def build_pool_deck(pool: List[CardDefinition], size: int, rng, strict: bool = False) -> Deck:
+    """Deal a random deck of fresh card copies from the pool; see build_deck() for `strict`"""
+    cards = [Card.from_definition(rng.choice(pool)) for _ in range(size)]
+    check_abilities(cards, strict)
+    return Deck(cards)
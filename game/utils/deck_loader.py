@@ -2,8 +2,10 @@ import json
 from pathlib import Path
 from ..types.enums import CardType
 from ..core.card import Card
+from ..core.deck import Deck
+from ..effects.ability_compiler import check_abilities
 
-def load_deck(filepath: str) -> list:
+def load_deck(filepath: str, strict: bool = False) -> Deck:
     """Load deck from JSON file"""
     path = Path(filepath)
     if not path.exists():
@@ -12,6 +14,14 @@ def load_deck(filepath: str) -> list:
     with open(path) as f:
         deck_data = json.load(f)
         
+    return build_deck(deck_data, strict)
+
+def build_deck(deck_data: list, strict: bool = False) -> Deck:
+    """Create fresh Card instances from parsed deck JSON.
+
+    Cards whose abilities the engine cannot play are logged, or with
+    `strict` raise UnsupportedAbilityError.
+    """
     deck = []
     for card_data in deck_data:
         card = Card(
@@ -23,4 +33,5 @@ def load_deck(filepath: str) -> list:
             skp_cost=card_data["skp_cost"]
         )
         deck.append(card)
-    return deck 
\ No newline at end of file
+    check_abilities(deck, strict)
+    return Deck(deck)
\ No newline at end of file
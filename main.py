@@ -1,8 +1,20 @@
+import argparse
 import pygame
-import sys
+from game.ai.mcts import MCTS, AIController
 from game.game import TestamentDuelGame
+from game.state.replay_player import ReplayPlayer
+from game.ui.replay_view import ReplayView
 
 def main():
+    parser = argparse.ArgumentParser(description="Testament Duel")
+    parser.add_argument("--ai", action="store_true", help="play against the computer")
+    parser.add_argument("--ai-budget", type=int, default=1000, help="AI thinking time per action in ms")
+    parser.add_argument("--ai-workers", type=int, default=1, help="processes used by the AI search")
+    parser.add_argument("--replay", metavar="FILE", help="review a saved replay instead of playing")
+    parser.add_argument("--save-replay", metavar="FILE", help="save the match as a replay when the game closes")
+    parser.add_argument("--checkpoint", type=int, default=32, help="actions between checkpoints in saved replays")
+    args = parser.parse_args()
+    
     # Initialize Pygame
     pygame.init()
     
@@ -13,8 +25,17 @@ def main():
     # Set up the clock
     clock = pygame.time.Clock()
     
+    if args.replay:
+        replay = ReplayPlayer.from_file(args.replay)
+        try:
+            ReplayView(screen, clock, replay).run()
+        finally:
+            replay.close()
+        return
+        
     # Create game instance
-    game = TestamentDuelGame(screen, clock)
+    ai = AIController(mcts=MCTS(args.ai_budget, args.ai_workers)) if args.ai else None
+    game = TestamentDuelGame(screen, clock, ai=ai, replay_path=args.save_replay, checkpoint_interval=args.checkpoint)
     
     # Run the game
     game.run()
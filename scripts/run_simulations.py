@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import argparse
+
+# Add the parent directory to Python path so we can import the game package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.simulation.batch_runner import run_batch, MAX_TURNS
+
+def main():
+    # Set up argument parser
+    parser = argparse.ArgumentParser(description='Run headless Testament Duel matches')
+    parser.add_argument('--pair', '-p', nargs=2, action='append', metavar=('DECK1', 'DECK2'),
+                       help='Deck JSON files to play against each other (repeatable)')
+    parser.add_argument('--games', '-g', type=int, default=1000,
+                       help='Games per deck pair')
+    parser.add_argument('--seed', '-s', type=int, default=0,
+                       help='Base RNG seed; the same seed reproduces the same results')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Worker processes (defaults to all cores)')
+    parser.add_argument('--max-turns', type=int, default=MAX_TURNS,
+                       help='Turn limit before a match is scored as a draw')
+    parser.add_argument('--replays', metavar='DIR', default=None,
+                       help='Save every match as a replay file in this directory')
+    args = parser.parse_args()
+
+    deck_pairs = args.pair or [(os.path.join("assets", "decks", "player1_deck.json"),
+                                os.path.join("assets", "decks", "player2_deck.json"))]
+    
+    if args.replays:
+        os.makedirs(args.replays, exist_ok=True)
+    
+    start = time.perf_counter()
+    results = run_batch(deck_pairs, args.games, args.seed, args.workers, args.max_turns,
+                        replay_dir=args.replays)
+    elapsed = time.perf_counter() - start
+    
+    for (deck1, deck2), stats in zip(deck_pairs, results):
+        print(f"{deck1} vs {deck2}: {stats.games} games, "
+              f"P1 {stats.win_rate(0):.1%} / P2 {stats.win_rate(1):.1%} / draws {stats.draws}, "
+              f"mean length {stats.mean_turns:.2f} turns")
+    total = sum(stats.games for stats in results)
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:.0f} games/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,37 @@
 import pytest
-import pygame
-from game.game import TestamentDuelGame
+from game.core.engine import GameEngine
+from game.utils.deck_loader import load_deck
 
 @pytest.fixture
 def screen():
+    pygame = pytest.importorskip("pygame")
     pygame.init()
     return pygame.display.set_mode((1280, 720))
 
 @pytest.fixture
 def clock():
+    pygame = pytest.importorskip("pygame")
     return pygame.time.Clock()
 
 @pytest.fixture
 def game(screen, clock):
+    from game.game import TestamentDuelGame
     return TestamentDuelGame(screen, clock)
+
+@pytest.fixture
+def engine():
+    return GameEngine(
+        load_deck("assets/decks/player1_deck.json"),
+        load_deck("assets/decks/player2_deck.json")
+    )
+
+@pytest.fixture
+def make_engine():
+    """Factory for seeded engines over the sample decks"""
+    def make(seed=1):
+        return GameEngine(
+            load_deck("assets/decks/player1_deck.json"),
+            load_deck("assets/decks/player2_deck.json"),
+            seed=seed
+        )
+    return make
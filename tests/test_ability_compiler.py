@@ -0,0 +1,216 @@
+import logging
+import pickle
+import random
+import pytest
+from game.core.card import Card
+from game.core.engine import GameEngine
+from game.effect_system import Timing
+from game.effects.ability_compiler import UnsupportedAbilityError, compile_ability, is_supported
+from game.simulation.policies import GreedyPolicy
+from game.types.enums import CardType
+from game.utils.card_pool import build_pool_deck, load_card_pool
+from game.utils.deck_loader import build_deck
+
+def test_identical_text_shares_compiled_effect():
+    first = compile_ability("Pray: Restores 300 FP every other turn.")
+    assert first is compile_ability("Pray: Restores 300 FP every other turn.")
+    assert first[0].timing == Timing.START_OF_TURN
+
+def test_timings_from_prefix_and_qualifiers():
+    assert compile_ability("Preach: Deals an additional 400 FP damage if opponent has fewer than 4 SKP.")[0].timing == Timing.ON_ATTACK
+    assert compile_ability("Pray: Reduces all incoming damage by 500.")[0].timing == Timing.ON_DEFEND
+    assert compile_ability("Deals 2500 FP damage to the opponent.")[0].timing == Timing.IMMEDIATE
+
+def test_padded_text_pickles():
+    effects = compile_ability("  Destroys one enemy Believer and deals 1000 FP damage.\n")
+    assert effects is compile_ability("Destroys one enemy Believer and deals 1000 FP damage.")
+    assert pickle.loads(pickle.dumps(effects)) == effects
+
+def test_unsupported_text_compiles_to_nothing():
+    assert compile_ability("Preach: Attacks twice per turn... maybe") == ()
+    assert not is_supported("Equipped Believer gains immunity to Miracles")
+    assert compile_ability(None) == ()
+
+def believer(name, effect, fp=1000, dp=1000, cost=0):
+    return Card(name, CardType.BELIEVER, effect, faith_points=fp, divinity_points=dp, skp_cost=cost)
+
+def fillers(prefix):
+    return [believer(f"{prefix} {i}", None) for i in range(4)]
+
+def test_pray_effect_resolves_on_owners_turn():
+    healer = believer("Healer", "Pray: Restores 300 FP each turn.")
+    engine = GameEngine([healer] + fillers("A"), fillers("B"), seed=1)
+    
+    engine.advance_phase()
+    engine.advance_phase()
+    assert engine.summon_believer(healer)
+    engine.end_turn()
+    assert engine.players[0].grace_points == 8000
+    
+    engine.end_turn()
+    assert engine.active_player_index == 0
+    assert engine.players[0].grace_points == 8300
+
+def test_attack_bonus_and_damage_reduction():
+    striker = believer("Striker", "Preach: Increases FP damage by 500 when attacking directly.", fp=1000)
+    psalm = Card("Psalm", CardType.SCRIPTURE, "Reduces all damage to your Grace Points by 200")
+    engine = GameEngine([striker] + fillers("A"), [psalm] + fillers("B"), seed=2)
+    engine.end_turn()
+    
+    engine.advance_phase()
+    assert engine.play_card(psalm, "MISSION")
+    engine.end_turn()
+    
+    engine.advance_phase()
+    engine.advance_phase()
+    assert engine.summon_believer(striker)
+    engine.advance_phase()
+    assert engine.assign_mission(striker)
+    assert engine.declare_attack(striker)
+    engine.advance_phase()
+    assert engine.players[1].grace_points == 8000 - (1000 + 500 - 200)
+
+def test_reductions_join_the_owners_defense_pipeline():
+    wardens = [believer(f"Warden {i}", "Pray: Reduces all incoming damage by 500.", cost=0) for i in range(2)]
+    engine = GameEngine(wardens + fillers("A")[:3], fillers("B"), seed=2)
+    engine.advance_phase()
+    engine.advance_phase()
+    for warden in wardens:
+        assert engine.summon_believer(warden)
+
+    owner = engine.players[0]
+    pipelines = engine.combat_manager._defense_pipelines[owner]
+    assert [(stage.add, stage.multiply) for stage in pipelines[0]] == [(-1000, 1)]
+    assert not engine.effect_manager.active_effects
+
+    wardens[0].is_destroyed = True
+    engine._discard_destroyed()
+    assert [(stage.add, stage.multiply) for stage in engine.combat_manager._defense_pipelines[owner][0]] == [(-500, 1)]
+
+def test_gaining_fp_heals_the_attackers_owner():
+    striker = believer("Striker", "Preach: Gains 500 FP when attacking directly.", fp=1000)
+    engine = GameEngine([striker] + fillers("A"), fillers("B"), seed=2)
+    for _ in range(2):
+        engine.advance_phase()
+    assert engine.summon_believer(striker)
+    engine.advance_phase()
+    assert engine.assign_mission(striker)
+    assert engine.declare_attack(striker)
+    engine.advance_phase()
+    assert engine.players[0].grace_points == 8500
+    assert engine.players[1].grace_points == 8000 - 1000
+
+def test_compound_abilities_apply_every_action():
+    first = compile_ability("Destroys one enemy Believer and deals 1000 FP damage.")
+    assert [effect.timing for effect in first] == [Timing.IMMEDIATE, Timing.IMMEDIATE]
+    assert pickle.loads(pickle.dumps(first[1])) is first[1]
+    # Every part has to be understood
+    assert not is_supported("Deals 1000 FP damage and negates one Scripture.")
+
+    weak, strong = believer("Weak", None, fp=1000), believer("Strong", None, fp=2000)
+    psalm = Card("Psalm", CardType.SCRIPTURE, None)
+    smite = Card("Smite", CardType.MIRACLE, "Destroys one enemy Believer and deals 1000 FP damage.")
+    purge = Card("Purge", CardType.MIRACLE, "Deals 1500 FP damage to the opponent and destroys one Scripture card.")
+    engine = GameEngine([smite, purge] + fillers("A")[:2], [weak, strong, psalm] + fillers("B")[:2], seed=3)
+    engine.end_turn()
+    engine.advance_phase()
+    assert engine.play_card(psalm, "MISSION")
+    engine.advance_phase()
+    assert engine.summon_believer(weak) and engine.summon_believer(strong)
+    engine.end_turn()
+
+    engine.advance_phase()
+    opponent = engine.players[1]
+    assert engine.play_card(smite, "MISSION")
+    assert opponent.sanctuary == [weak] and strong in opponent.vault
+    assert engine.play_card(purge, "MISSION")
+    assert opponent.mission_cards == [] and psalm in opponent.vault
+    assert opponent.grace_points == 8000 - 1000 - 1500
+
+def test_unsupported_cards_are_reported_at_deck_build(caplog):
+    data = [{"name": "Mystic Mirror", "card_type": "RELIC", "effect": "Reflects every Miracle back.", "skp_cost": 1},
+            {"name": "Healer", "card_type": "BELIEVER", "effect": "Pray: Restores 300 FP each turn.",
+             "faith_points": 1000, "divinity_points": 1000, "skp_cost": 1}]
+    with caplog.at_level(logging.WARNING, logger="TestamentDuel"):
+        build_deck(data)
+        build_deck(data)
+    assert [record.getMessage().split("'")[0] for record in caplog.records] == ["Mystic Mirror"]
+    with pytest.raises(UnsupportedAbilityError, match="Mystic Mirror"):
+        build_deck(data, strict=True)
+    assert len(build_deck(data[1:], strict=True)) == 1
+
+def to_opponents_mission(engine, *believers):
+    """End the active turn, then summon and send out `believers` in the opponent's"""
+    engine.end_turn()
+    engine.advance_phase()
+    engine.advance_phase()
+    for card in believers:
+        assert engine.summon_believer(card)
+    engine.advance_phase()
+    for card in believers:
+        assert engine.assign_mission(card)
+
+def test_prevention_lasts_through_the_opponents_turn():
+    shield = Card("Shield", CardType.MIRACLE, "Prevents all damage this turn.")
+    striker = believer("Striker", None, fp=1500)
+    engine = GameEngine([shield] + fillers("A")[:3], [striker] + fillers("B")[:3], seed=4)
+    engine.advance_phase()
+    assert engine.play_card(shield, "MISSION")
+
+    to_opponents_mission(engine, striker)
+    assert engine.declare_attack(striker)
+    engine.advance_phase()
+    assert engine.players[0].grace_points == 8000
+
+    engine.end_turn()
+    assert engine.players[0] not in engine.combat_manager._defense_pipelines
+    assert not engine.timed_damage_modifiers
+
+def test_next_turn_restrictions_hit_the_opponent_once():
+    miracles = [Card("Famine", CardType.MIRACLE, "Prevents the opponent from drawing a card next turn."),
+                Card("Siege", CardType.MIRACLE, "Opponent skips their next Summoning Phase."),
+                Card("Tithe", CardType.MIRACLE, "Opponent loses 3 SKP next turn.")]
+    late = believer("Latecomer", None)
+    engine = GameEngine(miracles + fillers("A")[:2], [late] + fillers("B"), seed=5)
+    engine.advance_phase()
+    before = engine.state_hash()
+    for miracle in miracles:
+        assert engine.play_card(miracle, "MISSION")
+    assert engine.state_hash() != before
+
+    opponent = engine.players[1]
+    hand, deck = len(opponent.hand), len(opponent.deck)
+    engine.end_turn()
+    assert (len(opponent.hand), len(opponent.deck)) == (hand, deck)
+    assert opponent.current_skp == max(0, opponent.max_skp - 3)
+    engine.advance_phase()
+    engine.advance_phase()
+    assert not any(action.kind == "summon" for action in engine.legal_actions())
+    assert not engine.summon_believer(late)
+
+    engine.end_turn()
+    engine.end_turn()
+    assert opponent.current_skp == opponent.max_skp
+    engine.advance_phase()
+    engine.advance_phase()
+    assert engine.summon_believer(late)
+
+def test_shuffling_hands_back_keeps_hashes_in_step():
+    storm = Card("Storm", CardType.MIRACLE, "Both players shuffle their hands into their decks and redraw.")
+    engine = GameEngine([storm] + fillers("A") * 2, fillers("B") * 2, seed=6)
+    engine.advance_phase()
+    sizes = [len(player.hand) for player in engine.players]
+    assert engine.play_card(storm, "MISSION")
+    assert [len(player.hand) for player in engine.players] == [sizes[0] - 1, sizes[1]]
+    for player in engine.players:
+        assert player.zobrist == player.compute_hash()
+
+def test_full_pool_plays_headless():
+    pool = load_card_pool()
+    assert len(pool) > 150
+    policy = GreedyPolicy()
+    for seed in range(20):
+        rng = random.Random(seed)
+        engine = GameEngine(build_pool_deck(pool, 20, rng), build_pool_deck(pool, 20, rng), seed=seed)
+        while not engine.game_over and engine.turn_count <= 100:
+            policy.play_turn(engine)
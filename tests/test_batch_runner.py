@@ -0,0 +1,74 @@
+import json
+import random
+import sys
+
+import pytest
+
+from game.simulation.batch_runner import MatchStats, MatchResult, play_match, replay_name, run_batch, _deck_data
+from game.state.game_state_manager import GameStateManager
+from game.state.replay_file import ReplayFile
+from game.utils.card_pool import load_card_pool
+
+DECK_SIZE = 30  # Well past the opening hand, so the shuffle decides what is drawn
+
+def _pool_deck(rng, pool) -> list:
+    return [{"name": card.name, "card_type": card.card_type.name, "effect": card.effect,
+             "faith_points": card.faith_points, "divinity_points": card.divinity_points,
+             "skp_cost": card.skp_cost}
+            for card in (rng.choice(pool) for _ in range(DECK_SIZE))]
+
+@pytest.fixture(scope="module")
+def decks(tmp_path_factory):
+    """Two deck files dealt from the full card pool"""
+    pool, rng = load_card_pool(), random.Random(0)
+    paths = []
+    for index in range(2):
+        path = tmp_path_factory.mktemp("decks") / f"deck{index}.json"
+        path.write_text(json.dumps(_pool_deck(rng, pool)))
+        paths.append(str(path))
+    return tuple(paths)
+
+def test_match_is_reproducible(decks):
+    deck1, deck2 = _deck_data(decks[0]), _deck_data(decks[1])
+    assert play_match(deck1, deck2, seed=7) == play_match(deck1, deck2, seed=7)
+
+def test_seed_changes_the_match(decks):
+    deck1, deck2 = _deck_data(decks[0]), _deck_data(decks[1])
+    results = {(result.winner, result.turns) for result in (play_match(deck1, deck2, seed) for seed in range(10))}
+    assert len(results) > 1
+
+def test_batch_matches_across_worker_counts(decks):
+    serial = run_batch([decks, decks[::-1]], games=20, base_seed=3, workers=1)
+    parallel = run_batch([decks, decks[::-1]], games=20, base_seed=3, workers=2, chunk_size=3)
+    assert serial == parallel
+    assert all(stats.games == 20 for stats in serial)
+    # Different seeds really play different matches
+    assert len(serial[0].turn_histogram) > 1 or 0 < serial[0].wins[0] < 20
+
+def test_batch_matches_serial_seed_for_seed(decks, tmp_path):
+    """Replays written by a parallel batch hold the same matches as serial play"""
+    run_batch([decks], games=6, base_seed=11, workers=2, chunk_size=1, replay_dir=str(tmp_path))
+    deck1, deck2 = _deck_data(decks[0]), _deck_data(decks[1])
+    for seed in range(11, 17):
+        history = GameStateManager(max_bytes=sys.maxsize)
+        result = play_match(deck1, deck2, seed, history=history)
+        with ReplayFile(tmp_path / replay_name(0, seed)) as replay:
+            assert list(replay.states()) == list(history.states())
+            assert replay.state(len(replay) - 1).turn_number == result.turns
+
+def test_stats_merge():
+    stats = MatchStats()
+    stats.add(MatchResult(seed=0, winner=0, turns=4))
+    other = MatchStats()
+    other.add(MatchResult(seed=1, winner=None, turns=6))
+    stats.merge(other)
+    assert stats.wins == [1, 0]
+    assert stats.draws == 1
+    assert stats.mean_turns == 5
+    assert stats.turn_histogram == {4: 1, 6: 1}
+
+def test_match_history_records_every_turn(decks):
+    history = GameStateManager()
+    result = play_match(_deck_data(decks[0]), _deck_data(decks[1]), seed=7, history=history)
+    assert result == play_match(_deck_data(decks[0]), _deck_data(decks[1]), seed=7)
+    assert history.state_at(len(history) - 1).turn_number == result.turns
@@ -0,0 +1,36 @@
+import pickle
+import pytest
+from game.core.card import Card
+from game.types.enums import CardType
+
+def make_card():
+    return Card("Faithful Shepherd", CardType.BELIEVER, "Gains 300 FP",
+                faith_points=1200, divinity_points=1000, skp_cost=3)
+
+def test_copies_share_definition():
+    first, second = make_card(), make_card()
+    assert first is not second
+    assert first.definition is second.definition
+    assert first.faith_points == 1200
+
+def test_state_is_per_copy():
+    first, second = make_card(), make_card()
+    first.is_destroyed = True
+    assert not second.is_destroyed
+
+def test_definition_is_immutable():
+    card = make_card()
+    with pytest.raises(AttributeError):
+        card.definition.faith_points = 9999
+    with pytest.raises(AttributeError):
+        card.faith_points = 9999
+
+def test_cards_have_no_instance_dict():
+    card = make_card()
+    assert not hasattr(card, "__dict__")
+    assert not hasattr(card.definition, "__dict__")
+
+def test_pickle_reinterns_definition():
+    card = make_card()
+    assert pickle.loads(pickle.dumps(card)).definition is card.definition
+    assert Card.from_definition(card.definition).name == card.name
@@ -0,0 +1,153 @@
+import random
+import pytest
+from game.core.card import Card
+from game.core.combat_manager import CombatManager, DamageModifier, resolve_lockstep
+from game.core.player import Player
+from game.types.enums import CardType, Position
+
+def make_manager(rng, attacks):
+    manager = CombatManager()
+    manager.damage_modifiers = [DamageModifier(add=-100), DamageModifier(multiply=1.5)]
+    defenders = Player("Defender", [])
+    attackers = Player("Attacker", [])
+    attackers.opponent = defenders
+    for i in range(attacks):
+        card = Card(f"Attacker {i}", CardType.BELIEVER, None, faith_points=rng.randrange(0, 3000))
+        card.owner = attackers
+        manager.declare_attack(card, None, Position.PREACHING)
+        manager.pending_attacks[-1]["modifiers"] = [
+            DamageModifier(add=rng.randrange(-500, 500), multiply=rng.choice([1, 2, 0.5]))
+            for _ in range(rng.randrange(0, 4))
+        ]
+    return manager
+
+def test_batch_damage_matches_scalar():
+    pytest.importorskip("numpy")
+    manager = make_manager(random.Random(3), 200)
+    scalar = [manager._calculate_damage(attack) for attack in manager.pending_attacks]
+    assert manager.calculate_damages() == scalar
+
+def test_batch_resolution_matches_scalar():
+    pytest.importorskip("numpy")
+    scalar = make_manager(random.Random(4), 100)
+    batched = make_manager(random.Random(4), 100)
+    scalar_defender = scalar.pending_attacks[0]["attacker"].owner.opponent
+    batched_defender = batched.pending_attacks[0]["attacker"].owner.opponent
+    
+    scalar.resolve_attacks(batch=False)
+    batched.resolve_attacks(batch=True)
+    assert batched_defender.grace_points == scalar_defender.grace_points
+    assert not batched.pending_attacks
+
+def test_lockstep_applies_each_game():
+    pytest.importorskip("numpy")
+    games = [make_manager(random.Random(seed), 10) for seed in range(5)]
+    expected = []
+    for seed in range(5):
+        manager = make_manager(random.Random(seed), 10)
+        defender = manager.pending_attacks[0]["attacker"].owner.opponent
+        manager.resolve_attacks(batch=False)
+        expected.append(defender.grace_points)
+    
+    defenders = [manager.pending_attacks[0]["attacker"].owner.opponent for manager in games]
+    resolve_lockstep(games)
+    assert [defender.grace_points for defender in defenders] == expected
+
+def test_non_affine_modifiers_fall_back():
+    pytest.importorskip("numpy")
+    class Halve:
+        def apply(self, damage):
+            return damage // 2
+    
+    manager = make_manager(random.Random(5), 5)
+    manager.add_damage_modifier(Halve())
+    assert manager.calculate_damages() == [manager._calculate_damage(a) for a in manager.pending_attacks]
+
+def test_global_stack_is_precomposed_and_invalidated():
+    manager = CombatManager()
+    first, second = DamageModifier(add=200), DamageModifier(multiply=2)
+    manager.add_damage_modifier(first)
+    manager.add_damage_modifier(second)
+    manager.add_damage_modifier(DamageModifier(add=-500))
+    assert [(stage.add, stage.multiply) for stage in manager._pipeline] == [(-100, 2)]
+    
+    attacker = Card("Striker", CardType.BELIEVER, None, faith_points=1000)
+    assert manager._calculate_damage({"attacker": attacker, "modifiers": []}) == 1900
+    
+    assert manager.remove_damage_modifier(second)
+    assert manager._calculate_damage({"attacker": attacker, "modifiers": []}) == 700
+
+def test_float_modifiers_match_applying_one_at_a_time():
+    def sequential(damage, modifiers):
+        for modifier in modifiers:
+            damage = modifier.apply(damage)
+        return max(0, damage)
+
+    attacker = Card("Striker", CardType.BELIEVER, None, faith_points=1000)
+    stacks = [
+        [DamageModifier(multiply=0.1), DamageModifier(multiply=3)],
+        [DamageModifier(add=7), DamageModifier(multiply=3), DamageModifier(multiply=0.1), DamageModifier(add=1)],
+    ]
+    for modifiers in stacks:
+        manager = CombatManager()
+        manager.damage_modifiers = modifiers
+        assert manager._calculate_damage({"attacker": attacker, "modifiers": []}) == sequential(1000, modifiers)
+    assert CombatManager()._calculate_damage({"attacker": attacker, "modifiers": []}) == 1000
+
+    # 1000 * 0.1 * 3 is 300.0, but folding to 1000 * 0.3 gives 300.00000000000006
+    manager = CombatManager()
+    manager.damage_modifiers = stacks[0]
+    assert manager._calculate_damage({"attacker": attacker, "modifiers": []}) == 300.0
+
+    # Integer runs still fold, and replay themselves on float damage
+    manager.damage_modifiers = [DamageModifier(multiply=3), DamageModifier(multiply=3)]
+    assert len(manager._pipeline) == 1
+    attack = {"attacker": Card("Weak", CardType.BELIEVER, None, faith_points=1), "modifiers": [DamageModifier(multiply=0.1)]}
+    assert manager._calculate_damage(attack) == sequential(1, attack["modifiers"] + list(manager.damage_modifiers))
+
+def test_batch_matches_scalar_around_composed_stages():
+    pytest.importorskip("numpy")
+    for shared in ([DamageModifier(multiply=0.1), DamageModifier(multiply=3)],
+                   [DamageModifier(multiply=3), DamageModifier(add=-7), DamageModifier(multiply=3)]):
+        manager = make_manager(random.Random(6), 100)
+        manager.damage_modifiers = shared
+        assert manager.calculate_damages() == [manager._calculate_damage(a) for a in manager.pending_attacks]
+
+def test_defense_stacks_apply_to_their_player_after_on_damage():
+    manager = make_manager(random.Random(7), 0)
+    attackers, defenders = Player("Attacker", []), Player("Defender", [])
+    attackers.opponent, defenders.opponent = defenders, attackers
+    striker = Card("Striker", CardType.BELIEVER, None, faith_points=1000)
+    striker.owner = attackers
+    guard = Card("Guard", CardType.BELIEVER, None, faith_points=0, divinity_points=5000)
+    guard.owner = defenders
+
+    manager.damage_modifiers = []
+    manager.add_damage_modifier(DamageModifier(add=-300), defenders)
+    manager.add_damage_modifier(DamageModifier(add=-200), defenders, direct_only=True)
+    manager.add_damage_modifier(DamageModifier(add=-100), defenders, direct_only=True)
+    assert [(stage.add, stage.multiply) for stage in manager._defense_pipelines[defenders][1]] == [(-600, 1)]
+
+    direct = {"attacker": striker, "defender": None, "modifiers": []}
+    blocked = {"attacker": striker, "defender": guard, "modifiers": []}
+    assert manager._defend(direct, 1500) == 900
+    assert manager._defend(blocked, 1500) == 1200
+    assert manager._defend(direct, 100) == 0
+    assert manager._defend({"attacker": guard, "defender": None, "modifiers": []}, 1500) == 1500
+
+    # on_damage sees the total before the defender's reductions
+    manager.pending_attacks.append(direct)
+    manager.resolve_attacks(lambda attack, damage: damage + 500)
+    assert defenders.grace_points == 8000 - (1000 + 500 - 600)
+
+    assert manager.remove_damage_modifier(DamageModifier(add=-200), defenders, direct_only=True)
+    assert not manager.remove_damage_modifier(DamageModifier(add=-200), defenders, direct_only=True)
+    assert manager.remove_damage_modifier(DamageModifier(add=-300), defenders)
+    assert manager.remove_damage_modifier(DamageModifier(add=-100), defenders, direct_only=True)
+    assert manager._defend(direct, 1500) == 1500
+    assert not manager._defense_pipelines
+
+def test_modifier_without_apply_is_rejected():
+    manager = CombatManager()
+    with pytest.raises(TypeError):
+        manager.add_damage_modifier(object())
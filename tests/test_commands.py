@@ -0,0 +1,51 @@
+import pytest
+from dataclasses import dataclass
+from game.core.commands import (AdvancePhase, Command, CommandError, DeclareAttack, DrawCard, EndTurn, PlayCard,
+                                command_from_tuple)
+from game.managers.event_manager import EventType
+from game.simulation.policies import GreedyPolicy
+from game.types.enums import Phase
+
+def test_commands_round_trip_as_tuples():
+    for command in (DrawCard(1, 2), PlayCard(0, "MISSION"), DeclareAttack(2), DeclareAttack(0, 1), EndTurn()):
+        assert command_from_tuple(command.to_tuple()) == command
+    with pytest.raises(CommandError):
+        command_from_tuple(("shuffle",))
+
+def test_commands_must_define_validate_and_apply():
+    @dataclass(frozen=True)
+    class Shuffle(Command):
+        def validate(self, engine) -> bool:
+            return True
+
+    for incomplete in (Command, Shuffle):
+        with pytest.raises(TypeError):
+            incomplete()
+
+def test_illegal_commands_change_nothing(engine):
+    version = engine.state_version
+    assert not engine.commands.dispatch(PlayCard(99, "SANCTUARY"))
+    assert not engine.commands.dispatch(DeclareAttack(0))
+    assert engine.state_version == version
+
+def test_only_top_level_commands_are_announced(make_engine):
+    engine = make_engine()
+    applied = []
+    engine.events.subscribe(EventType.COMMAND_APPLIED, applied.append)
+    engine.end_turn()
+    # The new turn's draw is a consequence of ending the turn
+    assert applied == [EndTurn()]
+    assert engine.current_phase == Phase.INVOCATION
+
+def test_replaying_announced_commands_reproduces_the_game(make_engine):
+    engine = make_engine()
+    applied = []
+    engine.events.subscribe(EventType.COMMAND_APPLIED, applied.append)
+    policy = GreedyPolicy()
+    while not engine.game_over and engine.turn_count < 8:
+        policy.play_turn(engine)
+
+    replica = make_engine()
+    assert replica.commands.dispatch_all(applied) == len(applied)
+    assert replica.state_hash() == engine.state_hash()
+    assert any(isinstance(command, AdvancePhase) for command in applied)
@@ -0,0 +1,42 @@
+import random
+from game.core.deck import Deck
+from game.core.player import Player
+from game.core.card import Card
+
+def test_draw_from_top():
+    deck = Deck([1, 2, 3, 4])
+    assert deck.draw() == 1
+    assert deck.draw(2) == [2, 3]
+    assert deck.draw(5) == [4]
+    assert not deck
+
+def test_mill_and_peek():
+    deck = Deck(range(10))
+    assert deck.peek(3) == [0, 1, 2]
+    assert deck.mill(4) == [0, 1, 2, 3]
+    assert len(deck) == 6
+    assert deck.peek() == [4]
+
+def test_seeded_shuffle_is_in_place_and_reproducible():
+    first, second = Deck(range(20)), Deck(range(20))
+    before = first
+    first.shuffle(random.Random(5))
+    second.shuffle(random.Random(5))
+    assert first is before
+    assert list(first) == list(second)
+    assert sorted(first) == list(range(20))
+
+def test_place_cards():
+    deck = Deck([3])
+    deck.place_on_top([1, 2])
+    deck.place_on_bottom([4])
+    assert list(deck) == [1, 2, 3, 4]
+
+def test_player_bulk_draw_and_mill():
+    player = Player("Test Player", [Card(f"Card {i}", "BELIEVER", None) for i in range(10)])
+    assert isinstance(player.deck, Deck)
+    assert player.draw_cards(3) == 3
+    assert player.draw_cards(10) == player.MAX_HAND_SIZE - 3
+    assert player.mill(3) == 3
+    assert len(player.vault) == 3
+    assert len(player.deck) == 2
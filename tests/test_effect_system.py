@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from game.effect_system import Effect, EffectChain, EffectManager, Timing
+
+def recording_effect(name, timing, log, priority=0):
+    return Effect(name, timing, lambda state: True, lambda state: log.append(name), priority)
+
+def test_resolves_only_matching_timing_in_priority_order():
+    log = []
+    manager = EffectManager()
+    manager.activate_effect(recording_effect("low", Timing.START_OF_TURN, log, 0))
+    manager.activate_effect(recording_effect("other", Timing.END_OF_TURN, log, 9))
+    manager.activate_effect(recording_effect("high", Timing.START_OF_TURN, log, 5))
+    manager.activate_effect(recording_effect("low-2", Timing.START_OF_TURN, log, 0))
+    
+    manager.resolve_effects(Timing.START_OF_TURN, SimpleNamespace())
+    assert log == ["high", "low", "low-2"]
+
+def test_shared_effect_registered_twice_and_removed_by_handle():
+    log = []
+    manager = EffectManager()
+    effect = recording_effect("pray", Timing.START_OF_TURN, log)
+    first = manager.activate_effect(effect, source="card a")
+    manager.activate_effect(effect, source="card b")
+    
+    assert manager.deactivate_effect(first)
+    assert not manager.deactivate_effect(first)
+    manager.resolve_effects(Timing.START_OF_TURN, SimpleNamespace())
+    assert log == ["pray"]
+    assert len(manager.active_effects) == 1
+
+def test_chain_keeps_priority_order():
+    log = []
+    chain = EffectChain()
+    for name, priority in [("a", 1), ("b", 3), ("c", 1), ("d", 2)]:
+        chain.add_effect(recording_effect(name, Timing.IMMEDIATE, log, priority))
+    chain.resolve(None)
+    assert log == ["b", "d", "a", "c"]
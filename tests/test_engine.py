@@ -0,0 +1,116 @@
+import subprocess
+import sys
+from game.types.enums import Phase, CardType, Position
+
+def test_engine_is_headless(engine):
+    code = "import sys, game.core.engine; assert 'pygame' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert engine.current_phase == Phase.INVOCATION
+    assert len(engine.players[0].hand) == 4
+
+def test_phase_advancement(engine):
+    engine.advance_phase()
+    assert engine.current_phase == Phase.PREPARATION
+
+def test_turn_passes_to_opponent(engine):
+    for _ in range(5):
+        engine.advance_phase()
+    assert engine.active_player_index == 1
+    assert engine.current_phase == Phase.INVOCATION
+    assert engine.players[1].max_skp == 3
+
+def test_summon_and_direct_attack(engine):
+    player = engine.players[0]
+    believer = next(card for card in player.hand if card.card_type == CardType.BELIEVER)
+    
+    engine.advance_phase()  # PREPARATION
+    engine.advance_phase()  # SUMMONING
+    assert engine.summon_believer(believer)
+    assert believer in player.sanctuary
+    assert player.current_skp == 0
+    
+    engine.advance_phase()  # MISSION
+    assert engine.assign_mission(believer)
+    assert believer.position == Position.PREACHING
+    assert engine.declare_attack(believer)
+    assert not engine.declare_attack(believer)
+    
+    opponent_grace = player.opponent.grace_points
+    engine.advance_phase()  # REFLECTION resolves combat
+    assert player.opponent.grace_points == opponent_grace - believer.faith_points
+
+def test_actions_respect_phase(engine):
+    card = engine.players[0].hand[0]
+    assert not engine.summon_believer(card)
+    assert not engine.play_card(card, "SANCTUARY")
+
+def test_win_by_grace(engine):
+    engine.players[1].grace_points = 0
+    assert engine.check_win_condition()
+    assert engine.winner is engine.players[0]
+
+def test_win_check_only_runs_after_changes(engine):
+    engine.check_win_condition()
+    assert not engine._state_dirty
+
+    # Positions and phases do not affect the win condition
+    engine.players[1].max_skp += 1
+    assert not engine._state_dirty
+
+    engine.players[1].take_damage(engine.players[1].grace_points)
+    assert engine._state_dirty
+    assert engine.check_win_condition()
+    assert engine.winner is engine.players[0]
+
+def test_deck_out_flagged_by_mill_and_discard(engine):
+    player = engine.players[1]
+    player.mill(len(player.deck))
+    player.discard_hand()
+    assert engine.check_win_condition()
+    assert engine.winner is engine.players[0]
+
+def test_legal_actions_follow_phase_and_skp(engine):
+    player = engine.players[0]
+    assert {action.kind for action in engine.legal_actions()} == {"end_phase", "end_turn"}
+
+    engine.advance_phase()  # PREPARATION
+    engine.advance_phase()  # SUMMONING
+    summons = [action for action in engine.legal_actions() if action.kind == "summon"]
+    assert summons
+    assert all(action.card.skp_cost <= player.current_skp for action in summons)
+
+    assert engine.perform(summons[0])
+    engine.advance_phase()  # MISSION
+    assert [action.kind for action in engine.legal_actions()][0] == "assign_mission"
+
+    engine.perform(engine.legal_actions()[0])
+    attacks = [action for action in engine.legal_actions() if action.kind == "attack"]
+    assert attacks == [("attack", summons[0].card, None, None)]
+
+def test_legal_actions_are_memoized_per_version(engine):
+    actions = engine.legal_actions()
+    assert engine.legal_actions() is actions
+
+    engine.advance_phase()
+    assert engine.legal_actions() is not actions
+
+def test_phase_table_links_phases_in_order(engine):
+    spec = engine.phase_manager.table[Phase.INVOCATION]
+    order = []
+    while spec is not None:
+        order.append(spec.phase)
+        spec = spec.next
+    assert order == [Phase.INVOCATION, Phase.PREPARATION, Phase.SUMMONING, Phase.MISSION, Phase.REFLECTION]
+    assert engine.phase_manager.table[Phase.REFLECTION].passive
+
+def test_skipping_empty_phases(make_engine):
+    engine = make_engine()
+    engine.skip_empty_phases = True
+    engine.advance_phase()
+    assert engine.current_phase == Phase.PREPARATION
+    assert not engine.phase_manager.is_idle()
+
+    # The opponent's draw phase offers nothing to do, so it is passed through
+    engine.end_turn()
+    assert engine.active_player_index == 1
+    assert engine.current_phase == Phase.PREPARATION
@@ -0,0 +1,53 @@
+import pickle
+from game.managers.event_manager import EventBus, EventType
+from game.types.enums import Phase
+
+def test_publish_reaches_only_its_topic():
+    bus = EventBus()
+    seen = []
+    bus.subscribe(EventType.PHASE_CHANGED, lambda phase: seen.append(phase))
+    bus.publish(EventType.PHASE_CHANGED, Phase.MISSION)
+    bus.publish(EventType.COMBAT_RESOLVED)
+    assert seen == [Phase.MISSION]
+
+def test_post_without_subscribers_is_dropped():
+    bus = EventBus()
+    bus.post(EventType.GRACE_CHANGED, None, 1, 2)
+    assert not bus.has_subscribers(EventType.GRACE_CHANGED)
+    assert bus.flush() == 0
+
+def test_deferred_and_batched_dispatch():
+    bus = EventBus()
+    seen, batches = [], []
+    bus.subscribe(EventType.CARD_DRAWN, lambda player, card: seen.append(card))
+    bus.subscribe_batch(EventType.CARD_DRAWN, batches.append)
+
+    bus.post(EventType.CARD_DRAWN, "p1", "a")
+    bus.publish(EventType.CARD_DRAWN, "p1", "b")
+    assert seen == ["b"]
+
+    assert bus.flush() == 2
+    assert seen == ["b", "a"]
+    assert batches == [[("p1", "a"), ("p1", "b")]]
+
+def test_unsubscribe():
+    bus = EventBus()
+    seen = []
+    handler = bus.subscribe(EventType.GAME_OVER, seen.append)
+    bus.unsubscribe(EventType.GAME_OVER, handler)
+    bus.publish(EventType.GAME_OVER, "winner")
+    assert seen == []
+
+def test_engine_publishes_state_changes(engine):
+    seen = []
+    engine.events.subscribe(EventType.PHASE_CHANGED, seen.append)
+    engine.events.subscribe(EventType.GRACE_CHANGED, lambda player, old, new: seen.append(new))
+    engine.advance_phase()
+    engine.players[1].take_damage(100)
+    assert seen == [Phase.PREPARATION, engine.players[1].grace_points]
+
+def test_snapshots_do_not_carry_subscribers(engine):
+    engine.events.subscribe(EventType.PHASE_CHANGED, print)
+    copy = pickle.loads(pickle.dumps(engine))
+    assert not copy.events.has_subscribers(EventType.PHASE_CHANGED)
+    assert copy.players[0].events is copy.events
@@ -0,0 +1,81 @@
+import pickle
+from dataclasses import asdict
+from game.simulation.policies import GreedyPolicy
+from game.state.game_state_manager import GameState, GameStateManager
+
+def record_game(engine, manager, actions=200):
+    """Save a state after every action of a greedy game; returns the states"""
+    states = [GameState.from_engine(engine)]
+    manager.save_state(states[-1])
+    policy = GreedyPolicy()
+    while not engine.game_over and len(states) < actions:
+        action = engine.legal_actions()[0]
+        if action.kind == "end_turn":
+            policy.play_turn(engine)
+        else:
+            engine.perform(action)
+        states.append(GameState.from_engine(engine))
+        manager.save_state(states[-1])
+    return states
+
+def test_undo_and_redo_walk_the_history(make_engine):
+    manager = GameStateManager(keyframe_interval=8)
+    states = record_game(make_engine(), manager)
+
+    for expected in reversed(states[:-1]):
+        assert manager.undo() == expected
+    assert manager.undo() is None
+
+    for expected in states[1:]:
+        assert manager.redo() == expected
+    assert manager.redo() is None
+    assert manager.state_at(len(states) // 2) == states[len(states) // 2]
+
+def test_deltas_are_smaller_than_full_copies(make_engine):
+    manager = GameStateManager(keyframe_interval=32)
+    states = record_game(make_engine(), manager)
+    full_copies = sum(len(pickle.dumps(asdict(state))) for state in states)
+    assert manager.history_bytes * 4 < full_copies
+
+def test_saving_after_undo_drops_redo(make_engine):
+    manager = GameStateManager()
+    states = record_game(make_engine(), manager, actions=5)
+    manager.undo()
+    manager.undo()
+    manager.save_state(states[0])
+    assert manager.redo() is None
+    assert len(manager) == len(states) - 1
+
+def test_byte_cap_drops_oldest_segments(make_engine):
+    manager = GameStateManager(max_bytes=4000, keyframe_interval=4)
+    states = record_game(make_engine(), manager)
+    assert manager.history_bytes <= 4000 + 2 * len(pickle.dumps(asdict(states[0])))
+    assert len(manager) < len(states)
+
+    retained = states[-len(manager):]
+    assert list(manager.states()) == retained
+    while manager.undo() is not None:
+        pass
+    assert manager.redo() == retained[1]
+
+def test_snapshots_share_unchanged_zones(make_engine):
+    engine = make_engine()
+    before = GameState.from_engine(engine)
+    engine.players[0].discard(0)
+    after = GameState.from_engine(engine)
+
+    assert after.players[1] is before.players[1]
+    assert after.players[0]["deck"] is before.players[0]["deck"]
+    assert after.players[0]["hand"] == before.players[0]["hand"][1:]
+    assert GameState.from_engine(engine).players[0] is after.players[0]
+
+def test_snapshots_match_the_engine(make_engine):
+    engine = make_engine()
+    manager = GameStateManager()
+    record_game(engine, manager)
+    state = GameState.from_engine(engine).to_dict()
+    for player, record in zip(engine.players, state["players"]):
+        assert record["hand"] == [card.name for card in player.hand]
+        assert record["deck"] == [card.name for card in player.deck]
+        assert record["sanctuary"] == [[card.name, card.position.name] for card in player.sanctuary]
+        assert record["vault"] == [card.name for card in player.vault]
@@ -0,0 +1,132 @@
+import time
+import pytest
+from game.core.commands import EndTurn
+from game.network.lockstep import DesyncError, LockstepSession, replay_inputs
+from game.network.network_manager import NetworkManager
+from game.network.protocol import decode_message, encode_message
+from game.simulation.policies import GreedyPolicy
+
+class Link:
+    """One peer's end of an in-memory connection, through the wire encoding"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.peer = None
+        self.inbox = []
+        self.bytes = 0
+
+    def register_handler(self, action_type, handler):
+        self.handlers[action_type] = handler
+
+    def send_game_action(self, action_data):
+        payload = encode_message(action_data)
+        self.bytes += len(payload)
+        self.peer.inbox.append(payload)
+
+    def process_messages(self):
+        while self.inbox:
+            message = decode_message(self.inbox.pop(0))
+            handler = self.handlers.get(message["action"])
+            if handler is not None:
+                handler(message)
+
+def start_match(make_engine, **kwargs):
+    links = Link(), Link()
+    links[0].peer, links[1].peer = links[1], links[0]
+    joined = []
+    LockstepSession.join(links[1], make_engine, joined.append, **kwargs)
+    host = LockstepSession.host(links[0], make_engine, **kwargs)
+    links[1].process_messages()
+    links[0].process_messages()
+    return (host, joined[0]), links
+
+def play_turns(sessions, links, turns):
+    policy = GreedyPolicy()
+    for _ in range(turns):
+        active = next((session for session in sessions if session.our_turn), None)
+        if active is None:
+            return
+        policy.play_turn(active.engine)
+        for link in links:
+            link.process_messages()
+
+def test_peers_play_the_same_match_from_inputs_alone(make_engine):
+    (host, guest), links = start_match(make_engine)
+    assert host.seed == guest.seed and (host.seat, guest.seat) == (0, 1)
+    play_turns((host, guest), links, 40)
+
+    assert host.engine.game_over and guest.engine.game_over
+    assert host.desync is None and guest.desync is None
+    assert host.checksums == guest.checksums and host.turn == guest.turn > 2
+    assert host.inputs == guest.inputs
+    assert {seat for _, seat, _ in host.inputs} == {0, 1}
+    # A few bytes per action and per turn
+    assert sum(link.bytes for link in links) < 8 * len(host.inputs) + 32 * host.turn + 64
+
+    # The seed and input log reproduce the match
+    engine = make_engine(host.seed)
+    assert replay_inputs(engine, host.inputs) == host.turn
+    assert engine.state_hash() == host.engine.state_hash()
+
+def test_diverging_state_is_reported_with_its_turn(make_engine):
+    reports = []
+    (host, guest), links = start_match(make_engine, on_desync=reports.append)
+    play_turns((host, guest), links, 2)
+    assert reports == []
+
+    guest.engine.players[0].take_damage(1)
+    play_turns((host, guest), links, 1)
+    links[0].process_messages()
+    # Both ends see it at the first turn change after the damage
+    assert [report.turn for report in reports] == [3, 3]
+    assert host.desync is not None and "turn 3" in str(host.desync)
+
+def test_illegal_or_out_of_turn_inputs_are_desyncs(make_engine):
+    (host, guest), links = start_match(make_engine)
+    assert not guest.submit(EndTurn())
+    # An attack with no attacker can never be legal
+    links[0].send_game_action({"action": "attack", "attacker": 9, "defender": None})
+    with pytest.raises(DesyncError, match="turn 0"):
+        links[1].process_messages()
+
+    (host, guest), links = start_match(make_engine)
+    links[1].send_game_action({"action": "end_turn"})
+    with pytest.raises(DesyncError, match="on our turn"):
+        links[0].process_messages()
+
+def test_lockstep_over_network_managers(make_engine):
+    host_network = NetworkManager("127.0.0.1", 0)
+    host_network.start_server()
+    guest_network = NetworkManager("127.0.0.1", host_network.port)
+    guest_network.connect_to_server()
+    networks = (host_network, guest_network)
+    try:
+        joined = []
+        LockstepSession.join(guest_network, make_engine, joined.append)
+        # The server learns of the guest's connection asynchronously
+        deadline = time.monotonic() + 5
+        while host_network._endpoint.connections < 1:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+        host = LockstepSession.host(host_network, make_engine)
+
+        policy = GreedyPolicy()
+        sessions = [host]
+        while not (joined and host.engine.game_over and len(joined[0].inputs) == len(host.inputs)):
+            assert time.monotonic() < deadline, "timed out"
+            for network in networks:
+                network.flush()
+                network.process_messages()
+            sessions = [host] + joined
+            active = next((session for session in sessions if session.our_turn), None)
+            # Act only once the other side has caught up
+            if active is not None and len(sessions) == 2 and sessions[0].turn == sessions[1].turn:
+                policy.play_turn(active.engine)
+            time.sleep(0.005)
+        guest = joined[0]
+        assert host.desync is None and guest.desync is None
+        assert guest.engine.state_hash() == host.engine.state_hash()
+        assert host.inputs == guest.inputs
+    finally:
+        guest_network.stop()
+        host_network.stop()
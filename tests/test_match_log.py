@@ -0,0 +1,111 @@
+import os
+import pytest
+from game.state import codec
+from game.state.game_state_manager import GameState, GameStateManager
+from game.state.match_log import LogFormatError, MatchLog, RecordKind, SyncPolicy, read_records
+from game.state.persistent import MISSING, freeze
+
+def record_game(engine, manager, actions):
+    """Save a state after each of the first `actions` legal actions; returns the states"""
+    states = [GameState.from_engine(engine)]
+    manager.save_state(states[-1])
+    while not engine.game_over and len(states) < actions:
+        engine.perform(engine.legal_actions()[0])
+        states.append(GameState.from_engine(engine))
+        manager.save_state(states[-1])
+    return states
+
+def test_codec_round_trips_state_values():
+    value = freeze({"names": ["Angel", "Angel", "Prophet"], "grace": -250, "ratio": 1.5,
+                    "flags": (True, False, None), "big": 1 << 70, "gone": MISSING, 3: "int key"})
+    data = codec.encode(value)
+    assert codec.decode(data) == value
+    assert codec.decode(memoryview(data)) == value
+    # Repeated strings are back-references
+    assert data.count(b"Angel") == 1
+
+def test_codec_rejects_corrupt_data():
+    with pytest.raises(codec.CodecError):
+        codec.decode(codec.encode(("a", 1))[:-1])
+    with pytest.raises(codec.CodecError):
+        codec.decode(b"\xff")
+
+def test_log_replays_history_with_undo(make_engine, tmp_path):
+    path = tmp_path / "match.log"
+    manager = GameStateManager(keyframe_interval=8, log=MatchLog(path, SyncPolicy.NEVER))
+    states = record_game(make_engine(), manager, actions=40)
+    manager.undo()
+    manager.undo()
+    manager.save_state(states[0])
+    manager.log.close()
+
+    restored = GameStateManager.from_log(path)
+    assert restored.keyframe_interval == 8
+    assert list(restored.states()) == list(manager.states())
+    assert restored.undo() == manager.state_at(manager.current_index - 1)
+    restored.log.close()
+
+def test_appending_costs_only_the_change(make_engine, tmp_path):
+    path = tmp_path / "match.log"
+    engine = make_engine()
+    with MatchLog(path, SyncPolicy.ALWAYS) as log:
+        manager = GameStateManager(log=log)
+        record_game(engine, manager, actions=1)
+        keyframe = os.path.getsize(path)
+        engine.perform(engine.legal_actions()[0])
+        manager.save_state(GameState.from_engine(engine))
+        assert os.path.getsize(path) - keyframe < keyframe // 4
+
+def test_torn_tail_is_ignored_and_truncated(make_engine, tmp_path):
+    path = tmp_path / "match.log"
+    with MatchLog(path) as log:
+        states = record_game(make_engine(), GameStateManager(log=log), actions=10)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    kinds = [kind for kind, _ in read_records(path)]
+    assert kinds[:2] == [RecordKind.META, RecordKind.KEYFRAME]
+    assert len(kinds) == len(states)
+
+    # Resuming drops the torn record and keeps appending
+    manager = GameStateManager.from_log(path)
+    assert manager.state_at(len(manager) - 1) == states[-2]
+    manager.save_state(states[-1])
+    manager.log.close()
+    assert list(GameStateManager.from_log(path).states()) == states
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "deck.json"
+    path.write_text("[]")
+    with pytest.raises(LogFormatError):
+        list(read_records(path))
+
+def test_log_replays_trimmed_history(make_engine, tmp_path):
+    path = tmp_path / "match.log"
+    manager = GameStateManager(max_bytes=1500, keyframe_interval=4, log=MatchLog(path, SyncPolicy.NEVER))
+    states = record_game(make_engine(), manager, actions=60)
+    manager.log.close()
+    assert len(manager) < len(states)
+
+    restored = GameStateManager.from_log(path)
+    assert restored.history_bytes == manager.history_bytes
+    assert restored.current_index == manager.current_index
+    assert list(restored.states()) == list(manager.states())
+    restored.log.close()
+
+def test_log_keeps_trailing_undo_and_redo(make_engine, tmp_path):
+    path = tmp_path / "match.log"
+    manager = GameStateManager(keyframe_interval=8, log=MatchLog(path, SyncPolicy.NEVER))
+    states = record_game(make_engine(), manager, actions=20)
+    manager.undo()
+    manager.undo()
+    manager.undo()
+    manager.redo()
+    manager.log.close()
+
+    restored = GameStateManager.from_log(path)
+    assert restored.current_index == len(states) - 3
+    assert restored.redo() == states[-2]
+    restored.seek(5)
+    restored.log.close()
+    assert GameStateManager.from_log(path).redo() == states[6]
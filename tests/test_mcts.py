@@ -0,0 +1,95 @@
+import pickle
+import random
+import time
+from game.ai.mcts import MCTS, AIController, Node, run_iterations
+from game.core.engine import END_PHASE
+from game.simulation.policies import GreedyPolicy
+from game.types.enums import Phase
+
+def advance_to_choice(engine):
+    engine.advance_phase()  # PREPARATION
+    engine.advance_phase()  # SUMMONING; believers can be summoned
+
+def test_search_returns_legal_action_within_budget(make_engine):
+    engine = make_engine()
+    advance_to_choice(engine)
+    mcts = MCTS(budget_ms=50, seed=0)
+
+    start = time.perf_counter()
+    action = mcts.choose(engine)
+    assert time.perf_counter() - start < 0.5
+    assert action in engine.legal_actions()
+
+def test_tree_is_reused_after_move(make_engine):
+    engine = make_engine()
+    advance_to_choice(engine)
+    mcts = MCTS(budget_ms=50, seed=0)
+
+    engine.perform(mcts.choose(engine))
+    kept = mcts.root
+    assert kept is not None and kept.visits > 0
+    assert mcts._reuse(engine) is kept
+
+def test_tree_is_reused_across_empty_phases(make_engine):
+    engine = make_engine()
+    advance_to_choice(engine)
+    mcts = MCTS(budget_ms=50, seed=0)
+    root = Node()
+    run_iterations(root, pickle.dumps(engine), time.perf_counter() + 0.05, random.Random(0))
+    passed = next(child for child in root.children if child.key == engine.action_key(END_PHASE))
+
+    # The live game stops in the empty mission phase; the search passed through it
+    engine.perform(END_PHASE)
+    assert not engine.skip_empty_phases and engine.phase_manager.is_idle()
+    mcts.root = root
+    assert mcts._reuse(engine) is passed
+
+def test_root_parallel_search(make_engine):
+    engine = make_engine()
+    advance_to_choice(engine)
+    mcts = MCTS(budget_ms=50, workers=2, seed=0)
+    try:
+        assert mcts.choose(engine) in engine.legal_actions()
+    finally:
+        mcts.close()
+
+def test_beats_greedy_policy(make_engine):
+    engine = make_engine(seed=3)
+    mcts, greedy = MCTS(budget_ms=20, seed=0), GreedyPolicy()
+    while not engine.game_over and engine.turn_count < 30:
+        if engine.active_player_index == 0:
+            engine.perform(mcts.choose(engine))
+        else:
+            greedy.play_turn(engine)
+    assert engine.winner is engine.players[0]
+
+def test_controller_searches_in_background(make_engine):
+    engine = make_engine()
+    controller = AIController(player_index=0, mcts=MCTS(budget_ms=20, seed=0))
+    try:
+        deadline = time.perf_counter() + 5
+        while engine.current_phase.name != "MISSION" and time.perf_counter() < deadline:
+            # poll() never blocks; it hands back an action once one is ready
+            start = time.perf_counter()
+            action = controller.poll(engine)
+            assert time.perf_counter() - start < 0.01
+            if action is not None:
+                engine.perform(action)
+            time.sleep(0.001)
+        assert engine.current_phase.name == "MISSION"
+    finally:
+        controller.close()
+
+def test_pickled_engine_remembers_attacks(make_engine):
+    engine = make_engine()
+    preference = ("attack", "assign_mission", "summon", "play_card", "end_phase")
+    # Act one step at a time until a believer has attacked
+    while not engine.attacked_this_turn:
+        assert not engine.game_over
+        engine.perform(min(engine.legal_actions(), key=lambda action: preference.index(action.kind)
+                           if action.kind in preference else len(preference)))
+    assert engine.current_phase == Phase.MISSION
+
+    copy = pickle.loads(pickle.dumps(engine))
+    assert [engine.action_key(action) for action in engine.legal_actions()] == \
+        [copy.action_key(action) for action in copy.legal_actions()]
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from game.network.network_manager import NetworkManager
+from game.network.transport import HEADER, GameClient, GameServer, encode_frame, encode_message
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+def test_frames_survive_splitting_and_coalescing():
+    async def scenario():
+        received = []
+        server = GameServer(on_message=lambda message, connection: received.append(message))
+        port = await server.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        # Two frames in one write, then one frame a byte at a time
+        writer.write(encode_frame(encode_message({"action": "a"})) + encode_frame(encode_message({"action": "b"})))
+        for byte in encode_frame(encode_message({"action": "c", "text": "x" * 5000})):
+            writer.write(bytes([byte]))
+        await writer.drain()
+        await _wait_for(lambda: len(received) == 3)
+        assert [message["action"] for message in received] == ["a", "b", "c"]
+
+        # An oversized length closes just that connection
+        writer.write(HEADER.pack(1 << 30))
+        await writer.drain()
+        assert await reader.read() == b""
+        await server.close()
+    asyncio.run(scenario())
+
+def test_one_loop_relays_many_matches():
+    async def scenario():
+        server = GameServer()
+        port = await server.start("127.0.0.1", 0)
+        clients = []
+        inboxes = []
+        for index in range(400):
+            inbox = []
+            client = GameClient(on_message=inbox.append)
+            await client.connect("127.0.0.1", port, match=f"match-{index // 2}")
+            clients.append(client)
+            inboxes.append(inbox)
+        tasks = [asyncio.ensure_future(client.run()) for client in clients]
+        await _wait_for(lambda: len(server.matches) == 200)
+
+        for index, client in enumerate(clients):
+            client.send_game_action({"action": "play_card", "seat": index})
+        # Each player hears only their opponent
+        await _wait_for(lambda: all(inboxes))
+        for index, inbox in enumerate(inboxes):
+            assert inbox == [{"action": "play_card", "seat": index ^ 1}]
+
+        for client in clients:
+            await client.close()
+        await asyncio.gather(*tasks)
+        await server.close()
+    asyncio.run(scenario())
+
+def test_binary_and_json_clients_share_a_match():
+    async def scenario():
+        server = GameServer()
+        port = await server.start("127.0.0.1", 0)
+        inboxes = ([], [])
+        clients = [GameClient(on_message=inboxes[0].append), GameClient(on_message=inboxes[1].append, binary=False)]
+        for client in clients:
+            await client.connect("127.0.0.1", port, match="mixed")
+        tasks = [asyncio.ensure_future(client.run()) for client in clients]
+        await _wait_for(lambda: server.connections == 2 and "mixed" in server.matches)
+
+        clients[0].send_game_action({"action": "attack", "attacker": 1, "defender": None})
+        clients[1].send_game_action({"action": "play_card", "card": 2, "zone": "MISSION"})
+        await _wait_for(lambda: all(inboxes))
+        assert inboxes[1] == [{"action": "attack", "attacker": 1, "defender": None}]
+        assert inboxes[0] == [{"action": "play_card", "card": 2, "zone": "MISSION"}]
+
+        for client in clients:
+            await client.close()
+        await asyncio.gather(*tasks)
+        await server.close()
+    asyncio.run(scenario())
+
+def test_sends_in_one_tick_share_one_write():
+    async def scenario():
+        server = GameServer()
+        port = await server.start("127.0.0.1", 0)
+        inbox = []
+        sender, receiver = GameClient(flush_delay=0.05), GameClient(on_message=inbox.append)
+        for client in (sender, receiver):
+            await client.connect("127.0.0.1", port)
+        tasks = [asyncio.ensure_future(client.run()) for client in (sender, receiver)]
+        await _wait_for(lambda: server.connections == 2)
+
+        writes = []
+        writelines = sender.connection.writer.writelines
+        sender.connection.writer.writelines = lambda data: writes.append(len(data)) or writelines(data)
+        for card in range(20):
+            sender.send_game_action({"action": "summon", "card": card})
+        # Held until the deadline or a flush
+        await asyncio.sleep(0.01)
+        assert writes == [] and inbox == []
+        sender.flush()
+        assert writes == [40]
+        await _wait_for(lambda: len(inbox) == 20)
+        assert [message["card"] for message in inbox] == list(range(20))
+
+        # Urgent messages skip the wait; others still go by the deadline
+        sender.send_game_action({"action": "end_turn"}, urgent=True)
+        sender.send_game_action({"action": "end_phase"})
+        assert writes == [40, 2]
+        await _wait_for(lambda: len(inbox) == 22)
+        assert writes == [40, 2, 2]
+
+        for client in (sender, receiver):
+            await client.close()
+        await asyncio.gather(*tasks)
+        await server.close()
+    asyncio.run(scenario())
+
+def test_network_manager_keeps_its_api():
+    host = NetworkManager("127.0.0.1", 0)
+    host.start_server()
+    client = NetworkManager("127.0.0.1", host.port)
+    client.connect_to_server()
+    try:
+        seen = []
+        host.register_handler("end_turn", seen.append)
+        client.register_handler("end_turn", seen.append)
+
+        client.send_game_action({"action": "end_turn", "from": "client"})
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            host.process_messages()
+            time.sleep(0.01)
+        host.send_game_action({"action": "end_turn", "from": "host"})
+        while len(seen) < 2 and time.monotonic() < deadline:
+            client.process_messages()
+            time.sleep(0.01)
+        assert seen == [{"action": "end_turn", "from": "client"}, {"action": "end_turn", "from": "host"}]
+    finally:
+        client.stop()
+        host.stop()
@@ -0,0 +1,54 @@
+import pickle
+import random
+from game.state.persistent import PMap, freeze, get_in, set_in, thaw
+
+class Clash:
+    """Key with few distinct hashes, to exercise collision nodes"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, Clash) and other.value == self.value
+
+def test_pmap_matches_dict_under_random_updates():
+    rng = random.Random(5)
+    current, reference, versions = PMap(), {}, []
+    for _ in range(2000):
+        key = rng.choice([rng.randrange(500), Clash(rng.randrange(20)), rng.randrange(1 << 70)])
+        versions.append((current, dict(reference)))
+        if reference and rng.random() < 0.3:
+            key = rng.choice(list(reference))
+            current = current.delete(key)
+            del reference[key]
+        else:
+            current = current.set(key, rng.random())
+            reference[key] = current[key]
+        assert len(current) == len(reference)
+
+    assert dict(current.items()) == reference
+    # Older versions are untouched
+    for version, expected in versions[::50]:
+        assert dict(version.items()) == expected
+
+def test_unchanged_updates_return_the_same_map():
+    value = ("a", "b")
+    original = PMap({"zone": value, "other": 1})
+    assert original.set("zone", value) is original
+    assert original.set("other", 2) == PMap({"zone": value, "other": 2})
+
+def test_set_in_copies_only_the_path():
+    state = freeze({"players": [{"hand": ["A"]}, {"hand": ["B"]}], "turn": 1})
+    updated = set_in(state, ("players", 1, "hand"), ("B", "C"))
+
+    assert get_in(updated, ("players", 1, "hand")) == ("B", "C")
+    assert get_in(state, ("players", 1, "hand")) == ("B",)
+    assert updated["players"][0] is state["players"][0]
+    assert thaw(set_in(updated, ("turn",))) == {"players": [{"hand": ["A"]}, {"hand": ["B", "C"]}]}
+
+def test_pmap_pickles():
+    state = freeze({"a": [1, 2], "b": {"c": None}})
+    assert pickle.loads(pickle.dumps(state)) == state
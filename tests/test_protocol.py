@@ -0,0 +1,40 @@
+import json
+import pytest
+from game.core.commands import (AdvancePhase, AssignMission, DeclareAttack, DrawCard, EndTurn,
+                                PlayCard, SummonBeliever)
+from game.network.protocol import (ProtocolError, command_message, decode_message, encode_message,
+                                   is_binary, message_command)
+
+COMMANDS = [DrawCard(1, 2), PlayCard(3, "MISSION"), PlayCard(0, "SANCTUARY"), SummonBeliever(4),
+            AssignMission(5), DeclareAttack(0, 2), DeclareAttack(1), AdvancePhase(), EndTurn()]
+
+@pytest.mark.parametrize("command", COMMANDS, ids=lambda command: command.kind)
+def test_every_command_round_trips_in_a_few_bytes(command):
+    message = command_message(command)
+    payload = encode_message(message)
+    assert is_binary(payload)
+    assert len(payload) <= 4
+    assert len(payload) * 5 < len(encode_message(message, binary=False))
+    assert decode_message(payload) == message
+    assert message_command(decode_message(payload)) == command
+
+def test_json_fallback_for_debugging_and_other_messages():
+    message = command_message(PlayCard(3, "MISSION"))
+    payload = encode_message(message, binary=False)
+    assert json.loads(payload) == message
+    assert decode_message(payload) == message
+
+    # Out of vocabulary, out of range or extra fields: sent as JSON
+    for message in ({"action": "join", "match": "m1"}, {"action": "summon", "card": 300},
+                    {"action": "summon", "card": 1, "note": "hi"}, {"action": "play_card", "card": 1, "zone": "VAULT"}):
+        payload = encode_message(message)
+        assert not is_binary(payload)
+        assert decode_message(payload) == message
+
+def test_unknown_versions_and_opcodes_are_rejected():
+    for payload in (b"", b"\x02\x01\x00\x01", b"\x01\x63", b"\x01\x03", b"\x01\x03\x00\x00", b"[1]",
+                    b"\x01\x10\xff", b"\x01\x12\x03\x02"):
+        with pytest.raises(ProtocolError):
+            decode_message(payload)
+    with pytest.raises(ProtocolError):
+        message_command({"action": "join"})
@@ -0,0 +1,52 @@
+import pytest
+from game.simulation.batch_runner import replay_name, run_batch
+from game.simulation.policies import GreedyPolicy
+from game.state.game_state_manager import GameState
+from game.state.match_log import LogFormatError
+from game.state.replay_file import ReplayFile, write_replay
+
+def play_game(engine, turns=12):
+    """States after every greedy turn"""
+    states = [GameState.from_engine(engine)]
+    policy = GreedyPolicy()
+    while not engine.game_over and engine.turn_count <= turns:
+        policy.play_turn(engine)
+        states.append(GameState.from_engine(engine))
+    return states
+
+def test_seeking_matches_the_recorded_states(make_engine, tmp_path):
+    states = play_game(make_engine())
+    path = tmp_path / "match.replay"
+    assert write_replay(path, states, keyframe_interval=4) == len(states)
+
+    with ReplayFile(path) as replay:
+        assert len(replay) == len(states)
+        for index in reversed(range(len(states))):
+            assert replay.state(index) == states[index]
+        assert replay.state(-1) == states[-1]
+        assert list(replay.states(3)) == states[3:]
+
+        turn = states[5].turn_number
+        assert replay.turn(5) == turn
+        assert replay.seek_turn(turn) == next(state for state in states if state.turn_number == turn)
+
+def test_rejects_files_without_an_index(make_engine, tmp_path):
+    path = tmp_path / "match.replay"
+    write_replay(path, play_game(make_engine(), turns=2))
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    with pytest.raises(LogFormatError):
+        ReplayFile(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(LogFormatError):
+        ReplayFile(path)
+
+def test_batch_runs_can_save_replays(tmp_path):
+    decks = ("assets/decks/player1_deck.json", "assets/decks/player2_deck.json")
+    [stats] = run_batch([decks], games=2, base_seed=4, workers=1, replay_dir=str(tmp_path))
+    assert stats.games == 2
+    for seed in (4, 5):
+        with ReplayFile(tmp_path / replay_name(0, seed)) as replay:
+            assert replay.state(0).turn_number == 1
+            assert len(replay) > 1
@@ -0,0 +1,71 @@
+import random
+from game.managers.event_manager import EventType
+from game.simulation.policies import GreedyPolicy
+from game.state import game_state_manager, replay_file
+from game.state.game_state_manager import GameState
+from game.state.replay_file import write_replay
+from game.state.replay_player import ReplayPlayer
+
+def record(engine, checkpoint_interval):
+    replay = ReplayPlayer(checkpoint_interval)
+    replay.record(engine)
+    states = [GameState.from_engine(engine)]
+    engine.events.subscribe(EventType.COMMAND_APPLIED,
+                            lambda command: states.append(GameState.from_engine(engine)))
+    policy = GreedyPolicy()
+    while not engine.game_over and engine.turn_count <= 10:
+        policy.play_turn(engine)
+    replay.stop()
+    return replay, states
+
+def test_seeking_reaches_every_recorded_state(make_engine):
+    replay, states = record(make_engine(), checkpoint_interval=8)
+    assert len(replay) == len(states)
+    assert replay.commands[0] is None and replay.commands[1] is not None
+
+    rng = random.Random(3)
+    for index in rng.sample(range(len(states)), 40) + [0, len(states) - 1]:
+        assert replay.seek(index) == states[index]
+        assert replay.index == index
+    assert replay.seek(len(states) + 5) == states[-1]
+
+def test_seeks_decode_at_most_one_interval(make_engine, monkeypatch):
+    replay, states = record(make_engine(), checkpoint_interval=8)
+    applied = []
+    original = game_state_manager.apply_delta
+    monkeypatch.setattr(game_state_manager, "apply_delta",
+                        lambda *args, **kwargs: applied.append(1) or original(*args, **kwargs))
+    for index in (len(states) - 1, 3, len(states) // 2, 0):
+        applied.clear()
+        replay.seek(index)
+        assert len(applied) <= 8
+
+def test_seek_turn_and_loading_replay_files(make_engine, tmp_path):
+    _, states = record(make_engine(), checkpoint_interval=8)
+    write_replay(tmp_path / "match.replay", states, keyframe_interval=4)
+
+    replay = ReplayPlayer.from_file(tmp_path / "match.replay")
+    assert replay.index == 0 and replay.checkpoint_interval == 4
+    assert replay.seek_turn(3).turn_number == 3
+    assert replay.step(-1).turn_number == 2
+    assert replay.seek_fraction(1.0) == states[-1]
+    replay.close()
+
+def test_replay_files_decode_only_what_is_visited(make_engine, tmp_path, monkeypatch):
+    recorded, states = record(make_engine(), checkpoint_interval=8)
+    assert recorded.save(tmp_path / "match.replay") == len(states)
+
+    applied = []
+    original = replay_file.apply_delta
+    monkeypatch.setattr(replay_file, "apply_delta",
+                        lambda *args, **kwargs: applied.append(1) or original(*args, **kwargs))
+    replay = ReplayPlayer.from_file(tmp_path / "match.replay")
+    assert len(replay) == len(states) and not applied
+    assert replay.seek(len(states) - 1) == states[-1]
+    assert len(applied) < 8
+
+    replay.seek(13)
+    applied.clear()
+    assert replay.step() == states[14] and replay.state == states[14]
+    assert len(applied) == 1
+    replay.close()
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from game.managers.event_manager import EventType
+from game.network.protocol import decode_message, encode_message
+from game.network.state_sync import StateSyncClient, StateSyncHost, checksum
+from game.network.transport import GameClient, GameServer
+from game.simulation.policies import GreedyPolicy
+from game.state.game_state_manager import GameState, _freeze_state
+
+class Wire:
+    """In-order delivery through the real encoding, with a byte count"""
+
+    def __init__(self):
+        self.targets = []
+        self.bytes = 0
+        self.drop_next = False
+
+    def send(self, message):
+        payload = encode_message(message)
+        self.bytes += len(payload)
+        if self.drop_next:
+            self.drop_next = False
+            return
+        for target in self.targets:
+            target(decode_message(payload))
+
+def connect(host, client, wire):
+    handlers = {"state_snapshot": client.on_snapshot, "state_delta": client.on_delta}
+    wire.targets.append(lambda message: handlers[message["action"]](message))
+    client.send = lambda message: host.on_resync(decode_message(encode_message(message)))
+
+def play(engine, turns, publish):
+    """Play turns, publishing the state after every command"""
+    def on_command(command):
+        publish(GameState.from_engine(engine))
+    engine.events.subscribe(EventType.COMMAND_APPLIED, on_command)
+    policy = GreedyPolicy()
+    for _ in range(turns):
+        if engine.game_over:
+            break
+        policy.play_turn(engine)
+    engine.events.unsubscribe(EventType.COMMAND_APPLIED, on_command)
+
+def test_peers_follow_the_host_from_deltas(make_engine):
+    engine = make_engine()
+    wire = Wire()
+    host = StateSyncHost(wire.send, resync_interval=0)
+    client = StateSyncClient(None)
+    connect(host, client, wire)
+
+    host.publish(GameState.from_engine(engine))
+    snapshot_bytes = wire.bytes
+    checks = []
+    play(engine, 12, lambda state: (host.publish(state), checks.append(client.state == state)))
+    assert checks and all(checks)
+    assert client.resyncs == 0 and client.tick == host.tick
+    # Incremental checksums match a full rehash, and deltas are much smaller than snapshots
+    assert client.checksum == checksum(_freeze_state(client.state))
+    assert (wire.bytes - snapshot_bytes) / (host.tick - 1) < snapshot_bytes / 4
+
+def test_late_join_and_desync_recover_in_one_round_trip(make_engine):
+    engine = make_engine()
+    wire = Wire()
+    host = StateSyncHost(wire.send, resync_interval=0)
+    play(engine, 1, host.publish)
+
+    # A late joiner asks once and gets the current state, not the history
+    late = StateSyncClient(None)
+    connect(host, late, wire)
+    late.request_resync()
+    assert late.in_sync and late.state == GameState.from_engine(engine)
+
+    # A lost delta is noticed at the next one
+    wire.drop_next = True
+    play(engine, 1, host.publish)
+    assert late.resyncs == 2 and late.state == GameState.from_engine(engine)
+
+    # So is drift in a value the next delta changes; periodic snapshots catch the rest
+    late._state = late._state.set("current_phase", "NOT_A_PHASE")
+    play(engine, 1, host.publish)
+    assert not engine.game_over
+    assert late.resyncs == 3 and late.state == GameState.from_engine(engine)
+
+def test_periodic_snapshots(make_engine):
+    engine = make_engine()
+    kinds = []
+    host = StateSyncHost(lambda message: kinds.append(message["action"]), resync_interval=4)
+    play(engine, 12, host.publish)
+    assert kinds[0] == "state_snapshot"
+    ticks = [index + 1 for index, kind in enumerate(kinds) if kind == "state_snapshot"]
+    assert ticks == [1] + list(range(4, len(kinds) + 1, 4))
+
+def test_sync_over_the_transport(make_engine):
+    async def scenario():
+        server = GameServer()
+        port = await server.start("127.0.0.1", 0)
+        host_endpoint, peer_endpoint = GameClient(), GameClient()
+        host = StateSyncHost(host_endpoint.send_game_action)
+        peer = StateSyncClient(peer_endpoint.send_game_action)
+        host.register(host_endpoint)
+        peer.register(peer_endpoint)
+        for endpoint in (host_endpoint, peer_endpoint):
+            await endpoint.connect("127.0.0.1", port, match="m")
+        tasks = [asyncio.ensure_future(endpoint.run()) for endpoint in (host_endpoint, peer_endpoint)]
+        while server.connections < 2 or len(server.matches.get("m", ())) < 2:
+            await asyncio.sleep(0.01)
+
+        engine = make_engine()
+        play(engine, 2, host.publish)
+        peer.request_resync()
+        deadline = time.monotonic() + 5
+        while peer.state != GameState.from_engine(engine):
+            assert time.monotonic() < deadline, "timed out"
+            await asyncio.sleep(0.01)
+        play(engine, 1, host.publish)
+        while peer.tick != host.tick:
+            assert time.monotonic() < deadline, "timed out"
+            await asyncio.sleep(0.01)
+        assert peer.state == GameState.from_engine(engine) and peer.resyncs == 1
+
+        for endpoint in (host_endpoint, peer_endpoint):
+            await endpoint.close()
+        await asyncio.gather(*tasks)
+        await server.close()
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+import random
+from game.core.deck import Deck
+from game.simulation.policies import GreedyPolicy
+
+def assert_consistent(engine):
+    for player in engine.players:
+        assert player.zobrist == player.compute_hash()
+
+def test_incremental_hash_matches_recompute_through_a_game(make_engine):
+    engine = make_engine()
+    policy = GreedyPolicy()
+    seen = {engine.state_hash()}
+    assert_consistent(engine)
+
+    while not engine.game_over and engine.turn_count < 20:
+        policy.play_turn(engine)
+        assert_consistent(engine)
+        seen.add(engine.state_hash())
+    assert len(seen) > 1
+
+def test_same_seed_same_hash(make_engine):
+    first, second = make_engine(7), make_engine(7)
+    assert first.state_hash() == second.state_hash()
+
+    first.advance_phase()
+    assert first.state_hash() != second.state_hash()
+    second.advance_phase()
+    assert first.state_hash() == second.state_hash()
+
+def test_deck_hash_tracks_order():
+    deck = Deck(range(10))
+    deck.draw(2)
+    deck.place_on_top([42])
+    deck.place_on_bottom([7])
+    assert deck.zobrist == deck.compute_hash()
+
+    reordered = Deck(list(deck))
+    assert reordered.zobrist == deck.zobrist
+    deck.shuffle(random.Random(3))
+    assert deck.zobrist == deck.compute_hash()
+    assert deck.zobrist != reordered.zobrist
+
+def test_duplicate_cards_do_not_cancel(make_engine):
+    engine = make_engine()
+    player = engine.players[0]
+    before = player.zobrist
+    player.hand.append(player.hand[0])
+    player.hand.append(player.hand[0])
+    assert player.compute_hash() != before
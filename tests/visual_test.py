@@ -11,6 +11,7 @@ class CardType(Enum):
     CREATURE = "Creature"
 
 from game.core.card import Card
+from game.ui.renderers.card_renderer import CardRenderer
 
 pygame.init()
 screen = pygame.display.set_mode((800, 600))
@@ -22,8 +23,8 @@ test_card = Card(
     card_type=CardType.CREATURE,
     effect=None
 )
-test_card.rect.x = 300
-test_card.rect.y = 200
+renderer = CardRenderer()
+renderer.get_rect(test_card).topleft = (300, 200)
 
 running = True
 while running:
@@ -34,7 +35,7 @@ while running:
             test_card.is_face_down = not test_card.is_face_down
     
     screen.fill((50, 50, 50))
-    test_card.draw(screen)
+    renderer.draw(test_card, screen)
     pygame.display.flip()
     clock.tick(60)
 